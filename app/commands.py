@@ -21,6 +21,9 @@ def register_commands(app):
         app.cli.add_command(delete_seeded_command)
     app.cli.add_command(seed_notes_receivable_command)
     app.cli.add_command(soa_recompute_command)
+    app.cli.add_command(backfill_accounting_balances_command)
+    app.cli.add_command(export_statement_bundle_command)
+    app.cli.add_command(build_anchor_index_command)
     app.cli.add_command(seed_main_shareholders_command)
     app.cli.add_command(seed_related_shareholders_command)
 
@@ -106,8 +109,13 @@ def seed_masters_command():
     click.echo('マスターデータの強制同期を開始します...')
     try:
         service = MasterDataService()
-        service.force_sync()
+        stats = service.force_sync() or {}
         click.echo('マスターデータの同期が正常に完了しました。')
+        if stats:
+            click.echo(
+                f"  追加 {stats['inserted']}件 / 更新 {stats['updated']}件 / 削除 {stats['deleted']}件 / "
+                f"変更なし {stats['unchanged']}件（{stats['seconds']:.3f}秒）"
+            )
     except Exception as e:
         click.echo(f'エラー: マスターデータの同期中に問題が発生しました: {e}')
 
@@ -585,6 +593,81 @@ def soa_recompute_command(company_id: int):
         click.echo(f'エラー: 再評価中に問題が発生しました: {e}')
 
 
+@click.command('backfill-accounting-balances')
+@with_appcontext
+@click.option('--company-id', type=int, default=None, help='対象会社ID（未指定時は全社）')
+@click.option('--batch-size', type=int, default=100, show_default=True, help='1回のコミットで処理する会計データ件数')
+def backfill_accounting_balances_command(company_id: int | None, batch_size: int):
+    """
+    正規化テーブル（科目別残高・内訳書別合計）が未作成の会計データに対して、JSON から行を書き込みます。
+    ACCOUNTING_BALANCE_TABLES を有効にする前後に実行してください（再実行しても書き込み済みの行は対象外）。
+    """
+    from app.company.services.accounting_balance_tables import backfill_balance_tables
+
+    try:
+        written = backfill_balance_tables(db.session, company_id=company_id, batch_size=max(batch_size, 1))
+        click.echo(f'会計データ {written} 件の残高テーブルを作成しました。')
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f'エラー: 残高テーブルの作成中に問題が発生しました: {e}')
+
+
+@click.command('export-statement-bundle')
+@with_appcontext
+@click.option('--company-id', type=int, required=True, help='対象会社ID（必須）')
+@click.option('--output', type=click.Path(dir_okay=False), required=True, help='出力先PDFパス')
+@click.option('--year', type=str, default=None, help='様式の年度（未指定時は既定年度）')
+@click.option('--workers', type=int, default=None, help='描画ワーカープロセス数（未指定時はCPU数、1で逐次）')
+def export_statement_bundle_command(company_id: int, output: str, year: str | None, workers: int | None):
+    """別表二と全内訳書をしおり付きの1つのPDFに出力します。"""
+    import os
+    import time
+
+    from app.services.app_registry import get_default_pdf_year
+    from app.services.pdf_bundle import generate_statement_bundle
+
+    started = time.perf_counter()
+    try:
+        generate_statement_bundle(company_id, year or get_default_pdf_year(), output_path=output, workers=workers)
+    except Exception as e:
+        click.echo(f'エラー: PDF一括出力中に問題が発生しました: {e}')
+        return
+    size_kib = os.path.getsize(output) / 1024
+    click.echo(f"{output} に出力しました（{size_kib:.1f} KiB, {time.perf_counter() - started:.2f}秒）。")
+
+
+@click.command('build-anchor-index')
+@click.option('--base', 'base_pdf', type=click.Path(exists=True, dir_okay=False), required=True, help='ベースPDF（resources/pdf_forms/<form>/<year>/source.pdf）')
+@click.option('--template', 'templates', type=click.Path(exists=True, dir_okay=False), multiple=True, help='アンカーを含むテンプレートJSON（複数可。未指定時は resources/pdf_templates/<form>/*.json）')
+def build_anchor_index_command(base_pdf: str, templates: tuple[str, ...]):
+    """テンプレートのアンカー位置を事前計算し、ベースPDFの隣に source.anchors.json として保存します（PyMuPDF が必要）。"""
+    import glob
+    import json
+    import os
+
+    from app.pdf.anchor_index import template_anchors, write_anchor_index
+
+    if not templates:
+        form = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(base_pdf))))
+        repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        templates = tuple(sorted(glob.glob(os.path.join(repo_root, 'resources', 'pdf_templates', form, '*.json'))))
+    anchors = []
+    for path in templates:
+        with open(path, encoding='utf-8') as fh:
+            data = json.load(fh)
+        if isinstance(data, dict):
+            anchors.extend(template_anchors(data))
+    if not anchors:
+        click.echo('アンカー付きの項目が見つかりませんでした。')
+        return
+    try:
+        out = write_anchor_index(base_pdf, anchors)
+    except RuntimeError as e:
+        click.echo(f'エラー: {e}')
+        return
+    click.echo(f"{len(set(anchors))} 件のアンカーを {out} に保存しました。")
+
+
 @click.command('seed-main-shareholders')
 @with_appcontext
 @click.option('--company-id', type=int, default=None, help='対象会社ID（未指定時は単一会社がある場合それを使用）')
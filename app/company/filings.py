@@ -10,6 +10,8 @@ from app.company import company_bp
 from app.company.beppyo15 import Beppyo15Service
 from app.company.beppyo15.constants import BEPPYO15_FIELD_DEFINITIONS
 from app.company.forms import Beppyo15BreakdownForm
+from app.company.services.accounting_data_lookup import get_latest_accounting_data
+from app.company.services.accounting_payload import get_accounting_payload
 from app.company.services.corporate_tax_service import CorporateTaxCalculationService
 from app.company.services.filings_service import FilingsService
 from app.company.services.protocols import FilingsServiceProtocol
@@ -71,52 +73,6 @@ def _compute_manual_period(start_text: str | None, end_text: str | None) -> tupl
     return months_ceil, months_floor
 
 
-def _get_capital_stock_amount(bs_data) -> int:
-    """Extract capital stock amount from the balance sheet payload."""
-    try:
-        if not isinstance(bs_data, dict):
-            return 0
-        equity = bs_data.get('純資産')
-        if not isinstance(equity, dict):
-            return 0
-        shareholders = equity.get('株主資本')
-        if not isinstance(shareholders, dict):
-            return 0
-        items = shareholders.get('items') or []
-        for item in items:
-            if isinstance(item, dict):
-                name = item.get('name')
-                amount = item.get('amount')
-            else:
-                name = getattr(item, 'name', None)
-                amount = getattr(item, 'amount', None)
-            if name == '資本金':
-                try:
-                    return int(Decimal(str(amount))) if amount is not None else 0
-                except (InvalidOperation, TypeError, ValueError):
-                    return 0
-    except Exception:
-        return 0
-    return 0
-
-
-def _get_pl_value(pl_data, category: str, account_name: str):
-    try:
-        if not isinstance(pl_data, dict):
-            return None
-        category_data = pl_data.get(category)
-        if not isinstance(category_data, dict):
-            return None
-        account = category_data.get(account_name)
-        if isinstance(account, dict):
-            for key in ('total', 'amount', 'value'):
-                if account.get(key) is not None:
-                    return account.get(key)
-        return None
-    except Exception:
-        return None
-
-
 def _build_filings_context(page: str):
     title = filings_service.get_title(page)
     if not title:
@@ -126,29 +82,21 @@ def _build_filings_context(page: str):
     preview_src = url_for('company.filings_preview', page=page) if has_preview else None
 
     accounting_data = None
-    bs_data = None
-    pl_data = None
+    payload = None
     try:
         from flask_login import current_user
 
-        from app.company.models import AccountingData
         if getattr(current_user, 'is_authenticated', False) and getattr(current_user, 'company', None):
-            accounting_data = (
-                AccountingData.query
-                .filter_by(company_id=current_user.company.id)
-                .order_by(AccountingData.created_at.desc())
-                .first()
-            )
+            accounting_data = get_latest_accounting_data(current_user.company.id)
             if accounting_data and accounting_data.data:
-                payload = accounting_data.data if isinstance(accounting_data.data, dict) else {}
-                bs_data = payload.get('balance_sheet', {})
-                pl_data = payload.get('profit_loss_statement', {})
+                payload = get_accounting_payload(accounting_data)
     except Exception:
         accounting_data = None
-        bs_data = None
-        pl_data = None
+        payload = None
+    bs_data = payload.balance_sheet if payload else None
+    pl_data = payload.profit_loss_statement if payload else None
 
-    capital_stock_amount = _get_capital_stock_amount(bs_data) if bs_data else 0
+    capital_stock_amount = payload.capital_stock_amount if payload else 0
 
     empty_cfg = get_empty_state(page)
     context = {
@@ -176,7 +124,7 @@ def _build_filings_context(page: str):
     }
 
     if page == 'beppyo_4':
-        context['beppyo4_net_income'] = _get_pl_value(pl_data, '利益計算', '当期純利益')
+        context['beppyo4_net_income'] = payload.pl_value('利益計算', '当期純利益') if payload else None
         company = getattr(current_user, 'company', None)
         company_id = getattr(company, 'id', None)
         if company_id:
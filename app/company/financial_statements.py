@@ -3,7 +3,8 @@ from flask import flash, redirect, render_template, url_for
 from flask_login import current_user, login_required
 
 from app.company import company_bp
-from app.company.models import AccountingData, UserAccountMapping
+from app.company.models import UserAccountMapping
+from app.company.services.accounting_data_lookup import get_latest_accounting_data
 from app.navigation import get_navigation_state
 
 
@@ -20,9 +21,7 @@ def confirm_trial_balance():
         return redirect(url_for('company.upload_data', datatype='chart_of_accounts'))
 
     # 現在の会社に紐づく最新の会計データを取得
-    accounting_data = AccountingData.query.filter_by(
-        company_id=current_user.company.id
-    ).order_by(AccountingData.created_at.desc()).first()
+    accounting_data = get_latest_accounting_data(current_user.company.id)
 
     if not accounting_data:
         flash('会計データがまだ取り込まれていません。先に仕訳帳データをアップロードしてください。', 'warning')
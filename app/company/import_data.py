@@ -1,5 +1,5 @@
 # app/company/import_data.py
-from flask import abort, flash, redirect, render_template, request, session, url_for
+from flask import abort, current_app, flash, redirect, render_template, request, session, url_for
 from flask_login import current_user, login_required
 
 from app.company import company_bp as import_bp
@@ -190,49 +190,49 @@ def _recompute_statements(mapping_service, software_name):
     if not record:
         return
     try:
-        import io
-
-        from werkzeug.datastructures import FileStorage
-
-        with open(record.path, 'rb') as jf:
-            content = jf.read()
-        fs = FileStorage(
-            stream=io.BytesIO(content),
-            filename=record.original_name or 'journals.csv',
-        )
-        parser = ParserFactory.create_parser(software_name, fs)
-        parsed = parser.get_journals()
-
+        from app.company.services.account_totals import build_account_totals
         from app.primitives.dates import get_company_period
 
+        from .services.journal_column_store import JournalColumnStore, column_store_path
+        from .services.upload_flow_service import original_account_columns, store_journal_statements
+
         company = current_user.company
         period = get_company_period(company)
         start_date, end_date = period.start, period.end
-        df_journals = mapping_service.apply_mappings_to_journals(parsed)
-
-        from .services import FinancialStatementService
-
-        fs_service = FinancialStatementService(df_journals, start_date, end_date)
-        bs_data = fs_service.create_balance_sheet()
-        pl_data = fs_service.create_profit_loss_statement()
-        soa_breakdowns = fs_service.get_soa_breakdowns()
-
-        from app.company.models import AccountingData
-        from app.extensions import db as _db
-
-        AccountingData.query.filter_by(company_id=company.id).delete()
-        ad = AccountingData(
-            company_id=company.id,
-            period_start=start_date,
-            period_end=end_date,
-            data={
-                'balance_sheet': bs_data,
-                'profit_loss_statement': pl_data,
-                'soa_breakdowns': soa_breakdowns,
-            },
-        )
-        _db.session.add(ad)
-        _db.session.commit()
+
+        mapping = mapping_service.get_user_mappings()
+        use_remap = bool(current_app.config.get('ACCOUNTING_DATA_REMAP', False))
+        original_accounts = None
+        # アップロード時に保存した列指向キャッシュがあれば、CSVを再解析せずに使う
+        store = JournalColumnStore.open(column_store_path(record.path))
+        if store is not None:
+            # マッピングは勘定科目辞書に適用する（行ごとの置換はしない）
+            df_journals = store.to_dataframe(account_mapping=mapping)
+            if use_remap:
+                original_accounts = original_account_columns(store.to_dataframe())
+        else:
+            import io
+
+            from werkzeug.datastructures import FileStorage
+
+            with open(record.path, 'rb') as jf:
+                content = jf.read()
+            fs = FileStorage(
+                stream=io.BytesIO(content),
+                filename=record.original_name or 'journals.csv',
+            )
+            parser = ParserFactory.create_parser(software_name, fs)
+            parsed = parser.get_journals()
+            if use_remap:
+                original_accounts = original_account_columns(parsed)
+            df_journals = mapping_service.apply_mappings_to_journals(parsed)
+
+        account_totals = None
+        if original_accounts is not None:
+            # 元の科目名ごとの合計も保存し、以後のマッピング変更は付け替えで済ませる
+            account_totals = build_account_totals(df_journals.assign(**original_accounts), mapping)
+
+        store_journal_statements(company.id, df_journals, start_date, end_date, account_totals=account_totals)
         mark_step_as_completed('journals')
         JournalUploadStore(session).clear(remove_file=True)
     except Exception as exc:
@@ -241,13 +241,9 @@ def _recompute_statements(mapping_service, software_name):
 
 def _post_mapping_redirect():
     try:
-        from app.company.models import AccountingData as __AD
+        from app.company.services.accounting_data_lookup import get_latest_accounting_data
 
-        latest = (
-            __AD.query.filter_by(company_id=current_user.company.id)
-            .order_by(__AD.created_at.desc())
-            .first()
-        )
+        latest = get_latest_accounting_data(current_user.company.id)
         if latest is not None:
             return redirect(url_for('company.confirm_trial_balance'))
     except Exception:
@@ -2,6 +2,8 @@
 
 from .company_core import Company, Office, Shareholder, User
 from .master_entities import (
+    AccountingBalance,
+    AccountingBreakdownTotal,
     AccountingData,
     AccountTitleMaster,
     Beppyo15Breakdown,
@@ -52,5 +54,7 @@ __all__ = [
     'UserAccountMapping',
     'MasterVersion',
     'AccountingData',
+    'AccountingBalance',
+    'AccountingBreakdownTotal',
     'CorporateTaxMaster',
 ]
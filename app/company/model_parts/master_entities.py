@@ -82,10 +82,50 @@ class AccountingData(db.Model):
     algo_version = db.Column(db.String(32))
     source_hash = db.Column(db.String(128))
     data = db.Column(db.JSON, nullable=False)
+    # 仕訳の月別・勘定科目別の部分合計（再取込時の差分再計算用、JOURNAL_INCREMENTAL_RECOMPUTE 有効時のみ保存）
+    journal_partials = db.Column(db.JSON)
+    # マッピング適用前の科目名ごとの期首・期中合計（マッピング変更時の再計算用、ACCOUNTING_DATA_REMAP 有効時のみ保存）
+    account_totals = db.Column(db.JSON)
+    # 科目別残高・内訳書別合計を正規化テーブル（AccountingBalance / AccountingBreakdownTotal）に書き込んだ日時
+    normalized_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
 
+# 会社ごとの最新の会計データ（created_at の降順で先頭1件）をインデックスだけで引く
+db.Index(
+    'ix_accounting_data_company_id_created_at',
+    AccountingData.company_id,
+    AccountingData.created_at.desc(),
+)
+
+
+class AccountingBalance(db.Model):
+    """会計データの勘定科目（マスターID）別残高。data['account_balances'] の正規化テーブル"""
+
+    __tablename__ = 'accounting_balance'
+    accounting_data_id = db.Column(
+        db.Integer,
+        db.ForeignKey('accounting_data.id', name='fk_accounting_balance_accounting_data_id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    account_id = db.Column(db.Integer, primary_key=True)
+    amount = db.Column(db.BigInteger, nullable=False)
+
+
+class AccountingBreakdownTotal(db.Model):
+    """会計データの内訳書別合計。data['soa_breakdowns'] の正規化テーブル"""
+
+    __tablename__ = 'accounting_breakdown_total'
+    accounting_data_id = db.Column(
+        db.Integer,
+        db.ForeignKey('accounting_data.id', name='fk_accounting_breakdown_total_accounting_data_id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    breakdown_document = db.Column(db.String(100), primary_key=True)
+    amount = db.Column(db.BigInteger, nullable=False)
+
+
 class CorporateTaxMaster(db.Model):
     __tablename__ = 'corporate_tax_master'
 
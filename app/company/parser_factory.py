@@ -18,13 +18,15 @@ class ParserFactory:
     }
 
     @classmethod
-    def create_parser(cls, software_name, file_storage):
+    def create_parser(cls, software_name, file_storage, *, streaming=False):
         """
         指定された会計ソフトのパーサーインスタンスを生成して返す。
 
         Args:
             software_name (str): 会計ソフト名 (e.g., 'moneyforward', 'yayoi')。
             file_storage: アップロードされたファイルオブジェクト。
+            streaming (bool): True の場合、対応するパーサーはストリーミングモードで生成する。
+                未対応のパーサーは通常モードで生成される。
 
         Returns:
             BaseParser: software_nameに対応するパーサーのインスタンス。
@@ -39,4 +41,6 @@ class ParserFactory:
         if not getattr(parser_class, 'SUPPORTED', True):
             raise ValueError('選択された会計ソフトにはまだ対応していません。対応済みソフトを選択してください。')
 
+        if streaming and getattr(parser_class, 'STREAMING', False):
+            return parser_class(file_storage, streaming=True)
         return parser_class(file_storage)
@@ -1,4 +1,5 @@
 # app/company/parsers/base_parser.py
+import codecs
 import csv
 import io
 from abc import ABC, abstractmethod
@@ -9,38 +10,67 @@ import pandas as pd
 class BaseParser(ABC):
     """
     ファイル解析のための共通インターフェースと基本機能を提供する抽象基底クラス。
+
+    streaming=True の場合はファイル全体をメモリに読み込まず、先頭 STREAM_PREFIX_BYTES
+    だけで文字コード・区切り文字・ヘッダー行を判定し、本体は C エンジンでチャンク単位に読む。
     """
-    def __init__(self, file_storage):
+    ENCODINGS_TO_TRY = ('shift_jis', 'cp932', 'utf-8-sig', 'utf-8')
+    STREAM_PREFIX_BYTES = 64 * 1024
+    STREAM_CHUNK_ROWS = 50_000
+
+    def __init__(self, file_storage, *, streaming=False):
         """
         Args:
             file_storage: アップロードされたファイルオブジェクト (FileStorage)。
+            streaming: True の場合、ファイル全体を file_content_bytes に読み込まない。
         """
         self.file_storage = file_storage
-        self.file_content_bytes = self.file_storage.read()
+        self.streaming = streaming
+        if streaming:
+            self.file_content_bytes = None
+            self._sample_bytes = self.file_storage.read(self.STREAM_PREFIX_BYTES)
+            # 先頭だけを読んだ場合、末尾のマルチバイト文字が途中で切れていても判定を誤らないようにする
+            self._sample_is_complete = len(self._sample_bytes) < self.STREAM_PREFIX_BYTES
+        else:
+            self.file_content_bytes = self.file_storage.read()
+            self._sample_bytes = self.file_content_bytes
+            self._sample_is_complete = True
         self.file_storage.seek(0)
-        self.encoding = self._detect_encoding()
+        self._encoding_candidates = self._candidate_encodings()
+        if not self._encoding_candidates:
+            raise Exception("ファイルの文字コードを判別できませんでした。UTF-8またはShift-JIS系統で保存してください。")
+        self.encoding = self._encoding_candidates[0]
         self.delimiter = self._detect_delimiter()
 
-    def _detect_encoding(self):
+    def _candidate_encodings(self):
         """
-        ファイル全体のバイト内容から文字コードを判定する。
+        判定用のバイト列（通常モードはファイル全体、ストリーミングモードは先頭部分）を
+        デコードできる文字コードを優先順に返す。
         日本語のCSV/TXTで一般的なShift_JIS系統を先に試すことで、誤判定を減らす。
         """
-        encodings_to_try = ['shift_jis', 'cp932', 'utf-8-sig', 'utf-8']
-        for encoding in encodings_to_try:
+        candidates = []
+        for encoding in self.ENCODINGS_TO_TRY:
             try:
-                self.file_content_bytes.decode(encoding)
-                return encoding
+                decoder = codecs.getincrementaldecoder(encoding)()
+                decoder.decode(self._sample_bytes, final=self._sample_is_complete)
             except UnicodeDecodeError:
                 continue
-        raise Exception("ファイルの文字コードを判別できませんでした。UTF-8またはShift-JIS系統で保存してください。")
+            candidates.append(encoding)
+            if self._sample_is_complete:
+                break
+        return candidates
+
+    def _decoded_sample(self):
+        """判定用バイト列を現在の文字コードでデコードした文字列。"""
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        return decoder.decode(self._sample_bytes, final=self._sample_is_complete)
 
     def _detect_delimiter(self):
         """
         ファイル内容から区切り文字を判定する。
         """
         try:
-            decoded_text = self.file_content_bytes.decode(self.encoding)
+            decoded_text = self._decoded_sample()
             sniffer = csv.Sniffer()
             dialect = sniffer.sniff(decoded_text[:2048], delimiters=',\t')
             return dialect.delimiter
@@ -88,4 +118,47 @@ class BaseParser(ABC):
                 df.columns = [str(col).strip() for col in df.columns]
             return df
         except Exception as e:
-            raise Exception(f'データ読み込みエラー: {e}') from e
\ No newline at end of file
+            raise Exception(f'データ読み込みエラー: {e}') from e
+
+    def _read_chunks(self, header_row, **kwargs):
+        """
+        ストリーミング用のデータ読み込み処理。C エンジンで STREAM_CHUNK_ROWS 行ずつ DataFrame を返す。
+        先頭部分では判別できなかった文字化けは UnicodeDecodeError として呼び出し元に伝える。
+        """
+        stream = getattr(self.file_storage, 'stream', self.file_storage)
+        stream.seek(0)
+        try:
+            reader = pd.read_csv(
+                stream,
+                delimiter=self.delimiter,
+                header=header_row,
+                encoding=self.encoding,
+                skip_blank_lines=True,
+                engine='c',
+                chunksize=self.STREAM_CHUNK_ROWS,
+                **kwargs
+            )
+            with reader:
+                for chunk in reader:
+                    if header_row is not None and chunk.columns.size > 0:
+                        chunk.columns = [str(col).strip() for col in chunk.columns]
+                    yield chunk
+        except UnicodeDecodeError:
+            raise
+        except Exception as e:
+            raise Exception(f'データ読み込みエラー: {e}') from e
+        finally:
+            stream.seek(0)
+
+    def _with_encoding_fallback(self, func):
+        """
+        func() を実行し、ファイル後半で文字コードの判定違いが見つかった場合は
+        次の候補に切り替えて最初から読み直す。
+        """
+        for encoding in self._encoding_candidates:
+            self.encoding = encoding
+            try:
+                return func()
+            except UnicodeDecodeError:
+                continue
+        raise Exception("ファイルの文字コードを判別できませんでした。UTF-8またはShift-JIS系統で保存してください。")
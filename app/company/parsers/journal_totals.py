@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+OPENING_CAPITAL_ACCOUNT = '資本金'
+
+# ストリーミング取込の source_hash は、前処理とマッピング適用を済ませたチャンク（ヘッダーなし・
+# 列は JOURNALS_COL_NAMES のキー）から求める。マッピングを変えると値が変わり、DataFrame 経路
+# （マッピング適用後の仕訳帳全体をヘッダー付きで CSV 化）のハッシュとも一致しないので、
+# 別の名前空間にして両者を比較しないようにする。
+STREAMING_SOURCE_HASH_PREFIX = 'stream:'
+
+
+def _plain_number(value: float):
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def _add_grouped(target: dict[str, float], accounts: pd.Series, amounts: pd.Series) -> None:
+    if accounts.empty:
+        return
+    grouped = amounts.groupby(accounts, sort=False).sum()
+    for account, amount in grouped.items():
+        target[account] = target.get(account, 0.0) + float(amount)
+
+
+def _net_balances(debits: dict[str, float], credits: dict[str, float]) -> dict[str, int | float]:
+    balances: dict[str, float] = dict(debits)
+    for account, amount in credits.items():
+        balances[account] = balances.get(account, 0.0) - amount
+    return {account: _plain_number(amount) for account, amount in balances.items() if amount != 0}
+
+
+@dataclass
+class JournalTotals:
+    """
+    仕訳を勘定科目ごとの借方・貸方合計へ集約した結果。
+
+    FinancialStatementService と同じ規則で期首取引（期首月に貸方「資本金」を含む取引）と
+    期中取引を分けて保持する。仕訳の行数に関係なく、メモリ使用量は勘定科目数に比例する。
+    """
+
+    opening_debits: dict[str, float] = field(default_factory=dict)
+    opening_credits: dict[str, float] = field(default_factory=dict)
+    mid_year_debits: dict[str, float] = field(default_factory=dict)
+    mid_year_credits: dict[str, float] = field(default_factory=dict)
+    row_count: int = 0
+    source_hash: str = ''
+
+    def opening_balances(self) -> dict[str, int | float]:
+        return _net_balances(self.opening_debits, self.opening_credits)
+
+    def mid_year_balances(self) -> dict[str, int | float]:
+        return _net_balances(self.mid_year_debits, self.mid_year_credits)
+
+    def account_names(self) -> set[str]:
+        names: set[str] = set()
+        for bucket in (self.opening_debits, self.opening_credits, self.mid_year_debits, self.mid_year_credits):
+            names.update(str(name).strip() for name in bucket if str(name).strip())
+        return names
+
+
+def find_opening_transaction_ids(chunks: Iterable[pd.DataFrame]) -> set:
+    """
+    1 パス目: 期首月（最も古い取引日の月）に貸方「資本金」を含む取引Noを求める。
+    chunks は 'id', 'date'(datetime), 'credit_account' 列を持つ DataFrame の列。
+    """
+    earliest = None
+    capital_ids_by_month: dict[int, set] = {}
+    for chunk in chunks:
+        dates = chunk['date']
+        if dates.empty:
+            continue
+        chunk_min = dates.min()
+        if earliest is None or chunk_min < earliest:
+            earliest = chunk_min
+        capital = chunk[chunk['credit_account'] == OPENING_CAPITAL_ACCOUNT]
+        for month, ids in capital.groupby(capital['date'].dt.month, sort=False)['id']:
+            capital_ids_by_month.setdefault(int(month), set()).update(ids.unique().tolist())
+    if earliest is None:
+        return set()
+    return capital_ids_by_month.get(earliest.month, set())
+
+
+def aggregate_journal_totals(chunks: Iterable[pd.DataFrame], opening_ids: set) -> JournalTotals:
+    """
+    2 パス目: チャンクごとに勘定科目別の借方・貸方合計を積み上げる。
+    chunks は 'id', 'debit_account', 'debit_amount', 'credit_account', 'credit_amount' 列を持つ。
+    """
+    totals = JournalTotals()
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        totals.row_count += len(chunk)
+        digest.update(chunk.to_csv(index=False, header=False).encode('utf-8'))
+        opening_mask = chunk['id'].isin(opening_ids) if opening_ids else pd.Series(False, index=chunk.index)
+        for mask, debits, credits in (
+            (opening_mask, totals.opening_debits, totals.opening_credits),
+            (~opening_mask, totals.mid_year_debits, totals.mid_year_credits),
+        ):
+            part = chunk[mask]
+            _add_grouped(debits, part['debit_account'], part['debit_amount'])
+            _add_grouped(credits, part['credit_account'], part['credit_amount'])
+    totals.source_hash = STREAMING_SOURCE_HASH_PREFIX + digest.hexdigest()
+    return totals
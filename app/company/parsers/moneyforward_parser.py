@@ -2,11 +2,13 @@
 import pandas as pd
 
 from .base_parser import BaseParser
-from .normalizers import normalize_journal_dataframe
+from .journal_totals import JournalTotals, aggregate_journal_totals, find_opening_transaction_ids
+from .normalizers import normalize_journal_dataframe, sanitize_amount_series
 
 
 class MoneyForwardParser(BaseParser):
     SUPPORTED = True
+    STREAMING = True
     """
     マネーフォワードのデータ形式を解析するためのパーサークラス。
     ヘッダーの有無を自動判別して処理する。
@@ -36,7 +38,7 @@ class MoneyForwardParser(BaseParser):
     def _find_header_row(self, keyword):
         """指定されたキーワードが含まれる行をヘッダー行として特定する。見つからない場合はNoneを返す。"""
         try:
-            decoded_text = self.file_content_bytes.decode(self.encoding)
+            decoded_text = self._decoded_sample()
             lines = decoded_text.splitlines()
             for i, line in enumerate(lines):
                 if keyword in line:
@@ -103,6 +105,48 @@ class MoneyForwardParser(BaseParser):
         })
         return normalize_journal_dataframe(renamed)
 
+    def get_journal_totals(self, account_mapping=None) -> JournalTotals:
+        """
+        仕訳帳を読み込みながら勘定科目ごとの借方・貸方合計を集計する（ストリーミングモード用）。
+        DataFrame 全体を保持しないため、大きな複数年度の仕訳でもメモリ使用量は一定に保たれる。
+
+        Args:
+            account_mapping (dict | None): 勘定科目名の置換表（ユーザーのマッピング）。
+                期首取引の判定（貸方「資本金」）より前に適用する。
+        """
+        def _aggregate():
+            opening_ids = find_opening_transaction_ids(
+                self.iter_journal_chunks(('id', 'date', 'credit_account'), account_mapping=account_mapping)
+            )
+            return aggregate_journal_totals(
+                self.iter_journal_chunks(account_mapping=account_mapping), opening_ids
+            )
+
+        return self._with_encoding_fallback(_aggregate)
+
+    def iter_journal_chunks(self, keys=None, account_mapping=None):
+        """
+        仕訳帳を STREAM_CHUNK_ROWS 行ずつ読み込み、_read_and_prepare_journals と同じ前処理を施した
+        DataFrame（列名は JOURNALS_COL_NAMES のキー）を順に返す。
+        """
+        keys = list(keys or self.JOURNALS_COL_NAMES.keys())
+        header_row = self._find_header_row(self.JOURNALS_HEADER_KEYWORD)
+        if header_row is not None:
+            columns = {self.JOURNALS_COL_NAMES[k]: k for k in keys}
+        else:
+            columns = {self.JOURNALS_COL_INDICES[k]: k for k in keys}
+        for chunk in self._read_chunks(header_row=header_row, usecols=list(columns), dtype=str):
+            if header_row is not None:
+                chunk.rename(columns=columns, inplace=True)
+            else:
+                chunk.columns = [columns[c] for c in chunk.columns]
+            chunk = self._prepare_journal_frame(chunk)
+            if account_mapping:
+                for col in ('debit_account', 'credit_account'):
+                    if col in chunk.columns:
+                        chunk[col] = chunk[col].map(account_mapping).fillna(chunk[col])
+            yield chunk
+
     def _read_and_prepare_journals(self):
         """仕訳帳CSVを読み込み、前処理を行う。ヘッダーの有無を自動判別する。"""
         header_row = self._find_header_row(self.JOURNALS_HEADER_KEYWORD)
@@ -116,26 +160,15 @@ class MoneyForwardParser(BaseParser):
             df = self._read_data(header_row=None, usecols=self.JOURNALS_COL_INDICES.values())
             df.columns = self.JOURNALS_COL_INDICES.keys()
 
-        # --- 共通のデータクレンジング処理 ---
+        return self._prepare_journal_frame(df)
+
+    def _prepare_journal_frame(self, df):
+        """仕訳DataFrame（全体またはチャンク）に共通のデータクレンジング処理を施す。"""
         df['date'] = pd.to_datetime(df['date'], errors='coerce')
         # 金額のサニタイズ
-        def _sanitize_amount(series: pd.Series) -> pd.Series:
-            orig = series.astype(str).fillna('').str.strip()
-            # 括弧表記の検出
-            mask_paren = orig.str.startswith('(') & orig.str.endswith(')')
-            s = orig
-            # 記号・通貨・空白の除去と符号の正規化
-            s = s.str.replace('[,，]', '', regex=True)
-            s = s.str.replace('[ 　]', '', regex=True)
-            s = s.str.replace('円', '', regex=False)
-            s = s.str.replace('[﹣－−–—‐‑⁻]', '-', regex=True)
-            s = s.str.replace(r'^[▲△]\s*', '-', regex=True)
-            s = s.str.replace('(', '', regex=False).str.replace(')', '', regex=False)
-            s = s.where(~mask_paren, '-' + s)
-            return pd.to_numeric(s, errors='coerce').fillna(0)
-
-        df['debit_amount'] = _sanitize_amount(df['debit_amount'])
-        df['credit_amount'] = _sanitize_amount(df['credit_amount'])
+        for _col in ['debit_amount', 'credit_amount']:
+            if _col in df.columns:
+                df[_col] = sanitize_amount_series(df[_col])
         
         # NaNを空にしてからstripし、'nan'文字列も除去
         for _col in ['debit_account', 'credit_account']:
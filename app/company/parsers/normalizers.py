@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 import pandas as pd
 
 JOURNAL_COLUMN_ALIASES: dict[str, str] = {
@@ -22,3 +24,40 @@ def normalize_journal_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         if source in normalized.columns and canonical not in normalized.columns:
             normalized[canonical] = normalized[source]
     return normalized
+
+
+# 金額文字列から除去する記号（桁区切り・空白・通貨・括弧）と、マイナス記号の表記揺れの正規化
+_AMOUNT_TRANSLATION = str.maketrans(
+    {**{ch: None for ch in ',， 　円()'}, **{ch: '-' for ch in '﹣－−–—‐‑⁻'}}
+)
+_LEADING_TRIANGLE = re.compile(r'^[▲△]\s*')
+
+
+def sanitize_amount_text(text) -> str:
+    """
+    会計ソフトの金額表記を数値として解釈できる文字列に正規化する。
+    桁区切り・空白・「円」を除き、マイナス記号の表記揺れ、先頭の▲/△、括弧書きの負数を '-' に揃える。
+    例: '1,000円' -> '1000', '▲ 500' -> '-500', '(300)' -> '-300'
+    """
+    text = str(text).strip()
+    negative = text[:1] == '(' and text[-1:] == ')'
+    cleaned = text.translate(_AMOUNT_TRANSLATION)
+    if cleaned[:1] in ('▲', '△'):
+        cleaned = _LEADING_TRIANGLE.sub('-', cleaned, count=1)
+    return '-' + cleaned if negative else cleaned
+
+
+def sanitize_amount_series(series: pd.Series) -> pd.Series:
+    """
+    金額列を数値へ変換する。解釈できない値・欠損値は 0 とする。
+    仕訳の金額は同じ値が繰り返し現れるため、一意な値だけを正規化してから元の並びへ展開する。
+    """
+    codes, uniques = pd.factorize(series)
+    cleaned = [sanitize_amount_text(value) for value in uniques]
+    if (codes == -1).any():
+        # 欠損値は文字列 'nan' と同様に数値化できない値として扱う
+        codes[codes == -1] = len(cleaned)
+        cleaned.append('')
+    numeric = pd.to_numeric(pd.Series(cleaned, dtype=object), errors='coerce')
+    result = pd.Series(numeric.to_numpy()[codes], index=series.index, name=series.name)
+    return result.fillna(0)
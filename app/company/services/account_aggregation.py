@@ -0,0 +1,213 @@
+# app/company/services/account_aggregation.py
+"""勘定科目名を整数コードに置き換えて残高・表示区分を集計するエンジン。
+
+勘定科目マスター（BS/PL）の科目名を一度だけ pandas.Index に登録し、各科目コードに対応する
+表示区分（大分類・中分類・決算書名）や内訳書をコード順の配列として前計算しておく。
+仕訳の集計や財務諸表の組み立ては、科目名の照合 1 回と np.bincount による配列演算で済む。
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+StatementKey = tuple[Optional[str], Optional[str], str]
+
+
+def _plain_number(value: float):
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def _numeric_array(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=0.0)
+
+
+def _optional_text(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def _first_appearance(codes: np.ndarray) -> np.ndarray:
+    """codes に現れる値を初出順に並べた配列。"""
+    if codes.size == 0:
+        return codes
+    _, first = np.unique(codes, return_index=True)
+    return codes[np.sort(first)]
+
+
+class StatementCodebook:
+    """
+    勘定科目マスター 1 種類（BS または PL）の整数コード表。
+
+    コード i は index[i] の勘定科目を表し、statement_codes[i] / breakdown_codes[i] が
+    その科目の表示区分・内訳書を指す（該当なしは -1）。並び順の辞書もここで一度だけ求める。
+    構築後は読み取り専用（配列は writeable=False、辞書は MappingProxyType）で、スレッド間で共有できる。
+    """
+
+    def __init__(self, master_df: Optional[pd.DataFrame]):
+        if master_df is None or master_df.empty:
+            master_df = pd.DataFrame(index=pd.Index([], dtype=object))
+        # 重複した科目名は先頭の行を採用する
+        master_df = master_df[~master_df.index.duplicated(keep='first')]
+        self.index = pd.Index(master_df.index)
+        size = len(self.index)
+
+        def column(name: str) -> list:
+            if name in master_df.columns:
+                return master_df[name].tolist()
+            return [None] * size
+
+        majors, middles, statement_names = column('major_category'), column('middle_category'), column('statement_name')
+        keys: list[StatementKey] = []
+        for account_name, major, middle, statement_name in zip(self.index, majors, middles, statement_names):
+            if pd.isna(statement_name) or not str(statement_name).strip():
+                statement_name = account_name
+            keys.append((_optional_text(major), _optional_text(middle), str(statement_name)))
+        key_codes, unique_keys = pd.factorize(pd.Series(keys, dtype=object), use_na_sentinel=False)
+        self.statement_keys: tuple[StatementKey, ...] = tuple(unique_keys)
+        self.statement_codes: np.ndarray = np.asarray(key_codes, dtype=np.intp)
+        self.statement_codes.flags.writeable = False
+
+        documents = [doc if isinstance(doc, str) and doc.strip() else None for doc in column('breakdown_document')]
+        doc_codes, unique_docs = pd.factorize(pd.Series(documents, dtype=object))
+        self.breakdown_documents: tuple[str, ...] = tuple(unique_docs)
+        self.breakdown_codes: np.ndarray = np.asarray(doc_codes, dtype=np.intp)
+        self.breakdown_codes.flags.writeable = False
+
+        account_ids: dict[str, int] = {}
+        if 'id' in master_df.columns:
+            for name, raw_id in zip(self.index, master_df['id'].tolist()):
+                try:
+                    account_ids[str(name)] = int(raw_id)
+                except (TypeError, ValueError):
+                    continue
+        self.account_ids: Mapping[str, int] = MappingProxyType(account_ids)
+
+        major_order, middle_order, statement_order = self._sort_orders(master_df, majors, middles, keys)
+        self.major_order: Mapping[str, int] = MappingProxyType(major_order)
+        self.middle_order: Mapping[str, int] = MappingProxyType(middle_order)
+        self.statement_order: Mapping[StatementKey, int] = MappingProxyType(statement_order)
+
+    def _sort_orders(self, master_df, majors, middles, keys):
+        """大分類・中分類・決算書名ごとの最小の科目番号（表示順）を求める。"""
+        major_order: dict[str, int] = {}
+        middle_order: dict[str, int] = {}
+        statement_order: dict[StatementKey, int] = {}
+        if 'number' not in master_df.columns or not len(self.index):
+            return major_order, middle_order, statement_order
+        numbers = pd.to_numeric(master_df['number'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        valid = np.isfinite(numbers)
+        if not valid.any():
+            return major_order, middle_order, statement_order
+        frame = pd.DataFrame({
+            'number': np.trunc(numbers[valid]).astype(np.int64),
+            'major': pd.Series(majors, dtype=object)[valid].to_numpy(),
+            'middle': pd.Series(middles, dtype=object)[valid].to_numpy(),
+            'statement': self.statement_codes[valid],
+        })
+        for column_name, target in (('major', major_order), ('middle', middle_order)):
+            labelled = frame[[isinstance(v, str) for v in frame[column_name]]]
+            for label, number in labelled.groupby(column_name, sort=False)['number'].min().items():
+                target[label] = int(number)
+        for code, number in frame.groupby('statement', sort=False)['number'].min().items():
+            statement_order[self.statement_keys[int(code)]] = int(number)
+        return major_order, middle_order, statement_order
+
+    def _codes_and_amounts(self, balances: Mapping[Any, Any]) -> tuple[np.ndarray, np.ndarray]:
+        if not balances:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=float)
+        codes = self.index.get_indexer(list(balances.keys()))
+        amounts = np.fromiter((float(v) for v in balances.values()), dtype=float, count=len(balances))
+        known = codes >= 0
+        return codes[known], amounts[known]
+
+    def group_by_statement(self, balances: Mapping[Any, Any]) -> dict[StatementKey, int | float]:
+        """残高を (大分類, 中分類, 決算書名) ごとに合計する。マスター外の科目は除外。"""
+        codes, amounts = self._codes_and_amounts(balances)
+        key_codes = self.statement_codes[codes]
+        totals = np.bincount(key_codes, weights=amounts, minlength=len(self.statement_keys))
+        return {self.statement_keys[k]: _plain_number(totals[k]) for k in _first_appearance(key_codes)}
+
+    def breakdown_totals(self, balances: Mapping[Any, Any]) -> dict[str, int | float]:
+        """残高を内訳書ごとに合計する。内訳書が設定されていない科目は除外。"""
+        codes, amounts = self._codes_and_amounts(balances)
+        doc_codes = self.breakdown_codes[codes]
+        has_doc = doc_codes >= 0
+        doc_codes, amounts = doc_codes[has_doc], amounts[has_doc]
+        totals = np.bincount(doc_codes, weights=amounts, minlength=len(self.breakdown_documents))
+        return {self.breakdown_documents[k]: _plain_number(totals[k]) for k in _first_appearance(doc_codes)}
+
+
+@dataclass(frozen=True)
+class StatementLayout:
+    """
+    財務諸表の組み立てに必要なマスター由来の情報一式（BS/PL のコード表、科目名→ID、全科目の索引）。
+    マスターのバージョンごとに一度だけ構築し、FinancialStatementService のインスタンス間で共有する。
+    """
+
+    version_hash: str
+    bs_master: pd.DataFrame
+    pl_master: pd.DataFrame
+    bs: StatementCodebook
+    pl: StatementCodebook
+    account_index: pd.Index
+    name_to_id: Mapping[str, int]
+
+    @classmethod
+    def build(cls, bs_master: Optional[pd.DataFrame], pl_master: Optional[pd.DataFrame], version_hash: str = '') -> StatementLayout:
+        bs = StatementCodebook(bs_master)
+        pl = StatementCodebook(pl_master)
+        name_to_id = {**bs.account_ids, **pl.account_ids}
+        return cls(
+            version_hash=version_hash,
+            bs_master=bs_master,
+            pl_master=pl_master,
+            bs=bs,
+            pl=pl,
+            account_index=bs.index.append(pl.index).drop_duplicates(),
+            name_to_id=MappingProxyType(name_to_id),
+        )
+
+
+def aggregate_account_balances(
+    debit_accounts: pd.Series,
+    debit_amounts: pd.Series,
+    credit_accounts: pd.Series,
+    credit_amounts: pd.Series,
+    account_index: pd.Index,
+) -> dict[Any, int | float]:
+    """
+    仕訳の借方・貸方から勘定科目ごとの純残高（借方 − 貸方）を求める。0 の科目は除く。
+
+    科目名は account_index（マスター科目名）に対して一括でコード化し、マスター外の科目は
+    その後ろに追加コードを割り当てる。並び順は借方に現れる科目の名前順、続いて貸方のみの科目の名前順。
+    """
+    names = pd.concat([debit_accounts, credit_accounts], ignore_index=True)
+    weights = np.concatenate([_numeric_array(debit_amounts), -_numeric_array(credit_amounts)])
+    codes = account_index.get_indexer(names)
+    unknown = codes < 0
+    extra_codes, extra_names = pd.factorize(names[unknown])
+    codes[unknown] = np.where(extra_codes >= 0, extra_codes + len(account_index), -1)
+    valid = codes >= 0
+    codes, weights = codes[valid], weights[valid]
+    if codes.size == 0:
+        return {}
+    all_names = account_index.append(pd.Index(extra_names, dtype=object))
+    sums = np.bincount(codes, weights=weights, minlength=len(all_names))
+
+    is_debit = np.zeros(len(all_names), dtype=bool)
+    is_debit[codes[: int(valid[: len(debit_accounts)].sum())]] = True
+    present = np.zeros(len(all_names), dtype=bool)
+    present[codes] = True
+    debit_side = sorted((all_names[i] for i in np.flatnonzero(is_debit)), key=str)
+    credit_only = sorted((all_names[i] for i in np.flatnonzero(present & ~is_debit)), key=str)
+    position = {name: i for i, name in enumerate(all_names)}
+    balances: dict[Any, int | float] = {}
+    for name in debit_side + credit_only:
+        amount = sums[position[name]]
+        if amount != 0:
+            balances[name] = _plain_number(amount)
+    return balances
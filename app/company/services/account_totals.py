@@ -0,0 +1,143 @@
+# app/company/services/account_totals.py
+"""元の勘定科目名（マッピング適用前）ごとの期首・期中合計。
+
+AccountingData.account_totals に次の形式で保存する::
+
+    {"version": 1, "mapping": {元の科目名: マスター科目名},
+     "opening": {"debit": {元の科目名: 金額}, "credit": {...}},
+     "mid_year": {"debit": {...}, "credit": {...}},
+     "opening_candidates": [期首月に貸方へ現れた元の科目名]}
+
+マッピングを変更したときは、変わった科目の合計を付け替えるだけで残高を組み立て直せる
+（仕訳の再取込は不要）。ただし期首取引は「期首月に貸方『資本金』を含む取引No」で判定するため、
+期首月の貸方科目が資本金へ/から付け替わる場合は仕訳そのものが必要になる（requires_journals）。
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import pandas as pd
+
+from app.company.services.journal_partials import (
+    HASH_COLUMNS,
+    OPENING_CAPITAL_ACCOUNT,
+    _opening_context,
+    _plain_number,
+    net_balances,
+)
+
+ACCOUNT_TOTALS_VERSION = 1
+_BUCKETS = ('opening', 'mid_year')
+_SIDES = (('debit', '借方勘定科目', '借方金額'), ('credit', '貸方勘定科目', '貸方金額'))
+
+
+def _empty_buckets() -> dict[str, dict[str, dict[str, Any]]]:
+    return {bucket: {'debit': {}, 'credit': {}} for bucket in _BUCKETS}
+
+
+@dataclass
+class AccountTotals:
+    """元の科目名ごとの合計と、集計時に適用していたマッピング。FinancialStatementService(totals=...) に渡せる。"""
+
+    mapping: dict[str, str]
+    sums: dict[str, dict[str, dict[str, Any]]] = field(default_factory=_empty_buckets)
+    opening_candidates: list[str] = field(default_factory=list)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            'version': ACCOUNT_TOTALS_VERSION,
+            'mapping': self.mapping,
+            **self.sums,
+            'opening_candidates': self.opening_candidates,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> Optional[AccountTotals]:
+        if not isinstance(payload, Mapping) or payload.get('version') != ACCOUNT_TOTALS_VERSION:
+            return None
+        sums = {}
+        for bucket in _BUCKETS:
+            entry = payload.get(bucket)
+            if not isinstance(entry, Mapping):
+                return None
+            sums[bucket] = {side: dict(entry.get(side) or {}) for side in ('debit', 'credit')}
+        return cls(dict(payload.get('mapping') or {}), sums, list(payload.get('opening_candidates') or []))
+
+    # --- mapping deltas --------------------------------------------------
+
+    def original_names(self) -> set[str]:
+        return {name for bucket in self.sums.values() for side in bucket.values() for name in side}
+
+    def _target(self, mapping: Mapping[str, str], name: str) -> str:
+        return mapping.get(name, name)
+
+    def changed_accounts(self, mapping: Mapping[str, str]) -> list[str]:
+        """集計済みの元の科目名のうち、mapping を適用すると付け替え先が変わるもの。"""
+        return sorted(
+            name for name in self.original_names()
+            if self._target(mapping, name) != self._target(self.mapping, name)
+        )
+
+    def requires_journals(self, mapping: Mapping[str, str]) -> bool:
+        """mapping への変更で期首取引の判定が変わりうる（＝合計の付け替えでは済まない）なら True。"""
+        for name in set(self.opening_candidates) & set(self.changed_accounts(mapping)):
+            if OPENING_CAPITAL_ACCOUNT in (self._target(mapping, name), self._target(self.mapping, name)):
+                return True
+        return False
+
+    def remapped(self, mapping: Mapping[str, str]) -> AccountTotals:
+        """合計はそのままに、適用するマッピングだけを差し替えたもの。"""
+        return AccountTotals(dict(mapping), self.sums, list(self.opening_candidates))
+
+    # --- balances --------------------------------------------------------
+
+    def _mapped_sums(self, bucket: str, side: str) -> dict[str, Any]:
+        mapped: dict[str, Any] = {}
+        for name, amount in self.sums[bucket][side].items():
+            target = self._target(self.mapping, name)
+            mapped[target] = mapped.get(target, 0) + amount
+        return mapped
+
+    def _balances(self, bucket: str) -> dict[str, int | float]:
+        return net_balances(self._mapped_sums(bucket, 'debit'), self._mapped_sums(bucket, 'credit'))
+
+    def opening_balances(self) -> dict[str, int | float]:
+        return self._balances('opening')
+
+    def mid_year_balances(self) -> dict[str, int | float]:
+        return self._balances('mid_year')
+
+    def account_names(self) -> set[str]:
+        """マッピング適用後の科目名。"""
+        return {self._target(self.mapping, name) for name in self.original_names()}
+
+
+def build_account_totals(journals_df: pd.DataFrame, mapping: Mapping[str, str]) -> Optional[AccountTotals]:
+    """
+    マッピング適用前の仕訳DataFrame（get_journals() の戻り値）から元の科目名ごとの合計を作る。
+    期首取引の判定には mapping 適用後の貸方科目を使う（FinancialStatementService と同じ規則）。
+    取引No・日付列がないなど期首取引を判定できない仕訳では None を返す。
+    """
+    if any(col not in journals_df.columns for col in HASH_COLUMNS):
+        return None
+    credit = journals_df['貸方勘定科目']
+    mapped_credit = credit.map(mapping).fillna(credit) if mapping else credit
+    opening = _opening_context(journals_df.assign(**{'貸方勘定科目': mapped_credit}))
+    if opening is None:
+        return None
+    opening_mask = opening[0]
+
+    dates = journals_df['日付']
+    start_month = int(dates.dropna().min().month)
+    in_start_month = dates.notna() & (dates.dt.month == start_month)
+    candidates = sorted(str(v) for v in credit[in_start_month].dropna().unique())
+
+    sums = _empty_buckets()
+    bucket = opening_mask.map({True: 'opening', False: 'mid_year'})
+    for side, account_col, amount_col in _SIDES:
+        grouped = journals_df[amount_col].groupby([bucket, journals_df[account_col]], sort=True).sum()
+        for (bucket_name, account), amount in grouped.items():
+            sums[bucket_name][side][str(account)] = _plain_number(amount)
+    return AccountTotals(dict(mapping), sums, candidates)
@@ -0,0 +1,185 @@
+# app/company/services/accounting_balance_tables.py
+"""AccountingData の科目別残高・内訳書別合計の正規化テーブル。
+
+ACCOUNTING_BALANCE_TABLES が有効な間は、会計データを保存するたびに JSON と同じ内容を
+AccountingBalance / AccountingBreakdownTotal にも書き込む（二重書き込み）。SoA の集計は
+テーブルに書き込み済みの行（normalized_at あり）について、JSON を読まずに SQL の集計で求める。
+既存の行は ``flask backfill-accounting-balances`` で書き込む。
+"""
+from __future__ import annotations
+
+import datetime as _dt
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+import sqlalchemy as sa
+from flask import current_app
+
+from app.company.models import AccountingBalance, AccountingBreakdownTotal, AccountingData
+from app.company.services.accounting_payload import get_accounting_payload
+from app.extensions import db
+
+
+def use_balance_tables() -> bool:
+    try:
+        return bool(current_app.config.get('ACCOUNTING_BALANCE_TABLES', False))
+    except Exception:
+        return False
+
+
+def _balance_rows(accounting_id: int, raw_balances) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    if not isinstance(raw_balances, dict):
+        return rows
+    for key, value in raw_balances.items():
+        try:
+            rows.append({'accounting_data_id': accounting_id, 'account_id': int(key), 'amount': int(value)})
+        except (TypeError, ValueError):
+            continue
+    return rows
+
+
+def _breakdown_rows(accounting_id: int, raw_breakdowns) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    if not isinstance(raw_breakdowns, dict):
+        return rows
+    for name, value in raw_breakdowns.items():
+        try:
+            rows.append({'accounting_data_id': accounting_id, 'breakdown_document': str(name), 'amount': int(value)})
+        except (TypeError, ValueError):
+            continue
+    return rows
+
+
+def write_balance_tables(session, accounting_data: AccountingData) -> None:
+    """accounting_data.data の残高と内訳書別合計を正規化テーブルに書き込む（既存の行は置き換える）。"""
+    if accounting_data.id is None:
+        session.flush()
+    accounting_id = accounting_data.id
+    payload = accounting_data.data if isinstance(accounting_data.data, dict) else {}
+    session.execute(sa.delete(AccountingBalance).where(AccountingBalance.accounting_data_id == accounting_id))
+    session.execute(
+        sa.delete(AccountingBreakdownTotal).where(AccountingBreakdownTotal.accounting_data_id == accounting_id)
+    )
+    balances = _balance_rows(accounting_id, payload.get('account_balances'))
+    if balances:
+        session.execute(sa.insert(AccountingBalance), balances)
+    breakdowns = _breakdown_rows(accounting_id, payload.get('soa_breakdowns'))
+    if breakdowns:
+        session.execute(sa.insert(AccountingBreakdownTotal), breakdowns)
+    accounting_data.normalized_at = _dt.datetime.utcnow()
+
+
+def delete_balance_tables(session, company_id: int) -> None:
+    """会社の会計データに紐づく正規化テーブルの行を削除する（AccountingData を一括削除する前に呼ぶ）。"""
+    accounting_ids = sa.select(AccountingData.id).where(AccountingData.company_id == company_id)
+    session.execute(sa.delete(AccountingBalance).where(AccountingBalance.accounting_data_id.in_(accounting_ids)))
+    session.execute(
+        sa.delete(AccountingBreakdownTotal).where(AccountingBreakdownTotal.accounting_data_id.in_(accounting_ids))
+    )
+
+
+def backfill_balance_tables(session, company_id: int | None = None, batch_size: int = 100) -> int:
+    """正規化テーブル未作成の会計データを batch_size 件ずつ書き込み、件数を返す。"""
+    written = 0
+    while True:
+        query = session.query(AccountingData).filter(AccountingData.normalized_at.is_(None))
+        if company_id is not None:
+            query = query.filter(AccountingData.company_id == company_id)
+        batch = query.order_by(AccountingData.id).limit(batch_size).all()
+        if not batch:
+            return written
+        for accounting_data in batch:
+            write_balance_tables(session, accounting_data)
+        session.commit()
+        written += len(batch)
+
+
+class _StoredBalanceSums:
+    """対象 ID の組ごとに SQL で集計済みの |残高| の合計（AccountBalanceVector と同じ使い方をする）。"""
+
+    def __init__(self, accounting_id: int, sums: dict[tuple[int, ...], int], has_rows: bool):
+        self._accounting_id = accounting_id
+        self._sums = sums
+        self._has_rows = has_rows
+
+    def __bool__(self) -> bool:
+        return self._has_rows
+
+    def sum_abs(self, target_ids: np.ndarray) -> int:
+        key = tuple(int(value) for value in target_ids.tolist())
+        if not key:
+            return 0
+        if key not in self._sums:
+            self._sums[key] = int(db.session.execute(_sum_abs_select(self._accounting_id, key)).scalar() or 0)
+        return self._sums[key]
+
+
+def _sum_abs_select(accounting_id: int, account_ids: tuple[int, ...]):
+    return sa.select(sa.func.coalesce(sa.func.sum(sa.func.abs(AccountingBalance.amount)), 0)).where(
+        AccountingBalance.accounting_data_id == accounting_id,
+        AccountingBalance.account_id.in_(account_ids),
+    )
+
+
+class StoredAccountingTotals:
+    """
+    正規化テーブルから読んだ SoA 集計用の値。AccountingPayload と同じ属性で使える。
+    明細の科目名による合計（残高の無い古い会計データ向け）だけは JSON に戻って求める。
+    """
+
+    def __init__(self, accounting_data: AccountingData, balances: _StoredBalanceSums, soa_breakdowns: Mapping[str, int]):
+        self._accounting_data = accounting_data
+        self.balances = balances
+        self.soa_breakdowns = soa_breakdowns
+
+    def _payload(self):
+        return get_accounting_payload(self._accounting_data)
+
+    def sum_bs(self, names: Iterable[str]) -> int:
+        names = tuple(names)
+        return self._payload().sum_bs(names) if names else 0
+
+    def sum_pl(self, names: Iterable[str]) -> int:
+        names = tuple(names)
+        return self._payload().sum_pl(names) if names else 0
+
+
+def load_stored_totals(accounting_data: AccountingData, id_sets: Iterable[tuple[int, ...]]) -> StoredAccountingTotals:
+    """
+    id_sets（ページごとの対象 ID の組）の |残高| 合計・残高の有無・内訳書別合計を
+    UNION ALL の1文で読み込む。(accounting_data_id, account_id) の主キーで絞り込む。
+    """
+    accounting_id = accounting_data.id
+    keys = list(dict.fromkeys(tuple(ids) for ids in id_sets if ids))
+    balance = AccountingBalance
+    breakdown = AccountingBreakdownTotal
+    selects = [
+        sa.select(
+            sa.literal('count').label('kind'), sa.literal('').label('label'), sa.func.count().label('amount')
+        ).where(balance.accounting_data_id == accounting_id),
+        sa.select(
+            sa.literal('breakdown').label('kind'), breakdown.breakdown_document, breakdown.amount
+        ).where(breakdown.accounting_data_id == accounting_id),
+    ]
+    for position, ids in enumerate(keys):
+        selects.append(
+            sa.select(
+                sa.literal('sum').label('kind'),
+                sa.literal(str(position)).label('label'),
+                sa.func.coalesce(sa.func.sum(sa.func.abs(balance.amount)), 0),
+            ).where(balance.accounting_data_id == accounting_id, balance.account_id.in_(ids))
+        )
+
+    has_rows = False
+    sums: dict[tuple[int, ...], int] = {}
+    breakdowns: dict[str, int] = {}
+    for kind, label, amount in db.session.execute(sa.union_all(*selects)):
+        if kind == 'count':
+            has_rows = bool(amount)
+        elif kind == 'breakdown':
+            breakdowns[label] = int(amount)
+        else:
+            sums[keys[int(label)]] = int(amount or 0)
+    return StoredAccountingTotals(accounting_data, _StoredBalanceSums(accounting_id, sums, has_rows), breakdowns)
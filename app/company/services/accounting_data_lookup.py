@@ -0,0 +1,103 @@
+# app/company/services/accounting_data_lookup.py
+"""会社ごとの最新の AccountingData を取得する共通の入口。
+
+1リクエストの間は g に保持して使い回す（画面・サイドバー・SoA 集計で同じ行を何度も読まない）。
+ACCOUNTING_DATA_LATEST_CACHE が有効なら、最新行の ID をプロセス内でリクエストをまたいで保持し、
+並び替えの照会を主キーでの取得に置き換える。会計データは取込・再計算・付け替えのたびに
+会社の既存行を削除してから作り直すので、保持している ID の行が消えていれば照会し直せばよい。
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g, has_request_context
+from sqlalchemy.orm import defer
+
+from app.company.models import AccountingData
+from app.company.services.accounting_balance_tables import use_balance_tables
+from app.company.services.accounting_payload import discard_accounting_payloads
+
+LATEST_ID_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+
+def get_latest_accounting_data(company_id: int) -> AccountingData | None:
+    """会社の最新の会計データ（無ければ None）。"""
+    memo = g.setdefault('_latest_accounting_data', {}) if has_request_context() else None
+    if memo is not None:
+        cached = memo.get(company_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
+    latest = _load_latest(company_id)
+    if memo is not None:
+        memo[company_id] = latest
+    return latest
+
+
+def forget_accounting_data(company_id: int) -> None:
+    """会社の会計データを削除・置換した後に呼ぶ（最新行の保持と解釈済みペイロードを破棄する）。"""
+    with _latest_lock:
+        _latest_ids.pop(company_id, None)
+    if has_request_context():
+        memo = g.get('_latest_accounting_data')
+        if memo:
+            memo.pop(company_id, None)
+    discard_accounting_payloads(company_id)
+
+
+def clear_latest_accounting_data_cache() -> None:
+    """Invalidate the in-process cache for latest accounting data ids."""
+    with _latest_lock:
+        _latest_ids.clear()
+
+
+_latest_lock = threading.Lock()
+_latest_ids: OrderedDict[int, int] = OrderedDict()
+
+
+def _use_latest_cache() -> bool:
+    try:
+        cfg = current_app.config
+    except RuntimeError:
+        return False
+    if bool(cfg.get('TESTING', False)):
+        return False
+    return bool(cfg.get('ACCOUNTING_DATA_LATEST_CACHE', False))
+
+
+def _query():
+    query = AccountingData.query
+    if use_balance_tables():
+        # SoA の集計は正規化テーブルで行うので、JSON 列は必要になったときだけ読む
+        query = query.options(
+            defer(AccountingData.data), defer(AccountingData.journal_partials), defer(AccountingData.account_totals)
+        )
+    return query
+
+
+def _load_latest(company_id: int) -> AccountingData | None:
+    use_cache = _use_latest_cache()
+    if use_cache:
+        with _latest_lock:
+            latest_id = _latest_ids.get(company_id)
+        if latest_id is not None:
+            row = _query().filter_by(id=latest_id).first()
+            if row is not None and row.company_id == company_id:
+                return row
+
+    # (company_id, created_at DESC) の複合インデックスで先頭1件だけを読む
+    latest = (
+        _query()
+        .filter_by(company_id=company_id)
+        .order_by(AccountingData.created_at.desc())
+        .first()
+    )
+    if use_cache and latest is not None:
+        with _latest_lock:
+            _latest_ids[company_id] = latest.id
+            _latest_ids.move_to_end(company_id)
+            while len(_latest_ids) > LATEST_ID_CACHE_SIZE:
+                _latest_ids.popitem(last=False)
+    return latest
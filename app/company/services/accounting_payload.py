@@ -0,0 +1,202 @@
+# app/company/services/accounting_payload.py
+"""AccountingData.data（JSON）を読み取り用に一度だけ解釈した結果。
+
+残高（マスターID→金額）は整数の配列に、BS/PL の階層は科目名→金額の平坦な索引にしておき、
+SoA の集計や申告書画面のたびに JSON を辿り直さないようにする。
+(AccountingData.id, source_hash, updated_at) ごとに上限付き LRU でリクエストをまたいで共有し、
+行を削除・置換したプロセスでは会社単位で破棄する（SQLite は削除後に同じ id を再利用することがある）。
+構築後は読み取り専用（各セクションの dict は呼び出し側で書き換えないこと）。
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import Any
+
+from flask import current_app
+
+from app.domain.soa.targets import AccountBalanceVector
+
+PAYLOAD_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class AccountingPayload:
+    balance_sheet: Mapping[str, Any]
+    profit_loss_statement: Mapping[str, Any]
+    soa_breakdowns: Mapping[str, Any]
+    account_balances: Mapping[int, int]
+    balances: AccountBalanceVector
+    bs_amounts: Mapping[str, Any]
+    pl_amounts: Mapping[str, Any]
+    capital_stock_amount: int
+
+    @classmethod
+    def from_data(cls, data) -> AccountingPayload:
+        payload = data if isinstance(data, dict) else {}
+        balance_sheet = _section(payload, 'balance_sheet')
+        profit_loss = _section(payload, 'profit_loss_statement')
+        balances = _int_balances(payload.get('account_balances'))
+        return cls(
+            balance_sheet=balance_sheet,
+            profit_loss_statement=profit_loss,
+            soa_breakdowns=MappingProxyType(_section(payload, 'soa_breakdowns')),
+            account_balances=MappingProxyType(balances),
+            balances=AccountBalanceVector(balances),
+            bs_amounts=MappingProxyType(_amounts_by_name(balance_sheet)),
+            pl_amounts=MappingProxyType(_amounts_by_name(profit_loss)),
+            capital_stock_amount=_capital_stock_amount(balance_sheet),
+        )
+
+    def sum_bs(self, names: Iterable[str]) -> int:
+        """BS の明細のうち names に含まれる科目の金額合計。"""
+        return _sum_names(self.bs_amounts, names)
+
+    def sum_pl(self, names: Iterable[str]) -> int:
+        """PL の明細のうち names に含まれる科目の金額合計。"""
+        return _sum_names(self.pl_amounts, names)
+
+    def pl_value(self, category: str, account_name: str):
+        """PL の集計行（total / amount / value の順で最初にある値）。無ければ None。"""
+        category_data = self.profit_loss_statement.get(category)
+        if not isinstance(category_data, dict):
+            return None
+        account = category_data.get(account_name)
+        if isinstance(account, dict):
+            for key in ('total', 'amount', 'value'):
+                if account.get(key) is not None:
+                    return account.get(key)
+        return None
+
+
+def _section(payload: dict, name: str) -> dict[str, Any]:
+    candidate = payload.get(name)
+    return candidate if isinstance(candidate, dict) else {}
+
+
+def _int_balances(raw_balances) -> dict[int, int]:
+    if not isinstance(raw_balances, dict):
+        return {}
+    balances: dict[int, int] = {}
+    for key, value in raw_balances.items():
+        try:
+            balances[int(key)] = int(value)
+        except (TypeError, ValueError):
+            continue
+    return balances
+
+
+def _amounts_by_name(section: dict[str, Any]) -> dict[str, Any]:
+    """
+    階層を一度だけ辿り、明細（items）の科目名ごとに金額を合算する。
+    辿り方は従来の SoASummaryService._find_and_sum_by_names と同じ（items を持つ dict はその下を辿らない）。
+    """
+    amounts: dict[str, Any] = {}
+    stack = [section]
+    while stack:
+        node = stack.pop()
+        for value in node.values():
+            if not isinstance(value, dict):
+                continue
+            items = value.get('items')
+            if isinstance(items, list):
+                for item in items:
+                    name = item.get('name') if isinstance(item, dict) else None
+                    if not isinstance(name, str):
+                        continue
+                    try:
+                        amounts[name] = amounts.get(name, 0) + (item.get('amount', 0) or 0)
+                    except TypeError:
+                        # 数値でない金額は集計しない（資本金は capital_stock_amount が文字列も解釈する）
+                        continue
+            else:
+                stack.append(value)
+    return amounts
+
+
+def _sum_names(amounts: Mapping[str, Any], names: Iterable[str]) -> int:
+    total = 0
+    for name in set(names):
+        total += amounts.get(name, 0)
+    return total
+
+
+def _capital_stock_amount(balance_sheet: dict[str, Any]) -> int:
+    """純資産 > 株主資本 の明細にある資本金の金額（無ければ 0）。"""
+    equity = balance_sheet.get('純資産')
+    shareholders = equity.get('株主資本') if isinstance(equity, dict) else None
+    if not isinstance(shareholders, dict):
+        return 0
+    for item in shareholders.get('items') or []:
+        if isinstance(item, dict):
+            name = item.get('name')
+            amount = item.get('amount')
+        else:
+            name = getattr(item, 'name', None)
+            amount = getattr(item, 'amount', None)
+        if name == '資本金':
+            try:
+                return int(Decimal(str(amount))) if amount is not None else 0
+            except (InvalidOperation, TypeError, ValueError):
+                return 0
+    return 0
+
+
+_payload_lock = threading.Lock()
+_payload_cache: OrderedDict[tuple, AccountingPayload] = OrderedDict()
+
+
+def get_accounting_payload(accounting_data) -> AccountingPayload:
+    """
+    AccountingData の解釈済みペイロードを返す。
+    保存済みの行は (company_id, id, source_hash, updated_at) をキーにプロセス内で共有する（テスト時は毎回作る）。
+    """
+    key = _payload_cache_key(accounting_data)
+    if key is None:
+        return AccountingPayload.from_data(getattr(accounting_data, 'data', None))
+    with _payload_lock:
+        cached = _payload_cache.get(key)
+        if cached is not None:
+            _payload_cache.move_to_end(key)
+            return cached
+    payload = AccountingPayload.from_data(getattr(accounting_data, 'data', None))
+    with _payload_lock:
+        _payload_cache[key] = payload
+        _payload_cache.move_to_end(key)
+        while len(_payload_cache) > PAYLOAD_CACHE_SIZE:
+            _payload_cache.popitem(last=False)
+    return payload
+
+
+def discard_accounting_payloads(company_id: int) -> None:
+    """会社の解釈済みペイロードを破棄する（AccountingData を削除・置換したとき）。"""
+    with _payload_lock:
+        for key in [key for key in _payload_cache if key[0] == company_id]:
+            del _payload_cache[key]
+
+
+def clear_accounting_payload_cache() -> None:
+    """Invalidate the in-process cache for decoded AccountingData payloads."""
+    with _payload_lock:
+        _payload_cache.clear()
+
+
+def _payload_cache_key(accounting_data) -> tuple | None:
+    accounting_id = getattr(accounting_data, 'id', None)
+    if accounting_id is None:
+        return None
+    try:
+        if bool(current_app.config.get('TESTING', False)):
+            return None
+    except RuntimeError:
+        return None
+    return (
+        getattr(accounting_data, 'company_id', None),
+        accounting_id,
+        getattr(accounting_data, 'source_hash', None),
+        getattr(accounting_data, 'updated_at', None),
+    )
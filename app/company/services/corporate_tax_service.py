@@ -8,6 +8,7 @@ from dateutil.relativedelta import relativedelta
 from sqlalchemy import and_
 
 from app.company.models import AccountingData, Company, CorporateTaxMaster
+from app.company.services.accounting_data_lookup import get_latest_accounting_data
 from app.extensions import db
 from app.tax_engine import (
     DEFAULT_EQUALIZATION_DEFAULTS,
@@ -38,12 +39,7 @@ class CorporateTaxCalculationService:
 
     @staticmethod
     def _latest_accounting_data(company_id: int) -> AccountingData | None:
-        return (
-            AccountingData.query
-            .filter_by(company_id=company_id)
-            .order_by(AccountingData.created_at.desc())
-            .first()
-        )
+        return get_latest_accounting_data(company_id)
 
     @staticmethod
     def _resolve_master(company: Company | None) -> CorporateTaxMaster | None:
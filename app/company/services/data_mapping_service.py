@@ -1,9 +1,9 @@
 # app/company/services/data_mapping_service.py
 from collections import defaultdict
 
-from thefuzz import process
-
 from app.company.models import AccountTitleMaster, UserAccountMapping
+from app.company.services.mapping_suggester import get_mapping_suggester
+from app.company.services.master_data_service import get_master_snapshot
 from app.domain.master.catalog import load_catalog
 from app.extensions import db
 
@@ -97,32 +97,41 @@ class DataMappingService:
 
         return unmatched
 
+    def _get_mapping_suggester(self, master_choices):
+        return get_mapping_suggester(
+            get_master_snapshot().get_version_hash(), master_choices.keys(), self.catalog.normalize
+        )
+
     def get_mapping_suggestions(self, unmatched_accounts):
         master_accounts = self._get_master_accounts()
-        master_choices, alias_map_norm, master_norm_to_name = self._get_normalized_master_index()
-
-        mapping_items = []
-        for account in unmatched_accounts:
-            suggested_master_id = None
-            norm_acc = self._normalize_string(account)
+        master_choices, alias_map_norm, _ = self._get_normalized_master_index()
 
-            alias_target = alias_map_norm.get(norm_acc)
+        suggested: dict[int, str] = {}
+        fuzzy_positions = []
+        for i, account in enumerate(unmatched_accounts):
+            alias_target = alias_map_norm.get(self._normalize_string(account))
             if alias_target and alias_target in master_choices:
-                suggested_master_id = master_choices[alias_target]
+                suggested[i] = alias_target
             else:
-                best_match = process.extractOne(account, master_choices.keys())
-                if best_match and best_match[1] > 65:
-                    suggested_master_id = master_choices[best_match[0]]
-                else:
-                    best_norm = process.extractOne(norm_acc, list(master_norm_to_name.keys()))
-                    if best_norm and best_norm[1] > 70:
-                        target_name = master_norm_to_name[best_norm[0]]
-                        suggested_master_id = master_choices.get(target_name)
-
-            mapping_items.append({
+                fuzzy_positions.append(i)
+
+        if fuzzy_positions:
+            # 残りの科目は全マスター科目とのスコアを一括で計算する
+            accounts = [unmatched_accounts[i] for i in fuzzy_positions]
+            matches = self._get_mapping_suggester(master_choices).suggest(
+                accounts, [self._normalize_string(account) for account in accounts]
+            )
+            for i, name in zip(fuzzy_positions, matches):
+                if name is not None:
+                    suggested[i] = name
+
+        mapping_items = [
+            {
                 'original_name': account,
-                'suggested_master_id': suggested_master_id,
-            })
+                'suggested_master_id': master_choices.get(suggested[i]) if i in suggested else None,
+            }
+            for i, account in enumerate(unmatched_accounts)
+        ]
         return mapping_items, master_accounts
 
     def save_mappings(self, mappings_form_data, software_name):
@@ -172,17 +181,20 @@ class DataMappingService:
             
         return dict(mapped_balances)
 
+    def get_user_mappings(self) -> dict[str, str]:
+        """ユーザーのマッピング情報を {元の勘定科目名: マスター勘定科目名} の辞書として取得する。"""
+        return {
+            m.original_account_name: m.master_account.name
+            for m in UserAccountMapping.query.filter_by(user_id=self.user_id).all()
+        }
+
     def apply_mappings_to_journals(self, journals_df):
         """
         仕訳帳データフレームの勘定科目名を、保存されたマッピング情報に基づいてマスター名に変換する。
         複数の勘定科目列に対応する。
         """
-        # ユーザーのマッピング情報を辞書として取得
-        user_mappings = {
-            m.original_account_name: m.master_account.name 
-            for m in UserAccountMapping.query.filter_by(user_id=self.user_id).all()
-        }
-        
+        user_mappings = self.get_user_mappings()
+
         # マッピングを適用する可能性のある列名をリスト化
         account_columns = ['借方勘定科目', '貸方勘定科目']
         
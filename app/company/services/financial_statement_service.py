@@ -5,33 +5,43 @@ from typing import Optional
 
 import pandas as pd
 
-from .master_data_service import MasterDataService
+from .account_aggregation import StatementCodebook, aggregate_account_balances
+from .master_data_service import get_master_snapshot
 
 
 class FinancialStatementService:
     """財務諸表の生成に関連するロジックを処理するサービスクラス。"""
 
-    def __init__(self, journals_df: pd.DataFrame, start_date, end_date):
+    def __init__(self, journals_df: Optional[pd.DataFrame], start_date, end_date, *, totals=None):
         """
         Args:
             journals_df (pd.DataFrame): 仕訳帳データフレーム。
             start_date (date): 事業年度の開始日。
             end_date (date): 事業年度の終了日。
+            totals (JournalTotals | JournalPartials | None): 集計済みの勘定科目別合計
+                （opening_balances() / mid_year_balances() を持つオブジェクト）。
+                指定した場合は journals_df を使わずに期首・期中残高を組み立てる。
         """
-        master_data_service = MasterDataService()
         self.journals_df = journals_df
         # DataFrameの型と比較できるよう、dateをdatetimeに変換
         self.start_date = datetime.combine(start_date, datetime.min.time())
         self.end_date = datetime.combine(end_date, datetime.max.time())
-        self.bs_master = master_data_service.get_bs_master_df()
-        self.pl_master = master_data_service.get_pl_master_df()
+        # マスター由来の並び順・区分・科目IDはバージョンごとに共有されるレイアウトから取得する
+        self._layout = get_master_snapshot().get_statement_layout()
+        self.bs_master = self._layout.bs_master
+        self.pl_master = self._layout.pl_master
         self._soa_breakdowns = {}
         self._account_balances: dict[int, int] = {}
-        self._name_to_id_cache = self._build_name_to_id_map()
+        self._name_to_id_cache = self._layout.name_to_id
         self._pl_cache_key: Optional[tuple] = None
         self._pl_structure_cache: Optional[dict] = None
         self._net_income_cache: Optional[int] = None
 
+        if totals is not None:
+            self.opening_balances = totals.opening_balances()
+            self.mid_year_balances = totals.mid_year_balances()
+            return
+
         # 期首と期中の取引を分離
         opening_df, mid_year_df = self._separate_transactions(self.journals_df)
         self.opening_balances = self._calculate_balances_from_df(opening_df)
@@ -77,34 +87,12 @@ class FinancialStatementService:
         if df.empty:
             return defaultdict(int)
 
-        debits = df.groupby('借方勘定科目')['借方金額'].sum()
-        credits = df.groupby('貸方勘定科目')['貸方金額'].sum()
-        
-        balances = defaultdict(int)
-        for acc, amount in debits.items():
-            balances[acc] += amount
-        for acc, amount in credits.items():
-            balances[acc] -= amount
-            
-        return {k: v for k, v in balances.items() if v != 0}
+        return aggregate_account_balances(
+            df['借方勘定科目'], df['借方金額'], df['貸方勘定科目'], df['貸方金額'], self._layout.account_index
+        )
 
-    def _build_name_to_id_map(self) -> dict[str, int]:
-        mapping: dict[str, int] = {}
-        for df in (self.bs_master, self.pl_master):
-            if df is None or df.empty:
-                continue
-            if 'id' not in df.columns:
-                continue
-            try:
-                ids = df['id'].to_dict()
-            except Exception:
-                ids = {}
-            for name, raw_id in ids.items():
-                try:
-                    mapping[str(name)] = int(raw_id)
-                except (TypeError, ValueError):
-                    continue
-        return mapping
+    def _codebook_for(self, master_df) -> StatementCodebook:
+        return self._layout.bs if master_df is self.bs_master else self._layout.pl
 
     def _lookup_account_id(self, account_name: str) -> Optional[int]:
         return self._name_to_id_cache.get(str(account_name))
@@ -134,17 +122,9 @@ class FinancialStatementService:
         return all_balances
 
     def _compute_breakdown_totals(self, balances):
-        breakdowns = {}
         if self.bs_master is None or self.bs_master.empty:
-            return breakdowns
-        for acc, amount in balances.items():
-            if acc not in self.bs_master.index:
-                continue
-            doc = self.bs_master.at[acc, 'breakdown_document'] if 'breakdown_document' in self.bs_master.columns else None
-            if not isinstance(doc, str) or not doc.strip():
-                continue
-            breakdowns[doc] = breakdowns.get(doc, 0) + amount
-        return breakdowns
+            return {}
+        return self._layout.bs.breakdown_totals(balances)
 
     def _get_pl_statement(self, balances):
         cache_key = tuple(sorted(balances.items())) if balances else None
@@ -230,58 +210,13 @@ class FinancialStatementService:
         return pl_structure, net_income
 
     def _group_balances_by_statement(self, balances, master_df) -> dict[tuple[str | None, str | None, str], int]:
-        grouped: dict[tuple[str | None, str | None, str], int] = {}
         if master_df is None or master_df.empty:
-            return grouped
-        for account_name, amount in balances.items():
-            if account_name not in master_df.index:
-                continue
-            try:
-                row = master_df.loc[account_name]
-            except Exception:
-                continue
-            major = row.get('major_category') if isinstance(row, pd.Series) else None
-            middle = row.get('middle_category') if isinstance(row, pd.Series) else None
-            statement_name = row.get('statement_name') if isinstance(row, pd.Series) else None
-            if pd.isna(statement_name) or not str(statement_name).strip():
-                statement_name = account_name
-            key = (str(major) if major is not None else None, str(middle) if middle is not None else None, str(statement_name))
-            grouped[key] = grouped.get(key, 0) + amount
-        return grouped
+            return {}
+        return self._codebook_for(master_df).group_by_statement(balances)
 
     def _calculate_sort_orders(self, master_df):
-        major_order: dict[str, int] = {}
-        middle_order: dict[str, int] = {}
-        statement_order: dict[tuple[str | None, str | None, str], int] = {}
-        if master_df is None or master_df.empty:
-            return major_order, middle_order, statement_order
-        for account_name in master_df.index:
-            try:
-                row = master_df.loc[account_name]
-            except Exception:
-                continue
-            number = row.get('number') if isinstance(row, pd.Series) else None
-            try:
-                numeric_number = int(number)
-            except (TypeError, ValueError):
-                continue
-            major = row.get('major_category') if isinstance(row, pd.Series) else None
-            middle = row.get('middle_category') if isinstance(row, pd.Series) else None
-            statement_name = row.get('statement_name') if isinstance(row, pd.Series) else None
-            if pd.isna(statement_name) or not str(statement_name).strip():
-                statement_name = account_name
-            if isinstance(major, str) and (major not in major_order or numeric_number < major_order[major]):
-                major_order[major] = numeric_number
-            if isinstance(middle, str) and (middle not in middle_order or numeric_number < middle_order[middle]):
-                middle_order[middle] = numeric_number
-            stmt_key = (
-                str(major) if major is not None else None,
-                str(middle) if middle is not None else None,
-                str(statement_name),
-            )
-            if stmt_key not in statement_order or numeric_number < statement_order[stmt_key]:
-                statement_order[stmt_key] = numeric_number
-        return major_order, middle_order, statement_order
+        codebook = self._codebook_for(master_df)
+        return codebook.major_order, codebook.middle_order, codebook.statement_order
 
     def _build_initial_structure(self, grouped_amounts, is_bs: bool):
         from collections import defaultdict as _dd
@@ -1,7 +1,19 @@
 from __future__ import annotations
 
+from flask import current_app
+
 from app.company.models import AccountingData, Company
+from app.company.services.account_totals import AccountTotals
+from app.company.services.accounting_balance_tables import (
+    delete_balance_tables,
+    use_balance_tables,
+    write_balance_tables,
+)
+from app.company.services.accounting_data_lookup import forget_accounting_data, get_latest_accounting_data
+from app.company.services.data_mapping_service import DataMappingService
+from app.company.services.financial_statement_service import FinancialStatementService
 from app.extensions import db
+from app.services.db_utils import session_scope
 
 
 def _company_id_for_user(user_id: int) -> int | None:
@@ -14,8 +26,11 @@ def invalidate_accounting_data(company_id: int) -> bool:
 
     Returns True if any records were deleted. Caller handles session/redirect.
     """
+    if use_balance_tables():
+        delete_balance_tables(db.session, company_id)
     deleted = db.session.query(AccountingData).filter_by(company_id=company_id).delete()
     db.session.commit()
+    forget_accounting_data(company_id)
     return bool(deleted)
 
 
@@ -23,23 +38,77 @@ def has_accounting_data(company_id: int) -> bool:
     return db.session.query(AccountingData.id).filter_by(company_id=company_id).first() is not None
 
 
-def on_mapping_saved(user_id: int) -> bool:
-    cid = _company_id_for_user(user_id)
-    if cid is None:
-        return False
-    return invalidate_accounting_data(cid)
+def remap_accounting_data(user_id: int, company_id: int) -> bool:
+    """Re-apply the user's current mappings to the stored per-account totals.
 
+    Only the accounts whose mapping target changed are re-keyed; the journal is not
+    re-read. The rebuilt AccountingData replaces the old rows in one transaction.
+    Returns False when the journal itself is needed (no stored totals, the opening-entry
+    split would change, or an account would become unmapped); the caller then invalidates.
+    """
+    latest = get_latest_accounting_data(company_id)
+    totals = AccountTotals.from_payload(latest.account_totals) if latest is not None else None
+    if totals is None:
+        return False
 
-def on_mapping_deleted(user_id: int) -> bool:
-    cid = _company_id_for_user(user_id)
-    if cid is None:
+    mapping_service = DataMappingService(user_id)
+    mapping = mapping_service.get_user_mappings()
+    changed = totals.changed_accounts(mapping)
+    if not changed:
+        return True
+    if totals.requires_journals(mapping):
+        return False
+    remapped = totals.remapped(mapping)
+    if mapping_service.get_unmatched_accounts(sorted(remapped.account_names())):
         return False
-    return invalidate_accounting_data(cid)
 
+    fs_service = FinancialStatementService(None, latest.period_start, latest.period_end, totals=remapped)
+    data = {
+        'balance_sheet': fs_service.create_balance_sheet(),
+        'profit_loss_statement': fs_service.create_profit_loss_statement(),
+        'soa_breakdowns': fs_service.get_soa_breakdowns(),
+        'account_balances': fs_service.get_account_balances(),
+    }
+    with session_scope() as session:
+        if use_balance_tables():
+            delete_balance_tables(session, company_id)
+        session.query(AccountingData).filter_by(company_id=company_id).delete()
+        rebuilt = AccountingData(
+            company_id=company_id,
+            period_start=latest.period_start,
+            period_end=latest.period_end,
+            schema_version=latest.schema_version,
+            algo_version=latest.algo_version,
+            source_hash=latest.source_hash,
+            data=data,
+            # 月別部分合計はマッピング適用後の科目名で持つため、付け替え後は使えない
+            journal_partials=None,
+            account_totals=remapped.to_payload(),
+        )
+        session.add(rebuilt)
+        if use_balance_tables():
+            write_balance_tables(session, rebuilt)
+    forget_accounting_data(company_id)
+    current_app.logger.info('Remapped accounting data for company %s: %s', company_id, ', '.join(changed))
+    return True
 
-def on_mappings_reset(user_id: int) -> bool:
+
+def _remap_or_invalidate(user_id: int) -> bool:
     cid = _company_id_for_user(user_id)
     if cid is None:
         return False
+    if remap_accounting_data(user_id, cid):
+        return False
     return invalidate_accounting_data(cid)
 
+
+def on_mapping_saved(user_id: int) -> bool:
+    return _remap_or_invalidate(user_id)
+
+
+def on_mapping_deleted(user_id: int) -> bool:
+    return _remap_or_invalidate(user_id)
+
+
+def on_mappings_reset(user_id: int) -> bool:
+    return _remap_or_invalidate(user_id)
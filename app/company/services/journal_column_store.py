@@ -0,0 +1,161 @@
+# app/company/services/journal_column_store.py
+"""解析済み仕訳の列指向キャッシュ。
+
+アップロード時に解析した仕訳を、元CSVの隣（``journals_<uuid>.csv.columns/``）に列ごとの
+``.npy`` として一度だけ書き出す。マッピング保存後の再計算などではCSVを再デコード・再解析せず、
+``np.load(mmap_mode='r')`` でメモリマップして DataFrame を組み立てる。
+
+- 勘定科目列と取引Noは辞書符号化（int32 のコード列 + ``dictionaries.json``）。
+- ストアは書き出した後は読み取り専用で、元の科目名（マッピング適用前）を保持する。マッピングは
+  読み出し時に辞書へ適用するだけで、行データの置換は行わない（元の科目名ごとの合計も同じストアから作れる）。
+
+ファイル構成::
+
+    meta.json            {"version": 1, "rows": N, "amount_dtypes": {...}}
+    dictionaries.json    {"id": [...], "debit_account": [...], "credit_account": [...]}
+    id.npy, date.npy, debit_account.npy, credit_account.npy, debit_amount.npy, credit_amount.npy
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import uuid
+from collections.abc import Mapping
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.company.parsers.normalizers import normalize_journal_dataframe
+
+STORE_VERSION = 1
+ACCOUNT_COLUMNS = {'debit_account': '借方勘定科目', 'credit_account': '貸方勘定科目'}
+AMOUNT_COLUMNS = {'debit_amount': '借方金額', 'credit_amount': '貸方金額'}
+_META_FILE = 'meta.json'
+_DICTIONARY_FILE = 'dictionaries.json'
+
+
+def column_store_path(raw_upload_path: str) -> str:
+    return raw_upload_path + '.columns'
+
+
+def remove_column_store(raw_upload_path: str) -> None:
+    shutil.rmtree(column_store_path(raw_upload_path), ignore_errors=True)
+
+
+def _json_value(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _encode(series: pd.Series) -> tuple[np.ndarray, list]:
+    codes, uniques = pd.factorize(series)
+    return codes.astype(np.int32), [_json_value(v) for v in uniques]
+
+
+def _write_json(path: str, payload: dict[str, Any]) -> None:
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+REQUIRED_COLUMNS = ('id', '日付', *ACCOUNT_COLUMNS.values(), *AMOUNT_COLUMNS.values())
+
+
+class JournalColumnStore:
+    """列指向で保存された解析済み仕訳（読み取りはメモリマップ）。"""
+
+    @staticmethod
+    def supports(journals_df: Any) -> bool:
+        """get_journals() と同じ列構成の DataFrame なら True。"""
+        return isinstance(journals_df, pd.DataFrame) and all(col in journals_df.columns for col in REQUIRED_COLUMNS)
+
+    def __init__(self, path: str, meta: dict[str, Any], dictionaries: dict[str, list]):
+        self.path = path
+        self.meta = meta
+        self.dictionaries = dictionaries
+
+    @property
+    def row_count(self) -> int:
+        return int(self.meta['rows'])
+
+    # --- write -----------------------------------------------------------
+
+    @classmethod
+    def write(cls, path: str, journals_df: pd.DataFrame) -> JournalColumnStore:
+        """パーサーの get_journals() が返す DataFrame を path に書き出す（既存のストアは置き換える）。"""
+        tmp_dir = f'{path}.{uuid.uuid4().hex}.tmp'
+        os.makedirs(tmp_dir)
+        try:
+            dictionaries: dict[str, list] = {}
+            id_codes, dictionaries['id'] = _encode(journals_df['id'])
+            np.save(os.path.join(tmp_dir, 'id.npy'), id_codes)
+
+            dates = pd.to_datetime(journals_df['日付'], errors='coerce')
+            np.save(os.path.join(tmp_dir, 'date.npy'), dates.to_numpy(dtype='datetime64[ns]').view(np.int64))
+
+            for key, column in ACCOUNT_COLUMNS.items():
+                codes, dictionaries[key] = _encode(journals_df[column])
+                np.save(os.path.join(tmp_dir, f'{key}.npy'), codes)
+
+            amount_dtypes: dict[str, str] = {}
+            for key, column in AMOUNT_COLUMNS.items():
+                values = journals_df[column]
+                if values.dtype.kind not in 'iuf':
+                    values = pd.to_numeric(values, errors='coerce')
+                array = values.to_numpy()
+                amount_dtypes[key] = str(array.dtype)
+                np.save(os.path.join(tmp_dir, f'{key}.npy'), array)
+
+            meta = {'version': STORE_VERSION, 'rows': int(len(journals_df)), 'amount_dtypes': amount_dtypes}
+            _write_json(os.path.join(tmp_dir, _DICTIONARY_FILE), dictionaries)
+            _write_json(os.path.join(tmp_dir, _META_FILE), meta)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_dir, path)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return cls(path, meta, dictionaries)
+
+    # --- read ------------------------------------------------------------
+
+    @classmethod
+    def open(cls, path: str) -> Optional[JournalColumnStore]:
+        """path のストアを開く。存在しない・版が異なる・壊れている場合は None。"""
+        try:
+            with open(os.path.join(path, _META_FILE), encoding='utf-8') as fh:
+                meta = json.load(fh)
+            with open(os.path.join(path, _DICTIONARY_FILE), encoding='utf-8') as fh:
+                dictionaries = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != STORE_VERSION:
+            return None
+        return cls(path, meta, dictionaries)
+
+    def _column(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode='r')
+
+    def _decode(self, key: str, mapping: Optional[Mapping[str, str]] = None) -> np.ndarray:
+        dictionary = self.dictionaries[key]
+        if mapping:
+            dictionary = [mapping.get(value, value) for value in dictionary]
+        # 末尾に欠損値を置き、コード -1（欠損）がそこを指すようにする
+        lookup = np.array([*dictionary, np.nan], dtype=object)
+        return lookup[self._column(key)]
+
+    def to_dataframe(self, account_mapping: Optional[Mapping[str, str]] = None) -> pd.DataFrame:
+        """
+        get_journals() と同じ列構成の DataFrame を組み立てる。
+        account_mapping を渡すと勘定科目辞書に適用する（行ごとの置換は行わない）。
+        """
+        frame = pd.DataFrame({
+            'id': self._decode('id'),
+            '日付': pd.to_datetime(np.asarray(self._column('date')).view('datetime64[ns]')),
+            '借方勘定科目': self._decode('debit_account', account_mapping),
+            '借方金額': np.asarray(self._column('debit_amount')),
+            '貸方勘定科目': self._decode('credit_account', account_mapping),
+            '貸方金額': np.asarray(self._column('credit_amount')),
+        })
+        return normalize_journal_dataframe(frame)
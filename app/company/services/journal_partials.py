@@ -0,0 +1,170 @@
+# app/company/services/journal_partials.py
+"""仕訳の月別・勘定科目別の部分合計と、再取込時の差分再計算。
+
+AccountingData.journal_partials に次の形式で保存する::
+
+    {"version": 1, "source_hash": "...", "context": "...",
+     "months": {"202404": {"hash": "...",
+                           "opening": {"debit": {科目: 金額}, "credit": {...}},
+                           "mid_year": {"debit": {...}, "credit": {...}}}, ...}}
+
+"context" は期首月と期首取引（期首月に貸方「資本金」を含む取引No）の要約で、これが変わると
+期首/期中の振り分けが変わるため全月を再計算する。それ以外は月ごとのハッシュを比較し、
+変化した月だけを集計し直す。残高は FinancialStatementService と同じ規則で組み立てる。
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import pandas as pd
+
+PARTIALS_VERSION = 1
+OPENING_CAPITAL_ACCOUNT = '資本金'
+HASH_COLUMNS = ('id', '日付', '借方勘定科目', '借方金額', '貸方勘定科目', '貸方金額')
+_BUCKETS = ('opening', 'mid_year')
+_SECOND_HASH_KEY = 'journal-partials'  # hash_pandas_object の hash_key は16文字
+
+
+def _plain_number(value) -> int | float:
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def _opening_context(df: pd.DataFrame) -> Optional[tuple[pd.Series, str]]:
+    """期首取引のマスクと、その判定条件の要約ハッシュ。判定できない場合は None。"""
+    dates = df['日付']
+    valid = dates.notna()
+    if df.empty or not valid.any():
+        return None
+    start_month = int(dates[valid].min().month)
+    in_start_month = valid & (dates.dt.month == start_month)
+    opening_ids = df.loc[in_start_month & (df['貸方勘定科目'] == OPENING_CAPITAL_ACCOUNT), 'id'].unique()
+    mask = df['id'].isin(opening_ids) if len(opening_ids) else pd.Series(False, index=df.index)
+    summary = json.dumps([PARTIALS_VERSION, start_month, sorted(str(i) for i in opening_ids)], ensure_ascii=False)
+    return mask, hashlib.sha256(summary.encode('utf-8')).hexdigest()
+
+
+def _month_keys(dates: pd.Series) -> pd.Series:
+    keys = (dates.dt.year * 100 + dates.dt.month).fillna(0).astype('int64')
+    return keys.astype(str)
+
+
+def _month_hashes(df: pd.DataFrame, months: pd.Series) -> dict[str, str]:
+    """月ごとの内容ハッシュ（行の順序に依存しない：行ハッシュの和2種と行数）。"""
+    columns = df[list(HASH_COLUMNS)]
+    frame = pd.DataFrame({
+        'month': months,
+        'h1': pd.util.hash_pandas_object(columns, index=False),
+        'h2': pd.util.hash_pandas_object(columns, index=False, hash_key=_SECOND_HASH_KEY),
+    })
+    grouped = frame.groupby('month', sort=True)
+    sums = grouped[['h1', 'h2']].sum()
+    counts = grouped.size()
+    return {
+        str(month): f'{int(counts[month])}-{int(row.h1):016x}-{int(row.h2):016x}'
+        for month, row in sums.iterrows()
+    }
+
+
+def net_balances(debits: Mapping[str, Any], credits: Mapping[str, Any]) -> dict[str, int | float]:
+    """勘定科目別の借方・貸方合計から純残高を求める（0 は除く）。"""
+    # FinancialStatementService と同じ並び（借方科目の名前順、続いて貸方のみの科目の名前順）
+    ordered = sorted(debits) + sorted(set(credits) - set(debits))
+    balances = {}
+    for account in ordered:
+        amount = debits.get(account, 0) - credits.get(account, 0)
+        if amount != 0:
+            balances[account] = _plain_number(amount)
+    return balances
+
+
+def _empty_month(digest: str) -> dict[str, Any]:
+    return {'hash': digest, **{bucket: {'debit': {}, 'credit': {}} for bucket in _BUCKETS}}
+
+
+def _fill_month_sums(target: dict[str, dict], df: pd.DataFrame, months: pd.Series, opening: pd.Series) -> None:
+    """変化した月の行だけを (月, 期首/期中, 勘定科目) で合計して target に書き込む。"""
+    bucket = opening.map({True: 'opening', False: 'mid_year'})
+    for side, account_col, amount_col in (('debit', '借方勘定科目', '借方金額'), ('credit', '貸方勘定科目', '貸方金額')):
+        sums = df[amount_col].groupby([months, bucket, df[account_col]], sort=True).sum()
+        for (month, bucket_name, account), amount in sums.items():
+            target[month][bucket_name][side][account] = _plain_number(amount)
+
+
+@dataclass
+class JournalPartials:
+    """月別の部分合計。FinancialStatementService(totals=...) にそのまま渡せる。"""
+
+    source_hash: str
+    context: str
+    months: dict[str, dict[str, Any]]
+    reused_months: list[str] = field(default_factory=list)
+    recomputed_months: list[str] = field(default_factory=list)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {'version': PARTIALS_VERSION, 'source_hash': self.source_hash, 'context': self.context, 'months': self.months}
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> Optional[JournalPartials]:
+        if not isinstance(payload, Mapping) or payload.get('version') != PARTIALS_VERSION:
+            return None
+        months = payload.get('months')
+        if not isinstance(months, Mapping):
+            return None
+        return cls(str(payload.get('source_hash') or ''), str(payload.get('context') or ''), dict(months))
+
+    def _balances(self, bucket: str) -> dict[str, int | float]:
+        debits: dict[str, float] = {}
+        credits: dict[str, float] = {}
+        for month in self.months.values():
+            for target, side in ((debits, 'debit'), (credits, 'credit')):
+                for account, amount in month[bucket][side].items():
+                    target[account] = target.get(account, 0) + amount
+        return net_balances(debits, credits)
+
+    def opening_balances(self) -> dict[str, int | float]:
+        return self._balances('opening')
+
+    def mid_year_balances(self) -> dict[str, int | float]:
+        return self._balances('mid_year')
+
+
+def build_journal_partials(
+    journals_df: pd.DataFrame, previous: Optional[JournalPartials], *, source_hash: str
+) -> Optional[JournalPartials]:
+    """
+    仕訳DataFrame（マッピング適用後）から月別の部分合計を作る。previous と内容が同じ月は再利用する。
+    取引No・日付列がないなど、期首取引を判定できない仕訳では None を返す（全件再計算に任せる）。
+    """
+    if any(col not in journals_df.columns for col in HASH_COLUMNS):
+        return None
+    if previous is not None and source_hash and previous.source_hash == source_hash:
+        return JournalPartials(source_hash, previous.context, previous.months, reused_months=sorted(previous.months))
+
+    opening = _opening_context(journals_df)
+    if opening is None:
+        return None
+    opening_mask, context = opening
+    months = _month_keys(journals_df['日付'])
+    hashes = _month_hashes(journals_df, months)
+
+    reusable = previous.months if previous is not None and previous.context == context else {}
+    result: dict[str, dict[str, Any]] = {}
+    changed: list[str] = []
+    reused: list[str] = []
+    for month, digest in hashes.items():
+        prior = reusable.get(month)
+        if isinstance(prior, Mapping) and prior.get('hash') == digest:
+            result[month] = dict(prior)
+            reused.append(month)
+        else:
+            result[month] = _empty_month(digest)
+            changed.append(month)
+
+    if changed:
+        rows = months.isin(changed)
+        _fill_month_sums(result, journals_df[rows], months[rows], opening_mask[rows])
+    return JournalPartials(source_hash, context, result, reused_months=reused, recomputed_months=changed)
@@ -0,0 +1,108 @@
+# app/company/services/mapping_suggester.py
+"""未マッピング勘定科目に対するマスター科目のあいまい一致候補。
+
+マスター科目名の前処理（thefuzz と同じ正規化）をマスターのバージョンごとに一度だけ行い、
+未マッピング科目すべてと全マスター科目のスコア行列を ``rapidfuzz.process.cdist`` で一括計算する
+（GIL を解放してマルチスレッドで実行）。スコアと同点時の選択は ``thefuzz.process.extractOne``
+（WRatio、既定の前処理）と一致する。
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Optional
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from thefuzz import utils as fuzz_utils
+
+NAME_SCORE_THRESHOLD = 65
+NORMALIZED_SCORE_THRESHOLD = 70
+
+
+def _process_choice(value: str) -> str:
+    # thefuzz.process は WRatio の選択肢に full_process(force_ascii=True) を適用する
+    return fuzz_utils.full_process(value, force_ascii=True)
+
+
+def _process_query(value: str) -> str:
+    # 問い合わせ側は full_process の後、選択肢と同じ前処理がもう一度かかる
+    return _process_choice(fuzz_utils.full_process(value))
+
+
+class MappingSuggester:
+    """マスター科目名の索引（構築後は読み取り専用で、スレッド間で共有できる）。"""
+
+    def __init__(self, master_names: Iterable[str], normalize: Callable[[str], str]):
+        self.master_names: tuple[str, ...] = tuple(master_names)
+        norm_to_name: dict[str, str] = {}
+        for name in self.master_names:
+            norm_to_name[normalize(name)] = name
+        self.normalized_names: tuple[str, ...] = tuple(norm_to_name)
+        self._normalized_targets: tuple[str, ...] = tuple(norm_to_name.values())
+        self._processed_names = [_process_choice(name) for name in self.master_names]
+        self._processed_normalized = [_process_choice(name) for name in self.normalized_names]
+
+    @staticmethod
+    def _best(queries: Sequence[str], choices: Sequence[str], threshold: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        各問い合わせについて最高スコアの選択肢番号（同点は先頭）と、その丸めたスコア。
+        threshold 未満のスコアは採用しないので、計算を打ち切って 0 として扱う。
+        """
+        if not queries or not choices:
+            size = len(queries)
+            return np.full(size, -1, dtype=np.intp), np.zeros(size, dtype=np.int64)
+        scores = process.cdist(
+            [_process_query(q) for q in queries], choices,
+            scorer=fuzz.WRatio, score_cutoff=threshold, dtype=np.float64, workers=-1,
+        )
+        best = scores.argmax(axis=1)
+        return best, np.rint(scores[np.arange(len(queries)), best]).astype(np.int64)
+
+    def suggest(self, accounts: Sequence[str], normalized_accounts: Sequence[str]) -> list[Optional[str]]:
+        """
+        accounts[i] に最も近いマスター科目名（しきい値未満なら None）。
+        まず元の表記で照合し、しきい値を超えなければ正規化した表記で照合し直す。
+        """
+        results: list[Optional[str]] = [None] * len(accounts)
+        best, scores = self._best(accounts, self._processed_names, NAME_SCORE_THRESHOLD)
+        retry = []
+        for i, (choice, score) in enumerate(zip(best, scores)):
+            if choice >= 0 and score > NAME_SCORE_THRESHOLD:
+                results[i] = self.master_names[choice]
+            else:
+                retry.append(i)
+        if retry:
+            best, scores = self._best(
+                [normalized_accounts[i] for i in retry], self._processed_normalized, NORMALIZED_SCORE_THRESHOLD
+            )
+            for i, choice, score in zip(retry, best, scores):
+                if choice >= 0 and score > NORMALIZED_SCORE_THRESHOLD:
+                    results[i] = self._normalized_targets[choice]
+        return results
+
+
+_cache_lock = threading.Lock()
+_suggester_cache: dict[str, MappingSuggester] = {}
+
+
+def get_mapping_suggester(
+    version_hash: str, master_names: Iterable[str], normalize: Callable[[str], str]
+) -> MappingSuggester:
+    """マスターのバージョンごとに共有する索引を返す（科目名の並びが変わっていれば作り直す）。"""
+    names = tuple(master_names)
+    with _cache_lock:
+        cached = _suggester_cache.get(version_hash)
+    if cached is not None and cached.master_names == names:
+        return cached
+    suggester = MappingSuggester(names, normalize)
+    with _cache_lock:
+        _suggester_cache.clear()
+        _suggester_cache[version_hash] = suggester
+    return suggester
+
+
+def clear_mapping_suggester_cache() -> None:
+    """Invalidate the in-process cache for mapping suggestion indexes."""
+    with _cache_lock:
+        _suggester_cache.clear()
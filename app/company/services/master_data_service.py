@@ -4,13 +4,19 @@ from __future__ import annotations
 import hashlib
 import logging
 import os
+import threading
+import time
+from collections.abc import Callable
 from functools import lru_cache
 from typing import Any
 
 import pandas as pd
-from flask import current_app
+import sqlalchemy as sa
+from flask import current_app, g, has_request_context
 
 from app.company.models import AccountTitleMaster, MasterVersion
+from app.company.services.account_aggregation import StatementLayout
+from app.company.services.mapping_suggester import clear_mapping_suggester_cache
 from app.extensions import db
 from app.services.master_data_loader import (
     clear_master_dataframe_cache,
@@ -56,24 +62,37 @@ class MasterDataService:
     def force_sync(self):
         """
         強制的にマスターデータをCSVから読み込み、データベースを更新する。
+        戻り値は同期結果（追加・更新・削除・変更なしの件数と所要秒数）。
         """
         try:
-            self._reload_master_tables()
+            return self._reload_master_tables()
         except Exception:
             self.logger.exception("マスターデータ同期中に問題が発生しました")
             raise
         finally:
             clear_master_dataframe_cache()
+            clear_statement_layout_cache()
+            clear_mapping_suggester_cache()
+            # catalog と SoA 対象索引は MasterDataService を import しているため遅延 import する
+            from app.domain.master.catalog import clear_catalog_cache
+            from app.domain.soa.targets import clear_soa_target_index_cache
+
+            clear_catalog_cache()
+            clear_soa_target_index_cache()
+            clear_master_version_cache()
+            if has_request_context():
+                g.pop('_master_snapshot', None)
             self._account_metadata_cache = {}
 
-    def _reload_master_tables(self) -> None:
+    def _reload_master_tables(self) -> dict[str, Any]:
         clear_master_dataframe_cache()
         clear_master_df_cache()
         db.session.rollback()
+        started = time.perf_counter()
         with db.session.begin():
-            db.session.query(AccountTitleMaster).delete()
             db.session.query(MasterVersion).delete()
 
+            desired: list[dict[str, Any]] = []
             for master_type, file_path in self.master_files.items():
                 if not os.path.exists(file_path):
                     self.logger.warning("マスターファイルが見つかりません: %s", file_path)
@@ -82,24 +101,66 @@ class MasterDataService:
                 df = load_master_dataframe(file_path, index_column=None).copy()
                 df.dropna(how='all', inplace=True)
                 df.dropna(subset=['No.', '勘定科目名'], inplace=True)
+                desired.extend(_master_rows(df, master_type))
 
-                for _, row in df.iterrows():
-                    master_entry = AccountTitleMaster(
-                        number=int(row['No.']),
-                        name=row['勘定科目名'],
-                        statement_name=row.get('決算書名'),
-                        major_category=row.get('大分類'),
-                        middle_category=row.get('中分類'),
-                        minor_category=row.get('小分類'),
-                        breakdown_document=row.get('内訳書'),
-                        master_type=master_type,
-                    )
-                    db.session.add(master_entry)
+            stats = self._sync_master_rows(desired)
 
             new_hash = self._get_current_files_hash()
             new_version = MasterVersion(version_hash=new_hash)
             db.session.add(new_version)
 
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        self.logger.info(
+            "マスターデータ同期: 追加%d件 / 更新%d件 / 削除%d件 / 変更なし%d件（%.3f秒）",
+            stats['inserted'], stats['updated'], stats['deleted'], stats['unchanged'], stats['seconds'],
+        )
+        return stats
+
+    @staticmethod
+    def _sync_master_rows(desired: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        既存の勘定科目マスターと (master_type, number) で突き合わせ、差分だけを一括で反映する。
+        変更のない行と更新した行は ID を保つ（UserAccountMapping.master_account_id の参照先が変わらない）。
+        """
+        table = AccountTitleMaster.__table__
+        existing = db.session.execute(
+            sa.select(table.c.id, table.c.master_type, table.c.number, *(table.c[f] for f in MASTER_SYNC_FIELDS))
+        ).all()
+        current: dict[tuple[str, int], Any] = {}
+        stale_ids: list[int] = []
+        for row in existing:
+            key = (row.master_type, row.number)
+            if key in current:
+                stale_ids.append(row.id)
+            else:
+                current[key] = row
+
+        inserts: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        unchanged = 0
+        for record in desired:
+            row = current.pop((record['master_type'], record['number']), None)
+            if row is None:
+                inserts.append(record)
+            elif any(getattr(row, f) != record[f] for f in MASTER_SYNC_FIELDS):
+                updates.append({'row_id': row.id, **{f'new_{f}': record[f] for f in MASTER_SYNC_FIELDS}})
+            else:
+                unchanged += 1
+        stale_ids.extend(row.id for row in current.values())
+
+        if stale_ids:
+            db.session.execute(sa.delete(table).where(table.c.id.in_(stale_ids)))
+        if updates:
+            statement = (
+                sa.update(table)
+                .where(table.c.id == sa.bindparam('row_id'))
+                .values({f: sa.bindparam(f'new_{f}') for f in MASTER_SYNC_FIELDS})
+            )
+            db.session.connection().execute(statement, updates)
+        if inserts:
+            db.session.execute(sa.insert(table), inserts)
+        return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(stale_ids), 'unchanged': unchanged}
+
     def get_account_metadata_index(self) -> dict[int, dict[str, Any]]:
         if self._account_metadata_cache:
             return self._account_metadata_cache
@@ -132,18 +193,38 @@ class MasterDataService:
             return self._calculate_and_store_current_hash()
 
 
+    def get_version_hash(self) -> str:
+        """
+        データベースに同期済みのマスターのバージョン（未同期なら空文字）。キャッシュのキーに使う。
+        プロセス内で MASTER_VERSION_TTL_SECONDS 秒まで使い回し、force_sync で破棄する。
+        """
+        try:
+            cfg = current_app.config
+            if bool(cfg.get('TESTING', False)):
+                return self._get_last_db_hash() or ''
+            ttl = float(cfg.get('MASTER_VERSION_TTL_SECONDS', 30))
+        except Exception:
+            ttl = 0.0
+        return _cached_version_hash(lambda: self._get_last_db_hash() or '', ttl)
+
     def _get_last_db_hash(self):
         """データベースに保存されている最新のバージョンハッシュを返す。"""
         last_version = MasterVersion.query.order_by(MasterVersion.id.desc()).first()
         return last_version.version_hash if last_version else None
 
+    def snapshot(self) -> MasterSnapshot:
+        return MasterSnapshot(self)
 
-    def get_bs_master_df(self):
-        """貸借対照表マスターをDataFrameとして取得する。"""
+    def _resolve_version(self, version_hash: str | Callable[[], str] | None) -> str:
+        if version_hash is None:
+            return self.get_version_hash()
+        return version_hash() if callable(version_hash) else version_hash
+
+    def _get_master_df(self, master_type: str, version_hash: str | Callable[[], str] | None = None):
         try:
             from flask import current_app as _app
             if bool(_app.config.get('TESTING', False)):
-                query = AccountTitleMaster.query.filter_by(master_type='BS').all()
+                query = AccountTitleMaster.query.filter_by(master_type=master_type).all()
                 df = pd.DataFrame([m.__dict__ for m in query])
                 df.drop(columns=['_sa_instance_state'], inplace=True, errors='ignore')
                 if 'name' in df.columns:
@@ -151,24 +232,99 @@ class MasterDataService:
                 return df
         except Exception:
             pass
-        version_hash = self._get_last_db_hash() or ''
-        return _load_master_df_cached('BS', version_hash)
+        return _load_master_df_cached(master_type, self._resolve_version(version_hash))
+
+    def get_bs_master_df(self):
+        """貸借対照表マスターをDataFrameとして取得する。"""
+        return self._get_master_df('BS')
 
     def get_pl_master_df(self):
         """損益計算書マスターをDataFrameとして取得する。"""
+        return self._get_master_df('PL')
+
+    def get_statement_layout(self) -> StatementLayout:
+        """財務諸表レイアウト（BS/PLのコード表・並び順・科目ID）を取得する。マスターのバージョンごとに共有される。"""
+        return self._get_statement_layout()
+
+    def _get_statement_layout(self, version_hash: str | Callable[[], str] | None = None) -> StatementLayout:
         try:
             from flask import current_app as _app
             if bool(_app.config.get('TESTING', False)):
-                query = AccountTitleMaster.query.filter_by(master_type='PL').all()
-                df = pd.DataFrame([m.__dict__ for m in query])
-                df.drop(columns=['_sa_instance_state'], inplace=True, errors='ignore')
-                if 'name' in df.columns:
-                    df.set_index('name', inplace=True)
-                return df
+                return StatementLayout.build(self.get_bs_master_df(), self.get_pl_master_df())
         except Exception:
             pass
-        version_hash = self._get_last_db_hash() or ''
-        return _load_master_df_cached('PL', version_hash)
+        return _load_statement_layout_cached(self._resolve_version(version_hash))
+
+
+class MasterSnapshot:
+    """
+    1リクエスト分のマスター参照。バージョンを一度だけ確定し、DataFrame とレイアウトを使い回す。
+    MasterDataService の読み取り系メソッドと同じ名前で呼べるので、master_service 引数にそのまま渡せる。
+    """
+
+    def __init__(self, service: MasterDataService | None = None):
+        self._service = service or MasterDataService()
+        self._version_hash: str | None = None
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._layout: StatementLayout | None = None
+
+    def get_version_hash(self) -> str:
+        # 実際に必要になるまで照会しない（テスト時のマスター読込はバージョンを使わない）
+        if self._version_hash is None:
+            self._version_hash = self._service.get_version_hash()
+        return self._version_hash
+
+    def get_bs_master_df(self):
+        if 'BS' not in self._frames:
+            self._frames['BS'] = self._service._get_master_df('BS', self.get_version_hash)
+        return self._frames['BS']
+
+    def get_pl_master_df(self):
+        if 'PL' not in self._frames:
+            self._frames['PL'] = self._service._get_master_df('PL', self.get_version_hash)
+        return self._frames['PL']
+
+    def get_statement_layout(self) -> StatementLayout:
+        if self._layout is None:
+            self._layout = self._service._get_statement_layout(self.get_version_hash)
+        return self._layout
+
+
+def get_master_snapshot() -> MasterSnapshot:
+    """リクエスト中は g に保持したスナップショットを返す（リクエスト外では毎回新しく作る）。"""
+    if not has_request_context():
+        return MasterSnapshot()
+    snapshot = g.get('_master_snapshot')
+    if snapshot is None:
+        snapshot = MasterSnapshot()
+        g._master_snapshot = snapshot
+    return snapshot
+
+
+_version_lock = threading.Lock()
+_version_token: tuple[str, float] | None = None
+
+
+def _cached_version_hash(loader, ttl: float) -> str:
+    """loader() の結果を ttl 秒まで使い回す（ttl <= 0 なら毎回 loader を呼ぶ）。"""
+    global _version_token
+    now = time.monotonic()
+    with _version_lock:
+        token = _version_token
+    if token is not None and ttl > 0 and now - token[1] < ttl:
+        return token[0]
+    value = loader()
+    with _version_lock:
+        _version_token = (value, now)
+    return value
+
+
+def clear_master_version_cache():
+    """Invalidate the in-process cache for the master version token."""
+    global _version_token
+    with _version_lock:
+        _version_token = None
+
 
 @lru_cache(maxsize=8)
 def _load_master_df_cached(master_type: str, version_hash: str):
@@ -182,6 +338,24 @@ def _load_master_df_cached(master_type: str, version_hash: str):
         df.set_index('name', inplace=True)
     return df
 
+@lru_cache(maxsize=8)
+def _load_statement_layout_cached(version_hash: str) -> StatementLayout:
+    """バージョンごとの財務諸表レイアウト（プロセス内LRUキャッシュ、読み取り専用でスレッド間共有）。"""
+    return StatementLayout.build(
+        _load_master_df_cached('BS', version_hash),
+        _load_master_df_cached('PL', version_hash),
+        version_hash,
+    )
+
+
+def clear_statement_layout_cache():
+    """Invalidate the in-process cache for statement layouts."""
+    try:
+        _load_statement_layout_cached.cache_clear()
+    except Exception:
+        pass
+
+
 def clear_master_df_cache():
     """Invalidate the in-process cache for master DataFrames."""
     try:
@@ -190,6 +364,29 @@ def clear_master_df_cache():
         pass
 
 
+MASTER_SYNC_FIELDS = ('name', 'statement_name', 'major_category', 'middle_category', 'minor_category', 'breakdown_document')
+_MASTER_CSV_COLUMNS = {
+    'name': '勘定科目名',
+    'statement_name': '決算書名',
+    'major_category': '大分類',
+    'middle_category': '中分類',
+    'minor_category': '小分類',
+    'breakdown_document': '内訳書',
+}
+
+
+def _master_rows(df: pd.DataFrame, master_type: str) -> list[dict[str, Any]]:
+    """マスターCSVの DataFrame を AccountTitleMaster の行（dict）に一括変換する。欠損は None。"""
+    frame = pd.DataFrame(
+        {field: df[column] if column in df.columns else None for field, column in _MASTER_CSV_COLUMNS.items()},
+        index=df.index,
+    ).astype(object)
+    frame = frame.where(frame.notna(), None)
+    frame.insert(0, 'number', df['No.'].astype('int64'))
+    frame['master_type'] = master_type
+    return frame.to_dict('records')
+
+
 def calculate_and_save_hash(base_dir, version_file_path=None, master_files=None):
     """現在のマスターファイルのハッシュを計算し、指定パスに保存する。"""
     master_files = master_files or [
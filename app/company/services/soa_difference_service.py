@@ -14,6 +14,7 @@ class SoADifferenceBatch:
         self.company_id = company_id
         self.accounting_data = accounting_data
         self._cache: dict[str, SoAPageEvaluation] = {}
+        self._prefetched = False
 
     def bind_to_request(self) -> None:
         if has_request_context():
@@ -21,9 +22,25 @@ class SoADifferenceBatch:
             if cached is None or getattr(cached, 'company_id', None) != self.company_id:
                 g._soa_difference_batch = self
 
+    def prefetch(self) -> None:
+        """全ページをまとめて評価する（内訳合計の SQL は1回、会計データとマスターの解決も1回）。"""
+        if self._prefetched:
+            return
+        self._prefetched = True
+        evaluations = SoASummaryService.evaluate_pages(
+            self.company_id,
+            accounting_data=self.accounting_data,
+        )
+        for page, evaluation in evaluations.items():
+            self._cache.setdefault(page, evaluation)
+
     def get(self, page: str) -> SoAPageEvaluation:
         if page in self._cache:
             return self._cache[page]
+        if not self._prefetched:
+            self.prefetch()
+            if page in self._cache:
+                return self._cache[page]
         evaluation = SoASummaryService.evaluate_page(
             self.company_id,
             page,
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any, TypedDict
 
-from app.company.services.master_data_service import MasterDataService
+from app.company.services.accounting_balance_tables import (
+    StoredAccountingTotals,
+    load_stored_totals,
+    use_balance_tables,
+)
+from app.company.services.accounting_data_lookup import get_latest_accounting_data
+from app.company.services.accounting_payload import AccountingPayload, get_accounting_payload
+from app.company.services.master_data_service import MasterDataService, MasterSnapshot, get_master_snapshot
 from app.domain.soa.evaluation import SoAPageEvaluation
+from app.domain.soa.targets import UNKNOWN_TARGETS, PageTargets, get_soa_target_index
 from app.extensions import db
 from app.services.soa_registry import (
-    PL_PAGE_ACCOUNTS,
     STATEMENT_PAGES_CONFIG,  # ページ→モデル解決用
     SUMMARY_PAGE_MAP,
     get_total_field,
@@ -25,127 +33,46 @@ class SoASummaryService:
 
     # mappings are imported from app.services.soa_registry
 
-    @staticmethod
-    def _find_and_sum_by_names(data_dict: dict[str, Any], names: list[str]) -> int:
-        total_local = 0
-        for _, value in data_dict.items():
-            if isinstance(value, dict):
-                items = value.get('items')
-                if isinstance(items, list):
-                    for it in items:
-                        if isinstance(it, dict) and it.get('name') in names:
-                            total_local += it.get('amount', 0) or 0
-                else:
-                    total_local += SoASummaryService._find_and_sum_by_names(value, names)
-        return total_local
-
     @classmethod
-    def resolve_target_accounts(cls, page: str, master_service: MasterDataService) -> dict[str, Any]:
-        if page not in SUMMARY_PAGE_MAP:
-            return {'type': 'UNKNOWN', 'target_ids': [], 'targets': []}
-
-        master_type, breakdown_name = SUMMARY_PAGE_MAP[page]
-        if page == 'borrowings':
-            bs_df = master_service.get_bs_master_df()
-            bs_ids, bs_names = cls._extract_targets(bs_df, breakdown=breakdown_name)
-
-            pl_df = master_service.get_pl_master_df()
-            configured_names = PL_PAGE_ACCOUNTS.get(page, ['支払利息'])
-            pl_ids, pl_names = cls._extract_targets(pl_df, names=configured_names or None)
-            if not pl_ids and breakdown_name:
-                alt_ids, alt_names = cls._extract_targets(pl_df, breakdown=breakdown_name)
-                if alt_ids:
-                    pl_ids, pl_names = alt_ids, alt_names
-
-            return {
-                'type': 'BORROWINGS',
-                'bs_target_ids': bs_ids,
-                'pl_target_ids': pl_ids,
-                'bs_targets': bs_names,
-                'pl_targets': pl_names or configured_names,
-            }
-
-        if master_type == 'BS':
-            df = master_service.get_bs_master_df()
-            target_ids, target_names = cls._extract_targets(df, breakdown=breakdown_name)
-            return {'type': 'BS', 'target_ids': target_ids, 'targets': target_names}
-
-        df = master_service.get_pl_master_df()
-        configured_names = PL_PAGE_ACCOUNTS.get(page, [])
-        target_ids, target_names = cls._extract_targets(df, names=configured_names or None)
-        if not target_ids and breakdown_name:
-            target_ids, target_names = cls._extract_targets(df, breakdown=breakdown_name)
-        return {'type': 'PL', 'target_ids': target_ids, 'targets': target_names or configured_names}
-
+    def resolve_target_accounts(cls, page: str, master_service: MasterDataService | MasterSnapshot) -> dict[str, Any]:
+        return get_soa_target_index(master_service).get(page).as_dict()
 
     @classmethod
     def _load_accounting_data(cls, company_id: int, accounting_data):
         if accounting_data is not None:
             return accounting_data
-        from app.company.models import AccountingData  # local import to avoid cycles
-
-        return (
-            AccountingData.query
-            .filter_by(company_id=company_id)
-            .order_by(AccountingData.created_at.desc())
-            .first()
-        )
-
-    @classmethod
-    def _extract_payloads(cls, accounting_data) -> tuple[dict[str, Any], dict[int, int]]:
-        soa_breakdowns: dict[str, Any] = {}
-        account_balances: dict[int, int] = {}
-        try:
-            data_payload = accounting_data.data or {}
-            if isinstance(data_payload, dict):
-                candidate = data_payload.get('soa_breakdowns')
-                if isinstance(candidate, dict):
-                    soa_breakdowns = candidate
-            account_balances = cls._extract_account_balances(accounting_data)
-        except Exception:
-            soa_breakdowns = {}
-            account_balances = {}
-        return soa_breakdowns, account_balances
+        return get_latest_accounting_data(company_id)
 
     @staticmethod
-    def _get_data_section(accounting_data, section: str) -> dict[str, Any]:
-        try:
-            payload = accounting_data.data or {}
-            if isinstance(payload, dict):
-                candidate = payload.get(section)
-                if isinstance(candidate, dict):
-                    return candidate
-        except Exception:
-            pass
-        return {}
+    def _accounting_totals(accounting, targets: Iterable[PageTargets]) -> AccountingPayload | StoredAccountingTotals:
+        """正規化テーブルに書き込み済みなら SQL 集計、そうでなければ JSON を解釈したペイロード。"""
+        if use_balance_tables() and getattr(accounting, 'normalized_at', None) is not None:
+            targets = list(targets)
+            id_sets = [t.target_ids for t in targets] + [t.pl_target_ids for t in targets]
+            return load_stored_totals(accounting, id_sets)
+        return get_accounting_payload(accounting)
 
     @classmethod
     def _compute_borrowings_source(
         cls,
         page: str,
-        accounting_data,
-        account_balances: dict[int, int],
-        soa_breakdowns: dict[str, Any],
-        targets_info: dict[str, Any],
+        payload: AccountingPayload | StoredAccountingTotals,
+        targets: PageTargets,
     ) -> SourceTotalResult:
-        bs_ids = targets_info.get('bs_target_ids', [])
-        pl_ids = targets_info.get('pl_target_ids', [])
-        if account_balances and (bs_ids or pl_ids):
-            bs_total = cls._sum_account_balances(account_balances, bs_ids)
-            pl_interest_total = cls._sum_account_balances(account_balances, pl_ids)
+        if payload.balances and (targets.target_ids or targets.pl_target_ids):
+            bs_total = payload.balances.sum_abs(targets.id_array)
+            pl_interest_total = payload.balances.sum_abs(targets.pl_id_array)
             return {
                 'bs_total': bs_total,
                 'pl_interest_total': pl_interest_total,
                 'source_total': bs_total + pl_interest_total,
             }
 
-        bs_source = cls._get_data_section(accounting_data, 'balance_sheet')
-        pl_source = cls._get_data_section(accounting_data, 'profit_loss_statement')
-        bs_total = cls._find_and_sum_by_names(bs_source, targets_info.get('bs_targets', []))
+        bs_total = payload.sum_bs(targets.targets)
         breakdown_name = SUMMARY_PAGE_MAP.get(page, (None, None))[1]
-        if breakdown_name and soa_breakdowns:
-            bs_total = soa_breakdowns.get(breakdown_name, bs_total)
-        pl_interest_total = cls._find_and_sum_by_names(pl_source, targets_info.get('pl_targets', []))
+        if breakdown_name and payload.soa_breakdowns:
+            bs_total = payload.soa_breakdowns.get(breakdown_name, bs_total)
+        pl_interest_total = payload.sum_pl(targets.pl_targets)
         return {
             'bs_total': bs_total,
             'pl_interest_total': pl_interest_total,
@@ -156,36 +83,25 @@ class SoASummaryService:
     def _compute_balance_sheet_source(
         cls,
         page: str,
-        accounting_data,
-        account_balances: dict[int, int],
-        soa_breakdowns: dict[str, Any],
-        targets_info: dict[str, Any],
+        payload: AccountingPayload | StoredAccountingTotals,
+        targets: PageTargets,
     ) -> SourceTotalResult:
-        target_ids = targets_info.get('target_ids', [])
-        if account_balances and target_ids:
-            total = cls._sum_account_balances(account_balances, target_ids)
-            return {'source_total': total}
+        if payload.balances and targets.target_ids:
+            return {'source_total': payload.balances.sum_abs(targets.id_array)}
         breakdown_name = SUMMARY_PAGE_MAP.get(page, (None, None))[1]
-        if breakdown_name and breakdown_name in soa_breakdowns:
-            return {'source_total': soa_breakdowns[breakdown_name]}
-        source = cls._get_data_section(accounting_data, 'balance_sheet')
-        total = cls._find_and_sum_by_names(source, targets_info.get('targets', []))
-        return {'source_total': total}
+        if breakdown_name and breakdown_name in payload.soa_breakdowns:
+            return {'source_total': payload.soa_breakdowns[breakdown_name]}
+        return {'source_total': payload.sum_bs(targets.targets)}
 
     @classmethod
     def _compute_profit_loss_source(
         cls,
-        accounting_data,
-        account_balances: dict[int, int],
-        targets_info: dict[str, Any],
+        payload: AccountingPayload | StoredAccountingTotals,
+        targets: PageTargets,
     ) -> SourceTotalResult:
-        target_ids = targets_info.get('target_ids', [])
-        if account_balances and target_ids:
-            total = cls._sum_account_balances(account_balances, target_ids)
-            return {'source_total': total}
-        source = cls._get_data_section(accounting_data, 'profit_loss_statement')
-        total = cls._find_and_sum_by_names(source, targets_info.get('targets', []))
-        return {'source_total': total}
+        if payload.balances and targets.target_ids:
+            return {'source_total': payload.balances.sum_abs(targets.id_array)}
+        return {'source_total': payload.sum_pl(targets.targets)}
 
     @classmethod
     def compute_source_total(
@@ -193,25 +109,34 @@ class SoASummaryService:
         company_id: int,
         page: str,
         accounting_data=None,
-        master_service: MasterDataService | None = None,
+        master_service: MasterDataService | MasterSnapshot | None = None,
     ) -> SourceTotalResult:
         accounting = cls._load_accounting_data(company_id, accounting_data)
+        if accounting is None:
+            return cls._source_total_for(page, None, UNKNOWN_TARGETS)
+        index = get_soa_target_index(master_service or get_master_snapshot())
+        return cls._source_total_for(page, accounting, index.get(page))
+
+    @classmethod
+    def _source_total_for(
+        cls,
+        page: str,
+        accounting,
+        targets: PageTargets,
+        payload: AccountingPayload | StoredAccountingTotals | None = None,
+    ) -> SourceTotalResult:
         if accounting is None:
             if page == 'borrowings':
                 return {'bs_total': 0, 'pl_interest_total': 0, 'source_total': 0}
             return {'source_total': 0}
 
-        master_service = master_service or MasterDataService()
-        soa_breakdowns, account_balances = cls._extract_payloads(accounting)
-        targets_info = cls.resolve_target_accounts(page, master_service)
-        target_type = targets_info.get('type')
-
-        if target_type == 'BORROWINGS':
-            return cls._compute_borrowings_source(page, accounting, account_balances, soa_breakdowns, targets_info)
-        if target_type == 'BS':
-            return cls._compute_balance_sheet_source(page, accounting, account_balances, soa_breakdowns, targets_info)
-        if target_type == 'PL':
-            return cls._compute_profit_loss_source(accounting, account_balances, targets_info)
+        payload = payload or cls._accounting_totals(accounting, [targets])
+        if targets.type == 'BORROWINGS':
+            return cls._compute_borrowings_source(page, payload, targets)
+        if targets.type == 'BS':
+            return cls._compute_balance_sheet_source(page, payload, targets)
+        if targets.type == 'PL':
+            return cls._compute_profit_loss_source(payload, targets)
         return {'source_total': 0}
 
     @staticmethod
@@ -244,17 +169,59 @@ class SoASummaryService:
         return db.session.query(db.func.sum(total_field)) \
             .filter_by(company_id=company_id).scalar() or 0
 
+    @staticmethod
+    def _breakdown_fields(page: str) -> tuple[Any, tuple[str, ...]]:
+        """ページの内訳合計に使うモデルと合計列（借入金は期末残高＋支払利息）。"""
+        model = (STATEMENT_PAGES_CONFIG.get(page) or {}).get('model')
+        if model is None:
+            return None, ()
+        if page == 'borrowings':
+            return model, ('balance_at_eoy', 'paid_interest')
+        cfg = STATEMENT_PAGES_CONFIG.get(page, {})
+        field_name = cfg.get('total_field') or get_total_field(page)
+        if not hasattr(model, field_name):
+            return model, ()
+        return model, (field_name,)
+
+    @classmethod
+    def compute_breakdown_totals(cls, company_id: int, pages: Iterable[str] | None = None) -> dict[str, int]:
+        """
+        複数ページの内訳合計をまとめて返す（compute_breakdown_total と同じ値）。
+        (モデル, 合計列) ごとの SUM を UNION ALL で1文にまとめるので、ページ数によらず SQL は1回。
+        """
+        page_list = list(STATEMENT_PAGES_CONFIG) if pages is None else list(pages)
+        slots: dict[tuple[Any, str], int] = {}
+        page_slots: dict[str, list[int]] = {}
+        for page in page_list:
+            model, fields = cls._breakdown_fields(page)
+            page_slots[page] = [slots.setdefault((model, name), len(slots)) for name in fields]
+
+        sums: dict[int, int] = {}
+        if slots:
+            selects = [
+                db.select(
+                    db.literal(slot).label('slot'),
+                    db.func.sum(getattr(model, name)).label('total'),
+                ).where(model.company_id == company_id)
+                for (model, name), slot in slots.items()
+            ]
+            statement = selects[0] if len(selects) == 1 else db.union_all(*selects)
+            for slot, total in db.session.execute(statement):
+                sums[int(slot)] = total or 0
+        return {page: sum(sums.get(slot, 0) for slot in indexes) for page, indexes in page_slots.items()}
+
     @classmethod
-    def compute_difference(cls, company_id: int, page: str, model, total_field_name: str | None, accounting_data=None, master_service: MasterDataService | None = None, source_totals: SourceTotalResult | None = None) -> DifferenceResult:
-        master_service = master_service or MasterDataService()
+    def compute_difference(cls, company_id: int, page: str, model, total_field_name: str | None, accounting_data=None, master_service: MasterDataService | MasterSnapshot | None = None, source_totals: SourceTotalResult | None = None, breakdown_total: int | None = None) -> DifferenceResult:
+        master_service = master_service or get_master_snapshot()
         source = source_totals or cls.compute_source_total(company_id, page, accounting_data=accounting_data, master_service=master_service)
-        effective_model = model
-        effective_field = total_field_name
-        if effective_model is None or effective_field is None:
-            cfg = STATEMENT_PAGES_CONFIG.get(page, {})
-            effective_model = effective_model or cfg.get('model')
-            effective_field = effective_field or cfg.get('total_field', 'amount')
-        breakdown_total = cls.compute_breakdown_total(company_id, page, effective_model, effective_field)
+        if breakdown_total is None:
+            effective_model = model
+            effective_field = total_field_name
+            if effective_model is None or effective_field is None:
+                cfg = STATEMENT_PAGES_CONFIG.get(page, {})
+                effective_model = effective_model or cfg.get('model')
+                effective_field = effective_field or cfg.get('total_field', 'amount')
+            breakdown_total = cls.compute_breakdown_total(company_id, page, effective_model, effective_field)
         if page == 'borrowings':
             bs_total = source.get('bs_total', 0)
             pl_interest_total = source.get('pl_interest_total', 0)
@@ -286,7 +253,7 @@ class SoASummaryService:
         return source.get('source_total', 0) == 0
 
     @classmethod
-    def compute_skip_total(cls, company_id: int, page: str, accounting_data=None, master_service: MasterDataService | None = None, source_totals: SourceTotalResult | None = None) -> int:
+    def compute_skip_total(cls, company_id: int, page: str, accounting_data=None, master_service: MasterDataService | MasterSnapshot | None = None, source_totals: SourceTotalResult | None = None) -> int:
         """Return the numeric source total used to determine skip."""
         source = source_totals or cls.compute_source_total(company_id, page, accounting_data=accounting_data, master_service=master_service)
         if page == 'borrowings':
@@ -296,26 +263,68 @@ class SoASummaryService:
     @classmethod
     def evaluate_page(cls, company_id: int, page: str, accounting_data=None) -> SoAPageEvaluation:
         """差分・スキップ判定・完了状態をまとめた結果を返す。"""
-        master_service = MasterDataService()
+        # リクエスト内の全ページで同じマスタースナップショットを使う（バージョン照会はリクエストごとに1回まで）
+        master_service = get_master_snapshot()
         source_totals = cls.compute_source_total(
             company_id,
             page,
             accounting_data=accounting_data,
             master_service=master_service,
         )
+        return cls._build_evaluation(company_id, page, master_service, source_totals)
+
+    @classmethod
+    def evaluate_pages(
+        cls,
+        company_id: int,
+        pages: Iterable[str] | None = None,
+        accounting_data=None,
+    ) -> dict[str, SoAPageEvaluation]:
+        """
+        全ページ（または指定ページ）を一括評価する。evaluate_page と同じ結果を返すが、
+        会計データの読み込み・マスタースナップショット・内訳合計の集計はそれぞれ1回で済ませる。
+        """
+        page_list = list(STATEMENT_PAGES_CONFIG) if pages is None else list(pages)
+        master_service = get_master_snapshot()
+        accounting = cls._load_accounting_data(company_id, accounting_data)
+        index = get_soa_target_index(master_service)
+        payload = (
+            cls._accounting_totals(accounting, [index.get(page) for page in page_list])
+            if accounting is not None else None
+        )
+        breakdown_totals = cls.compute_breakdown_totals(company_id, page_list)
+        return {
+            page: cls._build_evaluation(
+                company_id,
+                page,
+                master_service,
+                cls._source_total_for(page, accounting, index.get(page), payload),
+                breakdown_total=breakdown_totals[page],
+            )
+            for page in page_list
+        }
+
+    @classmethod
+    def _build_evaluation(
+        cls,
+        company_id: int,
+        page: str,
+        master_service: MasterDataService | MasterSnapshot,
+        source_totals: SourceTotalResult,
+        breakdown_total: int | None = None,
+    ) -> SoAPageEvaluation:
         difference = cls.compute_difference(
             company_id,
             page,
             None,
             None,
-            accounting_data=accounting_data,
             master_service=master_service,
             source_totals=source_totals,
+            breakdown_total=breakdown_total,
         )
         skip_total = cls.compute_skip_total(
             company_id,
             page,
-            accounting_data=accounting_data,
             master_service=master_service,
             source_totals=source_totals,
         )
@@ -328,66 +337,6 @@ class SoASummaryService:
             should_skip=should_skip,
         )
 
-    @staticmethod
-    def _extract_targets(df, *, breakdown: str | None = None, names: list[str] | None = None) -> tuple[list[int], list[str]]:
-        if df is None or not hasattr(df, 'index'):
-            return [], []
-        subset = None
-        try:
-            if breakdown and 'breakdown_document' in getattr(df, 'columns', []):
-                subset = df[df['breakdown_document'] == breakdown]
-            elif names:
-                subset = df[df.index.isin(names)]
-            else:
-                subset = df.iloc[0:0]
-        except Exception:
-            subset = df.iloc[0:0]
-
-        target_names: list[str] = []
-        ids: list[int] = []
-        try:
-            target_names = [str(name) for name in subset.index.tolist()]
-        except Exception:
-            target_names = []
-        if hasattr(subset, 'columns') and 'id' in getattr(subset, 'columns', []):
-            for raw_id in subset['id'].tolist():
-                try:
-                    ids.append(int(raw_id))
-                except (TypeError, ValueError):
-                    continue
-        return ids, target_names
-
-    @staticmethod
-    def _extract_account_balances(accounting_data) -> dict[int, int]:
-        try:
-            payload = getattr(accounting_data, 'data', {}) or {}
-            raw_balances = payload.get('account_balances')
-        except Exception:
-            raw_balances = None
-        if not isinstance(raw_balances, dict):
-            return {}
-        balances: dict[int, int] = {}
-        for key, value in raw_balances.items():
-            try:
-                account_id = int(key)
-                balances[account_id] = int(value)
-            except (TypeError, ValueError):
-                continue
-        return balances
-
-    @staticmethod
-    def _sum_account_balances(account_balances: dict[int, int], account_ids: list[int]) -> int:
-        total = 0
-        for account_id in account_ids:
-            value = account_balances.get(account_id)
-            if value is None:
-                continue
-            try:
-                total += abs(int(value))
-            except (TypeError, ValueError):
-                continue
-        return total
-
 # TypedDicts to clarify returned shapes (non-functional)
 class SourceTotalResult(TypedDict, total=False):
     source_total: int
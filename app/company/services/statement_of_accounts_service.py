@@ -5,6 +5,7 @@ from flask import current_app
 
 from app.extensions import db
 from app.services.db_utils import session_scope
+from app.services.pdf_output_cache import invalidate_statement_pdfs
 from app.services.soa_registry import STATEMENT_PAGES_CONFIG, get_total_field
 
 from .protocols import StatementOfAccountsServiceProtocol
@@ -38,6 +39,12 @@ class StatementOfAccountsService(StatementOfAccountsServiceProtocol):
         config = STATEMENT_PAGES_CONFIG.get(data_type, {})
         return config.get('model'), config
 
+    def _invalidate_pdf_cache(self, data_type) -> None:
+        try:
+            invalidate_statement_pdfs(self.company_id, data_type)
+        except Exception as exc:
+            current_app.logger.warning('PDF cache invalidation failed for %s: %s', data_type, exc)
+
     def _apply_model_defaults(self, data_type, item) -> None:
         default_name = DEFAULT_ACCOUNT_NAME_BY_PAGE.get(data_type)
         if not default_name or not hasattr(item, 'account_name'):
@@ -85,6 +92,7 @@ class StatementOfAccountsService(StatementOfAccountsServiceProtocol):
         try:
             with session_scope() as session:
                 session.add(item)
+            self._invalidate_pdf_cache(data_type)
             return True, item, None
         except Exception as exc:
             return False, None, f"保存中にエラーが発生しました: {exc}"
@@ -103,6 +111,7 @@ class StatementOfAccountsService(StatementOfAccountsServiceProtocol):
         try:
             with session_scope() as session:
                 session.add(item)
+            self._invalidate_pdf_cache(data_type)
             return True, item, None
         except Exception as exc:
             return False, None, f"更新中にエラーが発生しました: {exc}"
@@ -134,6 +143,7 @@ class StatementOfAccountsService(StatementOfAccountsServiceProtocol):
         try:
             with session_scope() as session:
                 session.delete(item)
+            self._invalidate_pdf_cache(data_type)
             return True, None
         except Exception as exc:
             return False, f"削除中にエラーが発生しました: {exc}"
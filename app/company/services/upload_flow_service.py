@@ -12,8 +12,18 @@ from flask import current_app
 
 from app.company.models import AccountingData
 from app.company.parser_factory import ParserFactory
+from app.company.parsers.journal_totals import JournalTotals
+from app.company.services.account_totals import AccountTotals, build_account_totals
+from app.company.services.accounting_balance_tables import (
+    delete_balance_tables,
+    use_balance_tables,
+    write_balance_tables,
+)
+from app.company.services.accounting_data_lookup import forget_accounting_data, get_latest_accounting_data
 from app.company.services.data_mapping_service import DataMappingService
 from app.company.services.financial_statement_service import FinancialStatementService
+from app.company.services.journal_column_store import JournalColumnStore, column_store_path, remove_column_store
+from app.company.services.journal_partials import JournalPartials, build_journal_partials
 
 
 from app.navigation import mark_step_as_completed
@@ -112,6 +122,8 @@ class JournalUploadStore:
                 os.remove(record.path)
             except Exception:
                 pass
+        if remove_file and record:
+            remove_column_store(record.path)
         self._session.pop(self.PATH_KEY, None)
         self._session.pop(self.NAME_KEY, None)
 
@@ -120,13 +132,122 @@ class JournalUploadStore:
         return cls(session).retrieve()
 
 
+DEFAULT_SCHEMA_VERSION = '2025.1'
+DEFAULT_ALGO_VERSION = '2025.1'
+ACCOUNT_COLUMNS = ('借方勘定科目', '貸方勘定科目')
+
+
+def _config_flag(name: str) -> bool:
+    try:
+        return bool(current_app.config.get(name, False))
+    except Exception:
+        return False
+
+
+def original_account_columns(journals_df) -> dict[str, Any]:
+    """apply_mappings_to_journals は列を書き換えるため、マッピング適用前の勘定科目列を控えておく。"""
+    return {col: journals_df[col].copy() for col in ACCOUNT_COLUMNS if col in journals_df.columns}
+
+
+def _calculate_dataframe_hash(df) -> str:
+    try:
+        csv_bytes = df.to_csv(index=False).encode('utf-8')
+    except Exception:
+        return ''
+    return hashlib.sha256(csv_bytes).hexdigest()
+
+
+def build_accounting_metadata(journals_df, *, source_hash: str | None = None) -> dict[str, str]:
+    schema_version = current_app.config.get('ACCOUNTING_DATA_SCHEMA_VERSION', DEFAULT_SCHEMA_VERSION)
+    algo_version = current_app.config.get('ACCOUNTING_DATA_ALGO_VERSION', DEFAULT_ALGO_VERSION)
+    if source_hash is None:
+        source_hash = _calculate_dataframe_hash(journals_df)
+    return {
+        'schema_version': schema_version,
+        'algo_version': algo_version,
+        'source_hash': source_hash,
+    }
+
+
+def _load_previous_partials(company_id) -> Optional[JournalPartials]:
+    try:
+        previous = get_latest_accounting_data(company_id)
+    except Exception:
+        return None
+    return JournalPartials.from_payload(getattr(previous, 'journal_partials', None)) if previous else None
+
+
+def store_journal_statements(
+    company_id: int,
+    df_journals,
+    start_date,
+    end_date,
+    *,
+    totals: Optional[JournalTotals] = None,
+    account_totals: Optional[AccountTotals] = None,
+) -> None:
+    """
+    マッピング適用済みの仕訳（ストリーミング取込では勘定科目別合計 totals）から財務諸表を作り、
+    会社の AccountingData を1行に置き換える。仕訳帳の取込と、取込途中のマッピング保存後の再計算で
+    共通に使い、どちらの経路でも同じ列（版・source_hash・残高・部分合計・元の科目名ごとの合計）を書き込む。
+    """
+    metadata = build_accounting_metadata(
+        df_journals, source_hash=totals.source_hash if totals is not None else None
+    )
+    partials = None
+    if totals is None and _config_flag('JOURNAL_INCREMENTAL_RECOMPUTE'):
+        # 前回取込分と内容が同じ月は部分合計を再利用し、変化した月だけを集計し直す
+        partials = build_journal_partials(
+            df_journals, _load_previous_partials(company_id), source_hash=metadata['source_hash']
+        )
+        if partials is not None:
+            current_app.logger.info(
+                'Journal partials: reused %d month(s), recomputed %d month(s)',
+                len(partials.reused_months), len(partials.recomputed_months),
+            )
+    fs_service = FinancialStatementService(
+        df_journals, start_date, end_date, totals=totals if totals is not None else partials
+    )
+    bs_data = fs_service.create_balance_sheet()
+    pl_data = fs_service.create_profit_loss_statement()
+    soa_breakdowns = fs_service.get_soa_breakdowns()
+
+    try:
+        with session_scope() as session:
+            if use_balance_tables():
+                delete_balance_tables(session, company_id)
+            session.query(AccountingData).filter_by(company_id=company_id).delete()
+            accounting_data = AccountingData(
+                company_id=company_id,
+                period_start=start_date,
+                period_end=end_date,
+                schema_version=metadata['schema_version'],
+                algo_version=metadata['algo_version'],
+                source_hash=metadata['source_hash'],
+                data={
+                    'balance_sheet': bs_data,
+                    'profit_loss_statement': pl_data,
+                    'soa_breakdowns': soa_breakdowns,
+                    'account_balances': fs_service.get_account_balances(),
+                },
+                journal_partials=partials.to_payload() if partials is not None else None,
+                account_totals=account_totals.to_payload() if account_totals is not None else None,
+            )
+            session.add(accounting_data)
+            if use_balance_tables():
+                write_balance_tables(session, accounting_data)
+    except Exception as exc:
+        raise UploadFlowError(str(exc)) from exc
+    forget_accounting_data(company_id)
+
+
 class UploadFlowService:
     """Encapsulates CSV/TXT upload handling for import_data views."""
 
     ALLOWED_EXTENSIONS = {'.csv', '.txt'}
     MAX_BYTES = 20 * 1024 * 1024
-    DEFAULT_SCHEMA_VERSION = '2025.1'
-    DEFAULT_ALGO_VERSION = '2025.1'
+    DEFAULT_SCHEMA_VERSION = DEFAULT_SCHEMA_VERSION
+    DEFAULT_ALGO_VERSION = DEFAULT_ALGO_VERSION
 
     def __init__(self, datatype: str, user, config: dict[str, Any], flask_session):
         self.datatype = datatype
@@ -142,9 +263,14 @@ class UploadFlowService:
         self._validate_file(file_storage)
 
         parser_method_name = self.config.get('parser_method')
-        parser = self._create_parser(file_storage)
+        streaming = self._use_streaming_journals()
+        parser = self._create_parser(file_storage, streaming=streaming)
         self._persist_raw_upload(parser, file_storage)
 
+        if streaming and getattr(parser, 'streaming', False) is True:
+            # 仕訳をDataFrameに展開せず、勘定科目別の合計だけをチャンク単位で集計する
+            return self._handle_journals(None, streaming_parser=parser)
+
         if parser_method_name:
             parser_method = getattr(parser, parser_method_name)
             parsed_data = parser_method()
@@ -184,9 +310,20 @@ class UploadFlowService:
         except Exception:
             pass
 
-    def _create_parser(self, file_storage):
+    def _use_streaming_journals(self) -> bool:
+        if self.datatype != 'journals':
+            return False
+        try:
+            return bool(current_app.config.get('JOURNAL_STREAMING_IMPORT', False))
+        except Exception:
+            return False
+
+    def _use_accounting_remap(self) -> bool:
+        return _config_flag('ACCOUNTING_DATA_REMAP')
+
+    def _create_parser(self, file_storage, *, streaming: bool = False):
         software = self.session.get('selected_software')
-        return ParserFactory.create_parser(software, file_storage)
+        return ParserFactory.create_parser(software, file_storage, streaming=streaming)
 
     def _persist_raw_upload(self, parser, file_storage) -> Optional[StoredJournalUpload]:
         try:
@@ -225,23 +362,15 @@ class UploadFlowService:
 
         return self._journal_store.store(path, original_name)
 
-    @staticmethod
-    def _calculate_dataframe_hash(df) -> str:
+    def _persist_parsed_journals(self, journals_df) -> None:
+        """マッピング後の再計算でCSVを再解析しなくて済むよう、解析済み仕訳を列指向で保存する。"""
+        record = self._journal_store.retrieve()
+        if record is None or not JournalColumnStore.supports(journals_df):
+            return
         try:
-            csv_bytes = df.to_csv(index=False).encode('utf-8')
-        except Exception:
-            return ''
-        return hashlib.sha256(csv_bytes).hexdigest()
-
-    def _build_accounting_metadata(self, journals_df) -> dict[str, str]:
-        schema_version = current_app.config.get('ACCOUNTING_DATA_SCHEMA_VERSION', self.DEFAULT_SCHEMA_VERSION)
-        algo_version = current_app.config.get('ACCOUNTING_DATA_ALGO_VERSION', self.DEFAULT_ALGO_VERSION)
-        source_hash = self._calculate_dataframe_hash(journals_df)
-        return {
-            'schema_version': schema_version,
-            'algo_version': algo_version,
-            'source_hash': source_hash,
-        }
+            JournalColumnStore.write(column_store_path(record.path), journals_df)
+        except Exception as exc:
+            current_app.logger.warning('Failed to persist parsed journals: %s', exc)
 
     @staticmethod
     def _cleanup_old_files(upload_dir: str) -> None:
@@ -250,8 +379,12 @@ class UploadFlowService:
         for name in os.listdir(upload_dir):
             file_path = os.path.join(upload_dir, name)
             try:
-                if os.path.isfile(file_path) and (now - os.path.getmtime(file_path)) > ttl:
+                if (now - os.path.getmtime(file_path)) <= ttl:
+                    continue
+                if os.path.isfile(file_path):
                     os.remove(file_path)
+                elif os.path.isdir(file_path):
+                    shutil.rmtree(file_path, ignore_errors=True)
             except Exception:
                 continue
 
@@ -268,7 +401,7 @@ class UploadFlowService:
         self.session['unmatched_accounts'] = unmatched_accounts
         return UploadResult(redirect_endpoint='company.data_mapping')
 
-    def _handle_journals(self, parsed_data) -> UploadResult:
+    def _handle_journals(self, parsed_data, *, streaming_parser=None) -> UploadResult:
         company = getattr(self.user, 'company', None)
         if not company:
             return UploadResult(
@@ -286,14 +419,26 @@ class UploadFlowService:
             )
 
         mapping_service = DataMappingService(self.user.id)
-        df_journals = mapping_service.apply_mappings_to_journals(parsed_data)
+        totals = None
+        original_accounts = None
+        if streaming_parser is not None:
+            df_journals = None
+            totals = streaming_parser.get_journal_totals(account_mapping=mapping_service.get_user_mappings())
+        else:
+            self._persist_parsed_journals(parsed_data)
+            if self._use_accounting_remap():
+                original_accounts = original_account_columns(parsed_data)
+            df_journals = mapping_service.apply_mappings_to_journals(parsed_data)
 
         try:
-            account_names = set()
-            for column in ['借方勘定科目', '貸方勘定科目']:
-                if column in df_journals.columns:
-                    values = df_journals[column].dropna().unique().tolist()
-                    account_names.update(str(v).strip() for v in values if str(v).strip())
+            if totals is not None:
+                account_names = totals.account_names()
+            else:
+                account_names = set()
+                for column in ACCOUNT_COLUMNS:
+                    if column in df_journals.columns:
+                        values = df_journals[column].dropna().unique().tolist()
+                        account_names.update(str(v).strip() for v in values if str(v).strip())
             unmatched_after = mapping_service.get_unmatched_accounts(list(account_names))
         except Exception:
             unmatched_after = []
@@ -305,32 +450,14 @@ class UploadFlowService:
                 flash_message=('未マッピングの勘定科目があります。対応後に仕訳帳を再取込してください。', 'warning'),
             )
 
-        fs_service = FinancialStatementService(df_journals, start_date, end_date)
-        bs_data = fs_service.create_balance_sheet()
-        pl_data = fs_service.create_profit_loss_statement()
-        soa_breakdowns = fs_service.get_soa_breakdowns()
-        metadata = self._build_accounting_metadata(df_journals)
-
-        try:
-            with session_scope() as session:
-                session.query(AccountingData).filter_by(company_id=company.id).delete()
-                accounting_data = AccountingData(
-                    company_id=company.id,
-                    period_start=start_date,
-                    period_end=end_date,
-                    schema_version=metadata['schema_version'],
-                    algo_version=metadata['algo_version'],
-                    source_hash=metadata['source_hash'],
-                    data={
-                        'balance_sheet': bs_data,
-                        'profit_loss_statement': pl_data,
-                        'soa_breakdowns': soa_breakdowns,
-                        'account_balances': fs_service.get_account_balances(),
-                    },
-                )
-                session.add(accounting_data)
-        except Exception as exc:
-            raise UploadFlowError(str(exc)) from exc
+        account_totals = None
+        if original_accounts is not None:
+            account_totals = build_account_totals(
+                df_journals.assign(**original_accounts), mapping_service.get_user_mappings()
+            )
+        store_journal_statements(
+            company.id, df_journals, start_date, end_date, totals=totals, account_totals=account_totals
+        )
 
         self._journal_store.clear(remove_file=True)
         mark_step_as_completed(self.datatype)
@@ -1,8 +1,10 @@
 # app/company/statement_of_accounts.py
 import os
 from datetime import datetime
+from io import BytesIO
 
 from flask import (
+    Response,
     abort,
     current_app,
     flash,
@@ -14,7 +16,7 @@ from flask import (
 )
 
 from app.company import company_bp
-from app.company.models import AccountingData
+from app.company.services.accounting_data_lookup import get_latest_accounting_data
 from app.company.services.protocols import StatementOfAccountsServiceProtocol
 from app.company.services.statement_of_accounts_flow import (
     RedirectRequired,
@@ -32,6 +34,8 @@ from app.navigation import (
 )
 from app.progress.evaluator import SoAProgressEvaluator
 from app.services.app_registry import get_default_pdf_year
+from app.services.pdf_bundle import generate_statement_bundle
+from app.services.pdf_output_cache import compute_statement_etag, pdf_output_cache
 from app.services.pdf_registry import get_statement_pdf_config
 from app.services.soa_registry import STATEMENT_PAGES_CONFIG
 
@@ -76,17 +80,8 @@ def _normalize_edit_form(form, page_key: str) -> None:
         pass
 
 
-def _latest_accounting_data(company_id: int):
-    return (
-        AccountingData.query
-        .filter_by(company_id=company_id)
-        .order_by(AccountingData.created_at.desc())
-        .first()
-    )
-
-
 def _navigation_state(company_id: int, page_key: str):
-    accounting_data = _latest_accounting_data(company_id)
+    accounting_data = get_latest_accounting_data(company_id)
     skipped = compute_skipped_steps_for_company(company_id, accounting_data=accounting_data)
     return get_navigation_state(page_key, skipped_steps=skipped)
 
@@ -156,7 +151,7 @@ def statement_of_accounts(company):
     if not config:
         abort(404)
 
-    accounting_data = AccountingData.query.filter_by(company_id=company.id).order_by(AccountingData.created_at.desc()).first()
+    accounting_data = get_latest_accounting_data(company.id)
 
     flow = StatementOfAccountsFlow(company.id, accounting_data=accounting_data)
     try:
@@ -171,40 +166,118 @@ def statement_of_accounts(company):
     context = context_data.context
     return render_template('company/statement_of_accounts.html', **context)
 
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _debug_pdf_output_path(config, company_id: int) -> str:
+    base_dir = os.path.abspath(os.path.join(current_app.root_path, '..'))
+    filled_dir = os.path.join(base_dir, 'temporary', 'filled')
+    os.makedirs(filled_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    filename = config.filename_pattern.format(company_id=company_id, timestamp=timestamp)
+    return os.path.join(filled_dir, filename)
+
+
+def _iter_pdf_chunks(buffer: BytesIO):
+    buffer.seek(0)
+    while True:
+        chunk = buffer.read(PDF_STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _stream_pdf_response(buffer: BytesIO, download_name: str, *, etag: str | None = None) -> Response:
+    response = Response(_iter_pdf_chunks(buffer), mimetype='application/pdf', direct_passthrough=True)
+    response.headers['Content-Disposition'] = f'inline; filename="{download_name}"'
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _pdf_output_cache_enabled() -> bool:
+    if not current_app.config.get('PDF_OUTPUT_CACHE_ENABLED', True):
+        return False
+    # デバッグ描画（罫線・ログ）付きの出力はキャッシュしない
+    return request.args.get('debug_y') != '1' and request.args.get('dbg_pdf') != '1'
+
+
+def _not_modified_response(etag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @company_bp.route('/statement/<string:page_key>/pdf')
 @company_required
 def statement_pdf(company, page_key):
-    """汎用的な勘定科目内訳書PDF出力エンドポイント。"""
+    """汎用的な勘定科目内訳書PDF出力エンドポイント。
+
+    既定ではメモリ上に生成してチャンク転送で返す。``PDF_DEBUG_WRITE_FILES`` が有効な場合のみ
+    temporary/filled/ にファイルを書き出してから返す。
+    明細データとテンプレートのダイジェストをETagとし、一致すれば304、キャッシュ済みなら再描画しない。
+    """
     config = get_statement_pdf_config(page_key)
     if not config:
         abort(404)
 
     year = get_default_pdf_year()
-    base_dir = os.path.abspath(os.path.join(current_app.root_path, '..'))
-    filled_dir = os.path.join(base_dir, 'temporary', 'filled')
-    os.makedirs(filled_dir, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    download_name = config.download_name_pattern.format(year=year)
+    write_files = bool(current_app.config.get('PDF_DEBUG_WRITE_FILES', False))
+
+    etag = None
+    if not write_files and _pdf_output_cache_enabled():
+        etag = compute_statement_etag(
+            company.id, page_key, year, version=current_app.config.get('PDF_TEMPLATE_VERSION'),
+        )
+        if etag and request.if_none_match.contains(etag):
+            return _not_modified_response(etag)
+        cached = pdf_output_cache.get(company.id, page_key, etag) if etag else None
+        if cached is not None:
+            return _stream_pdf_response(BytesIO(cached), download_name, etag=etag)
 
-    filename = config.filename_pattern.format(company_id=company.id, timestamp=timestamp)
-    output_path = os.path.join(filled_dir, filename)
+    output = _debug_pdf_output_path(config, company.id) if write_files else BytesIO()
 
     try:
-        generated_path = config.generator(company_id=company.id, year=year, output_path=output_path)
-        if generated_path:
-            output_path = generated_path
+        generated = config.generator(company_id=company.id, year=year, output_path=output)
+        if write_files and generated:
+            output = generated
     except Exception as exc:
         current_app.logger.exception('Failed to generate PDF for %s: %s', page_key, exc)
         flash('PDF生成中にエラーが発生しました。時間をおいて再度お試しください。', 'danger')
         return redirect(url_for('company.statement_of_accounts', page=page_key))
 
-    download_name = config.download_name_pattern.format(year=year)
+    if not write_files:
+        if etag:
+            pdf_output_cache.put(company.id, page_key, etag, output.getvalue())
+        return _stream_pdf_response(output, download_name, etag=etag)
     return send_file(
-        output_path,
+        output,
         mimetype='application/pdf',
         as_attachment=False,
         download_name=download_name,
     )
 
+@company_bp.route('/statement/all/pdf')
+@company_required
+def statement_bundle_pdf(company):
+    """別表二と登録済みの全内訳書を1つのPDF（しおり付き）にまとめて返す。
+
+    明細の取得とレイアウトはこのプロセスで行い、描画のみワーカープロセスで並列化する。
+    """
+    year = get_default_pdf_year()
+    workers = int(current_app.config.get('PDF_BUNDLE_WORKERS', 0)) or None
+    output = BytesIO()
+    try:
+        generate_statement_bundle(company.id, year, output_path=output, workers=workers)
+    except Exception as exc:
+        current_app.logger.exception('Failed to generate PDF bundle: %s', exc)
+        flash('PDF生成中にエラーが発生しました。時間をおいて再度お試しください。', 'danger')
+        return redirect(url_for('company.statement_of_accounts'))
+    return _stream_pdf_response(output, f'statements_{year}.pdf')
+
 @company_bp.route('/statement/<string:page_key>/add', methods=['GET', 'POST'])
 @company_required
 
@@ -1,24 +1,27 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Iterable
+import os
+import threading
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from flask import current_app
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.company.services.master_data_service import MasterDataService
+from app.company.services.master_data_service import MasterDataService, MasterSnapshot, get_master_snapshot
 
 
 @dataclass(frozen=True)
 class AccountCatalog:
     """勘定科目マスタと同義語辞書をカプセル化する。"""
 
-    canonical_names: set[str]
-    aliases: dict[str, str]
-    normalized_lookup: dict[str, str]
-    bs_accounts: list[str]
-    pl_accounts: list[str]
+    canonical_names: frozenset[str]
+    aliases: Mapping[str, str]
+    normalized_lookup: Mapping[str, str]
+    bs_accounts: tuple[str, ...]
+    pl_accounts: tuple[str, ...]
 
     def normalize(self, value: str) -> str:
         return _normalize(value)
@@ -28,9 +31,60 @@ class AccountCatalog:
         return self.aliases.get(key) or self.normalized_lookup.get(key)
 
 
-def load_catalog(master_service: MasterDataService | None = None) -> AccountCatalog:
-    master_service = master_service or MasterDataService()
+_catalog_lock = threading.Lock()
+_catalog_cache: dict[tuple, AccountCatalog] = {}
 
+
+def load_catalog(master_service: MasterDataService | MasterSnapshot | None = None) -> AccountCatalog:
+    """
+    勘定科目カタログを返す。マスターのバージョンと同義語辞書ファイルの更新時刻が同じ間は
+    プロセス内で共有する（構築済みのカタログは読み取り専用）。
+    """
+    master_service = master_service or get_master_snapshot()
+    key = _catalog_cache_key(master_service)
+    if key is None:
+        return _build_catalog(master_service)
+    with _catalog_lock:
+        cached = _catalog_cache.get(key)
+    if cached is not None:
+        return cached
+    catalog = _build_catalog(master_service)
+    with _catalog_lock:
+        _catalog_cache.clear()
+        _catalog_cache[key] = catalog
+    return catalog
+
+
+def clear_catalog_cache() -> None:
+    """Invalidate the in-process cache for account catalogs."""
+    with _catalog_lock:
+        _catalog_cache.clear()
+
+
+def _catalog_cache_key(master_service: MasterDataService | MasterSnapshot) -> tuple | None:
+    """(マスターのバージョン, 同義語辞書のパス, 更新時刻)。キャッシュしない場合は None。"""
+    try:
+        app = current_app._get_current_object()
+    except RuntimeError:
+        return None
+    # テスト時はマスターをDBから直接読むため共有しない（MasterDataService と同じ扱い）
+    if bool(app.config.get('TESTING', False)):
+        return None
+    try:
+        version_hash = master_service.get_version_hash()
+    except Exception:
+        return None
+    if not version_hash:
+        return None
+    alias_path = _resolve_alias_file(app.config, Path(app.root_path).parent)
+    try:
+        alias_mtime = os.stat(alias_path).st_mtime_ns if alias_path else None
+    except OSError:
+        alias_mtime = None
+    return (version_hash, str(alias_path) if alias_path else None, alias_mtime)
+
+
+def _build_catalog(master_service: MasterDataService | MasterSnapshot) -> AccountCatalog:
     try:
         bs_df = master_service.get_bs_master_df()
     except (SQLAlchemyError, Exception):
@@ -51,11 +105,11 @@ def load_catalog(master_service: MasterDataService | None = None) -> AccountCata
     normalized_lookup = {_normalize(name): name for name in canonical_names}
 
     return AccountCatalog(
-        canonical_names=canonical_names,
-        aliases=aliases,
-        normalized_lookup=normalized_lookup,
-        bs_accounts=bs_accounts,
-        pl_accounts=pl_accounts,
+        canonical_names=frozenset(canonical_names),
+        aliases=MappingProxyType(aliases),
+        normalized_lookup=MappingProxyType(normalized_lookup),
+        bs_accounts=tuple(bs_accounts),
+        pl_accounts=tuple(pl_accounts),
     )
 
 
@@ -0,0 +1,191 @@
+"""SoA ページ→対象勘定科目（マスターID・科目名）の索引。
+
+対象科目はマスターのバージョンと SUMMARY_PAGE_MAP / PL_PAGE_ACCOUNTS だけで決まるので、
+バージョンごとに一度だけ全ページ分を解決して共有する（構築後は読み取り専用）。
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
+from flask import current_app
+
+from app.company.services.master_data_service import MasterDataService, MasterSnapshot
+from app.services.soa_registry import PL_PAGE_ACCOUNTS, SUMMARY_PAGE_MAP
+
+
+def _frozen_ids(ids: tuple[int, ...]) -> np.ndarray:
+    array = np.asarray(ids, dtype=np.int64)
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True)
+class PageTargets:
+    """1ページ分の対象科目。借入金は BS（借入金）と PL（支払利息）の2組を持つ。"""
+
+    type: str
+    target_ids: tuple[int, ...] = ()
+    targets: tuple[str, ...] = ()
+    pl_target_ids: tuple[int, ...] = ()
+    pl_targets: tuple[str, ...] = ()
+    id_array: np.ndarray = field(default=None, compare=False, repr=False)  # type: ignore[assignment]
+    pl_id_array: np.ndarray = field(default=None, compare=False, repr=False)  # type: ignore[assignment]
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'id_array', _frozen_ids(self.target_ids))
+        object.__setattr__(self, 'pl_id_array', _frozen_ids(self.pl_target_ids))
+
+    def as_dict(self) -> dict[str, Any]:
+        """SoASummaryService.resolve_target_accounts の従来の戻り値の形。"""
+        if self.type == 'BORROWINGS':
+            return {
+                'type': self.type,
+                'bs_target_ids': list(self.target_ids),
+                'pl_target_ids': list(self.pl_target_ids),
+                'bs_targets': list(self.targets),
+                'pl_targets': list(self.pl_targets),
+            }
+        return {'type': self.type, 'target_ids': list(self.target_ids), 'targets': list(self.targets)}
+
+
+UNKNOWN_TARGETS = PageTargets(type='UNKNOWN')
+
+
+@dataclass(frozen=True)
+class SoATargetIndex:
+    pages: Mapping[str, PageTargets]
+
+    def get(self, page: str) -> PageTargets:
+        return self.pages.get(page, UNKNOWN_TARGETS)
+
+    @classmethod
+    def build(cls, bs_df, pl_df) -> SoATargetIndex:
+        pages: dict[str, PageTargets] = {}
+        for page, (master_type, breakdown_name) in SUMMARY_PAGE_MAP.items():
+            if page == 'borrowings':
+                bs_ids, bs_names = extract_targets(bs_df, breakdown=breakdown_name)
+                configured_names = PL_PAGE_ACCOUNTS.get(page, ['支払利息'])
+                pl_ids, pl_names = extract_targets(pl_df, names=configured_names or None)
+                if not pl_ids and breakdown_name:
+                    alt_ids, alt_names = extract_targets(pl_df, breakdown=breakdown_name)
+                    if alt_ids:
+                        pl_ids, pl_names = alt_ids, alt_names
+                pages[page] = PageTargets(
+                    type='BORROWINGS',
+                    target_ids=bs_ids,
+                    targets=bs_names,
+                    pl_target_ids=pl_ids,
+                    pl_targets=pl_names or tuple(configured_names),
+                )
+            elif master_type == 'BS':
+                ids, names = extract_targets(bs_df, breakdown=breakdown_name)
+                pages[page] = PageTargets(type='BS', target_ids=ids, targets=names)
+            else:
+                configured_names = PL_PAGE_ACCOUNTS.get(page, [])
+                ids, names = extract_targets(pl_df, names=configured_names or None)
+                if not ids and breakdown_name:
+                    ids, names = extract_targets(pl_df, breakdown=breakdown_name)
+                pages[page] = PageTargets(type='PL', target_ids=ids, targets=names or tuple(configured_names))
+        return cls(MappingProxyType(pages))
+
+
+def extract_targets(df, *, breakdown: str | None = None, names: list[str] | None = None) -> tuple[tuple[int, ...], tuple[str, ...]]:
+    """マスター DataFrame から内訳書名または科目名で対象を選び、(ID, 科目名) を返す。"""
+    if df is None or not hasattr(df, 'index'):
+        return (), ()
+    try:
+        if breakdown and 'breakdown_document' in getattr(df, 'columns', []):
+            subset = df[df['breakdown_document'] == breakdown]
+        elif names:
+            subset = df[df.index.isin(names)]
+        else:
+            subset = df.iloc[0:0]
+    except Exception:
+        subset = df.iloc[0:0]
+
+    try:
+        target_names = tuple(str(name) for name in subset.index.tolist())
+    except Exception:
+        target_names = ()
+    ids: tuple[int, ...] = ()
+    if 'id' in getattr(subset, 'columns', []):
+        # 数値に変換できない ID は読み飛ばす（従来の int() ループと同じ扱い）
+        numeric = subset['id'].map(_to_int).dropna()
+        ids = tuple(int(value) for value in numeric.tolist())
+    return ids, target_names
+
+
+def _to_int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_index_lock = threading.Lock()
+_index_cache: dict[str, SoATargetIndex] = {}
+
+
+def get_soa_target_index(master_service: MasterDataService | MasterSnapshot) -> SoATargetIndex:
+    """マスターのバージョンごとに共有する索引を返す（テスト時や未同期時は毎回作る）。"""
+    version_hash = _index_cache_key(master_service)
+    if version_hash is None:
+        return SoATargetIndex.build(master_service.get_bs_master_df(), master_service.get_pl_master_df())
+    with _index_lock:
+        cached = _index_cache.get(version_hash)
+    if cached is not None:
+        return cached
+    index = SoATargetIndex.build(master_service.get_bs_master_df(), master_service.get_pl_master_df())
+    with _index_lock:
+        _index_cache.clear()
+        _index_cache[version_hash] = index
+    return index
+
+
+def clear_soa_target_index_cache() -> None:
+    """Invalidate the in-process cache for SoA target indexes."""
+    with _index_lock:
+        _index_cache.clear()
+
+
+def _index_cache_key(master_service: MasterDataService | MasterSnapshot) -> str | None:
+    try:
+        if bool(current_app.config.get('TESTING', False)):
+            return None
+    except RuntimeError:
+        return None
+    try:
+        version_hash = master_service.get_version_hash()
+    except Exception:
+        return None
+    return version_hash or None
+
+
+class AccountBalanceVector:
+    """account_balances（マスターID→金額）を ID 昇順の配列に詰め替え、対象 ID の合計を配列演算で求める。"""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self, account_balances: Mapping[int, int]):
+        ids = np.fromiter(account_balances.keys(), dtype=np.int64, count=len(account_balances))
+        values = np.fromiter(account_balances.values(), dtype=np.int64, count=len(account_balances))
+        order = np.argsort(ids, kind='stable')
+        self.ids = ids[order]
+        self.values = values[order]
+
+    def __bool__(self) -> bool:
+        return bool(self.ids.size)
+
+    def sum_abs(self, target_ids: np.ndarray) -> int:
+        """target_ids に含まれる科目の金額の絶対値の合計（残高の無い ID は無視）。"""
+        if not self.ids.size or not target_ids.size:
+            return 0
+        positions = np.searchsorted(self.ids, target_ids)
+        positions[positions >= self.ids.size] = 0
+        hits = positions[self.ids[positions] == target_ids]
+        return int(np.abs(self.values[hits]).sum())
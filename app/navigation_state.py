@@ -135,28 +135,27 @@ class NavigationStateMachine:
     ) -> Set[str]:
         skipped: Set[str] = set()
         try:
-            from app.company.services.soa_summary_service import SoASummaryService
-            from app.company.models import AccountingData
+            from app.company.services.accounting_data_lookup import get_latest_accounting_data
+            from app.company.services.soa_difference_service import SoADifferenceBatch
 
             latest = accounting_data
             if latest is None:
-                latest = (
-                    AccountingData.query
-                    .filter_by(company_id=company_id)
-                    .order_by(AccountingData.created_at.desc())
-                    .first()
-                )
+                latest = get_latest_accounting_data(company_id)
             if not latest:
                 if first_soa_child:
                     skipped.add(first_soa_child)
                 return skipped
 
+            # 全ページをまとめて評価し、同じリクエスト内の完了判定（SoAProgressEvaluator）にも使い回す
+            batch = SoADifferenceBatch.current(company_id)
+            if batch is None:
+                batch = SoADifferenceBatch(company_id, accounting_data=latest)
+                batch.bind_to_request()
             for child in soa_children or []:
                 page = (child.params or {}).get('page') if getattr(child, 'params', None) else None
                 if not page:
                     continue
-                total = SoASummaryService.compute_skip_total(company_id, page, accounting_data=latest)
-                if total == 0:
+                if batch.get(page).skip_total == 0:
                     skipped.add(child.key)
         except Exception as exc:  # pragma: no cover - log only
             _log_issue('state_machine.compute_skipped', error=exc, company_id=company_id)
@@ -0,0 +1,124 @@
+"""Precomputed anchor positions for ``overlay_with_template``.
+
+Anchored template items are positioned relative to a text found on the base
+PDF. Searching a full form page with PyMuPDF is far slower than the overlay
+itself, so positions can be indexed ahead of time into a JSON sidecar next to
+the PDF (``source.pdf`` -> ``source.anchors.json``) with
+``flask build-anchor-index``. The sidecar records the SHA-256 of the PDF it
+was built from and is ignored when the PDF no longer matches.
+
+Sidecar format::
+
+    {"version": 1, "pdf_sha256": "...", "page_count": 2,
+     "anchors": [{"page": 0, "text": "合計", "hits": [[x, y], ...]}, ...]}
+
+``hits`` are already in overlay coordinates (origin bottom-left, ``y`` at the
+top of the matched text), one per occurrence in PyMuPDF search order.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from .template_cache import template_cache
+
+INDEX_VERSION = 1
+
+
+class AnchorIndex(NamedTuple):
+    pdf_sha256: str
+    page_count: int
+    hits: dict[tuple[int, str], tuple[tuple[float, float], ...]]
+
+    def lookup(self, page: int, text: str) -> tuple[tuple[float, float], ...] | None:
+        """Occurrences of ``text`` on ``page``; None if that pair was never indexed."""
+        return self.hits.get((page, text))
+
+
+def sidecar_path(base_pdf_path: str) -> str:
+    return os.path.splitext(base_pdf_path)[0] + ".anchors.json"
+
+
+def pdf_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def template_anchors(template: dict[str, Any]) -> list[tuple[int, str]]:
+    """(page, text) pairs referenced by the anchored items of a template."""
+    pairs: list[tuple[int, str]] = []
+    for section in ("texts", "grids"):
+        for item in template.get(section, []):
+            anchor = item.get("anchor")
+            if not anchor:
+                continue
+            text = str(anchor.get("text", "")).strip()
+            if text:
+                pairs.append((int(anchor.get("page", item.get("page", 0))), text))
+    return pairs
+
+
+def build_anchor_index(base_pdf_path: str, anchors: Iterable[tuple[int, str]]) -> dict[str, Any]:
+    """Search ``anchors`` in the PDF with PyMuPDF and return the sidecar payload."""
+    try:
+        import fitz  # PyMuPDF
+    except Exception as exc:  # pragma: no cover - optional dep
+        raise RuntimeError(
+            "PyMuPDF (fitz) is required to build an anchor index. Install with: pip install PyMuPDF"
+        ) from exc
+    entries = []
+    with fitz.open(base_pdf_path) as doc:
+        page_count = len(doc)
+        for page_index, text in sorted(set(anchors)):
+            if page_index < 0 or page_index >= page_count:
+                continue
+            page = doc[page_index]
+            page_height = float(page.rect.height)
+            hits = [[float(r.x0), page_height - float(r.y0)] for r in page.search_for(text)]
+            entries.append({"page": page_index, "text": text, "hits": hits})
+    return {
+        "version": INDEX_VERSION,
+        "pdf_sha256": pdf_sha256(base_pdf_path),
+        "page_count": page_count,
+        "anchors": entries,
+    }
+
+
+def write_anchor_index(base_pdf_path: str, anchors: Iterable[tuple[int, str]]) -> str:
+    payload = build_anchor_index(base_pdf_path, anchors)
+    path = sidecar_path(base_pdf_path)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False, indent=1)
+    return path
+
+
+def _read_anchor_index(base_pdf_path: str) -> AnchorIndex | None:
+    path = sidecar_path(base_pdf_path)
+    try:
+        with open(path, encoding="utf-8") as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != INDEX_VERSION or payload.get("pdf_sha256") != pdf_sha256(base_pdf_path):
+        return None
+    hits = {
+        (int(entry["page"]), str(entry["text"])): tuple((float(x), float(y)) for x, y in entry.get("hits", []))
+        for entry in payload.get("anchors", [])
+    }
+    return AnchorIndex(payload["pdf_sha256"], int(payload.get("page_count", 0)), hits)
+
+
+def load_anchor_index(base_pdf_path: str) -> AnchorIndex | None:
+    """The validated sidecar index for ``base_pdf_path``, or None if absent or stale.
+
+    Cached per (PDF, sidecar) file signature, so the PDF is hashed once per version.
+    """
+    if not os.path.exists(base_pdf_path):
+        return None
+    return template_cache.anchor_index(base_pdf_path, sidecar_path(base_pdf_path), lambda: _read_anchor_index(base_pdf_path))
@@ -5,7 +5,6 @@ from typing import Any
 
 from flask import has_request_context
 from flask_login import current_user
-from reportlab.pdfbase import pdfmetrics
 from sqlalchemy import func
 
 import app.company.services.company_classification_service as company_classification_service
@@ -22,41 +21,21 @@ from .layout_utils import (
     load_geometry,
     prepare_pdf_assets,
 )
-from .pdf_fill import TextSpec
+from .pdf_fill import PdfOutput, TextSpec
+from .text_metrics import ellipsize_many, fit_many, string_width, string_widths, wrap_to_width
 
 
 def _string_width(text: str, font_name: str, font_size: float) -> float:
-    try:
-        return pdfmetrics.stringWidth(text, font_name, font_size)
-    except Exception:
-        # Fallback to a safe heuristic when font is not registered yet
-        return len(text) * font_size * 0.55
+    # Unregistered fonts fall back to the 0.55em heuristic inside text_metrics
+    return string_width(text, font_name, font_size)
 
 
 def _ellipsize(text: str, font_name: str, font_size: float, max_width: float) -> str:
-    if _string_width(text, font_name, font_size) <= max_width:
-        return text
-    ell = "…"
-    if _string_width(ell, font_name, font_size) > max_width:
-        return ""
-    out = []
-    for ch in text:
-        cand = "".join(out) + ch + ell
-        if _string_width(cand, font_name, font_size) <= max_width:
-            out.append(ch)
-        else:
-            break
-    return "".join(out) + ell
+    return ellipsize_many([text], font_name, font_size, max_width)[0]
 
 
 def _fit_text(text: str, font_name: str, start_size: float, min_size: float, max_width: float) -> tuple[str, float]:
-    size = start_size
-    while size >= min_size:
-        if _string_width(text, font_name, size) <= max_width:
-            return text, size
-        size -= 1.0
-    # Ellipsize at min size
-    return _ellipsize(text, font_name, min_size, max_width), min_size
+    return fit_many([text], font_name, start_size, min_size, max_width)[0]
 
 
 def _vcenter_single(rect_y: float, rect_h: float, font_size: float) -> float:
@@ -275,18 +254,7 @@ def _place_at_right(page: int, x_right: float, y: float, text: str, texts_list:
     texts_list.append(TextSpec(page=page, x=x, y=y, text=text, font_name=font, font_size=size))
 
 def _wrap_text_to_width(text: str, font_name: str, font_size: float, max_width: float) -> list[str]:
-    lines: list[str] = []
-    cur = ""
-    for ch in text:
-        if _string_width(cur + ch, font_name, font_size) <= max_width:
-            cur += ch
-        else:
-            if cur:
-                lines.append(cur)
-            cur = ch
-    if cur:
-        lines.append(cur)
-    return lines
+    return wrap_to_width(text, font_name, font_size, max_width)
 
 def _place_wrapped_text_rect_left(page: int, x0: float, y0: float, w: float, h: float, text: str, texts_list: list[TextSpec], *, start_size: float = 10.0, min_size: float = 8.0, line_gap: float = 0.0, font: str = "NotoSansJP") -> None:
     if not text:
@@ -414,7 +382,7 @@ def _compute_totals(company_id: int) -> dict[str, str]:
         "ratio_pct": f"{ratio_pct}%",
     }
 
-def generate_beppyou_02(company_id: int | None, year: str = "2025", *, output_path: str) -> str:
+def generate_beppyou_02(company_id: int | None, year: str = "2025", *, output_path: PdfOutput) -> PdfOutput:
     company_id = _resolve_company_id(company_id)
     repo_root = _repo_root()
     assets = prepare_pdf_assets(
@@ -433,65 +401,64 @@ def generate_beppyou_02(company_id: int | None, year: str = "2025", *, output_pa
     texts: list[TextSpec] = []
     rectangles: list[tuple[int, float, float, float, float]] = []
 
+    pad = metrics["PADDING_X"]
+    gx, gy, gw, gh = rects["NUM_RECT"]
+    ax, ay, aw, ah = rects["ADDR_RECT"]
+    nx, ny, nw, nh = rects["NAME_RECT"]
+    rx, ry, rw, rh = rects["REL_RECT"]
+    sx, sy, sw, sh = rects["SHARES_RECT"]
+    font = "NotoSansJP"
+
+    # Measure each column for all rows at once
+    addr_lines_by_row: list[list[str]] = []
+    rel_texts: list[str] = []
     for idx, row in enumerate(rows):
+        person: Shareholder = row["person"]
+        main: Shareholder = row["main"]
+        if not row["is_main"] and shs.is_same_address(person, main):
+            addr_lines = ["同上"]
+        else:
+            addr_lines = [person.prefecture_city or "", person.address or ""]
+        addr_lines_by_row.append([ln for ln in addr_lines if ln] or [""])
+        rel_text = row.get("relation") or ""
+        if idx == 0 and row.get("is_main") and rel_text == "本人":
+            rel_text = ""
+        rel_texts.append(rel_text)
+
+    num_fits = fit_many([str(row["group"]) if row.get("group") else "" for row in rows], font, 10.0, 9.0, gw - pad * 2)
+    name_fits = fit_many([row["person"].last_name or "" for row in rows], font, 10.0, 8.0, nw - pad * 2)
+    rel_fits = fit_many(rel_texts, font, 9.0, 8.0, rw - pad * 2)
+    addr_fits = iter(fit_many([ln for lines in addr_lines_by_row for ln in lines], font, 8.0, 7.0, aw - pad * 2))
+    shares_texts = [_format_number(row["person"].shares_held) for row in rows]
+    shares_widths = string_widths(shares_texts, font, 10.0).tolist()
+
+    for idx in range(len(rows)):
         row_center = metrics["ROW1_CENTER"] - metrics["ROW_STEP"] * idx
         baseline0 = metrics.get("baseline0")
         if baseline0 is None:
             baseline0 = baseline0_from_center(row_center, 13.0)
             metrics["baseline0"] = baseline0
 
-        gnum = str(row["group"]) if row.get("group") else ""
-        gx, gy, gw, gh = rects["NUM_RECT"]
-        gw -= metrics["PADDING_X"] * 2
-        num_fit, num_size = _fit_text(gnum, "NotoSansJP", 10.0, 9.0, gw)
-        num_x = gx + metrics["PADDING_X"]
-        num_y = _baseline_center(row_center, num_size)
-        texts.append(TextSpec(page=0, x=num_x, y=num_y, text=num_fit, font_name="NotoSansJP", font_size=num_size))
-
-        person: Shareholder = row["person"]
-        main: Shareholder = row["main"]
+        num_fit, num_size = num_fits[idx]
+        texts.append(TextSpec(page=0, x=gx + pad, y=_baseline_center(row_center, num_size), text=num_fit, font_name=font, font_size=num_size))
 
         # Address
-        ax, ay, aw, ah = rects["ADDR_RECT"]
-        ax += metrics["PADDING_X"]
-        width_addr = aw - metrics["PADDING_X"] * 2
-        if not row["is_main"] and shs.is_same_address(person, main):
-            addr_lines = ["同上"]
-        else:
-            addr_lines = [person.prefecture_city or "", person.address or ""]
-        addr_lines = [ln for ln in addr_lines if ln]
-        if not addr_lines:
-            addr_lines = [""]
-        addr_font = "NotoSansJP"
-        addr_sizes = []
-        for ln in addr_lines:
-            fit, size = _fit_text(ln, addr_font, 8.0, 7.0, width_addr)
-            addr_sizes.append((fit, size))
+        addr_sizes = [next(addr_fits) for _ in addr_lines_by_row[idx]]
         y_bases = _multiline_center(row_center, [sz for _, sz in addr_sizes], 2.0 if len(addr_sizes) > 1 else 0.0)
         for (text, size), yb in zip(addr_sizes, y_bases):
-            texts.append(TextSpec(page=0, x=ax, y=yb, text=text, font_name=addr_font, font_size=size))
+            texts.append(TextSpec(page=0, x=ax + pad, y=yb, text=text, font_name=font, font_size=size))
 
         # Name
-        nx, ny, nw, nh = rects["NAME_RECT"]
-        nx += metrics["PADDING_X"]
-        name_fit, name_size = _fit_text(person.last_name or "", "NotoSansJP", 10.0, 8.0, nw - metrics["PADDING_X"] * 2)
-        texts.append(TextSpec(page=0, x=nx, y=_baseline_center(row_center, name_size), text=name_fit, font_name="NotoSansJP", font_size=name_size))
+        name_fit, name_size = name_fits[idx]
+        texts.append(TextSpec(page=0, x=nx + pad, y=_baseline_center(row_center, name_size), text=name_fit, font_name=font, font_size=name_size))
 
         # Relation
-        rel_text = row.get("relation") or ""
-        if idx == 0 and row.get("is_main") and rel_text == "本人":
-            rel_text = ""
-        rx, ry, rw, rh = rects["REL_RECT"]
-        rx += metrics["PADDING_X"]
-        rel_fit, rel_size = _fit_text(rel_text, "NotoSansJP", 9.0, 8.0, rw - metrics["PADDING_X"] * 2)
-        texts.append(TextSpec(page=0, x=rx, y=_baseline_center(row_center, rel_size), text=rel_fit, font_name="NotoSansJP", font_size=rel_size))
+        rel_fit, rel_size = rel_fits[idx]
+        texts.append(TextSpec(page=0, x=rx + pad, y=_baseline_center(row_center, rel_size), text=rel_fit, font_name=font, font_size=rel_size))
 
         # Shares
-        sx, sy, sw, sh = rects["SHARES_RECT"]
-        shares_text = _format_number(person.shares_held)
-        shares_w = _string_width(shares_text, "NotoSansJP", 10.0)
-        shares_x = sx + sw - shares_w - 2.0
-        texts.append(TextSpec(page=0, x=shares_x, y=_baseline_center(row_center, 10.0), text=shares_text, font_name="NotoSansJP", font_size=10.0))
+        shares_x = sx + sw - shares_widths[idx] - 2.0
+        texts.append(TextSpec(page=0, x=shares_x, y=_baseline_center(row_center, 10.0), text=shares_texts[idx], font_name=font, font_size=10.0))
 
     # Header summary
     totals = _compute_totals(company_id)
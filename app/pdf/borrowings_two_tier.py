@@ -8,14 +8,14 @@ from app.utils import format_number
 
 from .fonts import default_font_map, ensure_font_registered
 from .layout_utils import load_geometry
-from .pdf_fill import TextSpec, overlay_pdf
+from .pdf_fill import PdfOutput, TextSpec, overlay_pdf
 
 
 def _fmt(n: int | None) -> str:
     return format_number(n)
 
 
-def generate_borrowings_two_tier(company_id: int | None, year: str = "2025", *, output_path: str) -> str:
+def generate_borrowings_two_tier(company_id: int | None, year: str = "2025", *, output_path: PdfOutput) -> PdfOutput:
     """
     借入金及び支払利子（上下二段）PDFを生成します。
     - 上段: 借入金合計（B/S）
@@ -83,5 +83,12 @@ def generate_borrowings_two_tier(company_id: int | None, year: str = "2025", *,
     except Exception:
         pass
 
-    return overlay_pdf(base_pdf_path=base_pdf, output_pdf_path=output_path, texts=texts, rectangles=[])
+    overlay_pdf(
+        base_pdf_path=base_pdf,
+        output_pdf_path=output_path,
+        texts=texts,
+        rectangles=[],
+        font_registrations={"NotoSansJP": font_map["NotoSansJP"]},
+    )
+    return output_path
 
@@ -4,6 +4,8 @@ import os
 
 from reportlab.pdfbase import pdfmetrics
 
+from .template_cache import template_cache
+
 
 def default_font_map(repo_root: str) -> dict[str, str]:
     return {
@@ -12,10 +14,13 @@ def default_font_map(repo_root: str) -> dict[str, str]:
 
 
 def ensure_font_registered(name: str, path: str) -> None:
+    if template_cache.is_font_registered(name, path):
+        return
     try:
         from reportlab.pdfbase.ttfonts import TTFont  # type: ignore
         if name not in pdfmetrics.getRegisteredFontNames():
             pdfmetrics.registerFont(TTFont(name, path))
+        template_cache.mark_font_registered(name, path)
     except Exception:
         # Leave registration best-effort; calling code may still attempt to draw strings
         pass
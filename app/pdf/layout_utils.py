@@ -5,7 +5,8 @@ import os
 from typing import Any, NamedTuple
 
 from .fonts import default_font_map, ensure_font_registered
-from .pdf_fill import TextSpec, overlay_pdf
+from .pdf_fill import PdfOutput, TextSpec, overlay_pdf
+from .template_cache import template_cache
 
 
 class GeometryError(Exception):
@@ -106,11 +107,11 @@ class OverlaySpec(NamedTuple):
 def build_overlay(
     *,
     base_pdf_path: str,
-    output_pdf_path: str,
+    output_pdf_path: PdfOutput,
     texts: list[TextSpec],
     rectangles: list[tuple[int, float, float, float, float]] | None = None,
     font_registrations: dict[str, str] | None = None,
-) -> str:
+) -> PdfOutput:
     overlay_pdf(
         base_pdf_path=base_pdf_path,
         output_pdf_path=output_pdf_path,
@@ -144,6 +145,9 @@ def load_geometry(
     first, then ``default_geometry.json``, and finally the newest ``*_geometry.json``
     under the same directory. When ``required`` is ``False`` the function returns
     an empty dict instead of raising if no candidate is found.
+
+    Parsed and validated results are memoized in ``template_cache`` until the
+    resolved file changes on disk.
     """
     base_dir = _geometry_base_dir(repo_root, template_key)
     explicit_paths = _geometry_paths(base_dir, year)
@@ -162,8 +166,12 @@ def load_geometry(
             raise FileNotFoundError(f"Geometry file not found: {explicit_paths[0]}")
         return {}
 
-    data = _load_geometry_json(candidates[0], required=required)
-    return _validate_geometry(data, validate=validate)
+    path = candidates[0]
+    return template_cache.geometry(
+        path,
+        validate=validate,
+        loader=lambda: _validate_geometry(_load_geometry_json(path, required=required), validate=validate),
+    )
 
 
 def center_from_row1(row1_center: float, row_step: float, row_idx: int) -> float:
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from io import BytesIO
-from typing import Any
+from typing import IO, Any, NamedTuple, Union
 
 from . import __init__ as _package_init  # noqa: F401  # ensure package is recognized
+from .template_cache import template_cache
+
+
+# Destination for generated PDFs: a filesystem path, a writable binary stream,
+# or an ``OverlayCapture`` that defers rendering.
+PdfOutput = Union[str, "os.PathLike[str]", IO[bytes], "OverlayCapture"]
+
+
+def _write_pdf(writer, output: PdfOutput) -> None:
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            writer.write(f)
+    else:
+        writer.write(output)
 
 
 def _import_pypdf():
@@ -92,10 +106,36 @@ class TextSpec:
     align: str = "left"  # "left" or "right"
 
 
+class OverlayJob(NamedTuple):
+    """Everything ``overlay_pdf`` needs to render, with no DB or app state."""
+
+    base_pdf_path: str
+    texts: list[TextSpec]
+    grids: list[GridSpec]
+    rectangles: list[tuple[int, float, float, float, float]]
+    font_registrations: dict[str, str]
+    merge_engine: str
+
+
+class OverlayCapture:
+    """Output sink that records overlay jobs instead of rendering them.
+
+    Passing an instance as ``output_path`` to a generator runs its data
+    collection and layout, but defers the reportlab/pypdf work so the jobs can
+    be rendered elsewhere (e.g. in a worker process) with ``render_overlay_jobs``.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: list[OverlayJob] = []
+
+
 def _register_font_if_needed(font_name: str, font_path: str | None) -> None:
+    if not font_path or template_cache.is_font_registered(font_name, font_path):
+        return
     _, pdfmetrics, TTFont = _import_reportlab()
-    if font_path and font_name not in pdfmetrics.getRegisteredFontNames():
+    if font_name not in pdfmetrics.getRegisteredFontNames():
         pdfmetrics.registerFont(TTFont(font_name, font_path))
+    template_cache.mark_font_registered(font_name, font_path)
 
 
 def _number_to_digits(value: int, *, thousand_separators: bool = False) -> tuple[str, bool]:
@@ -180,16 +220,30 @@ def _determine_total_pages(
     return max(len(reader.pages), max_index + 1)
 
 
+def _right_aligned_widths(specs: list[TextSpec]) -> dict[int, float]:
+    """Widths of right-aligned texts, measured per font in one batch."""
+    from .text_metrics import string_widths  # reportlab/numpy are only needed when drawing
+
+    by_font: dict[str, list[int]] = {}
+    for index, spec in enumerate(specs):
+        if getattr(spec, 'align', 'left') == 'right':
+            by_font.setdefault(spec.font_name, []).append(index)
+    widths: dict[int, float] = {}
+    for font_name, indexes in by_font.items():
+        measured = string_widths(
+            [specs[i].text for i in indexes],
+            font_name,
+            [specs[i].font_size for i in indexes],
+        )
+        widths.update(zip(indexes, measured.tolist()))
+    return widths
+
+
 def _draw_texts(canvas_obj, specs: list[TextSpec]) -> None:
-    for spec in specs:
+    right_widths = _right_aligned_widths(specs)
+    for index, spec in enumerate(specs):
         canvas_obj.setFont(spec.font_name, spec.font_size)
-        if getattr(spec, 'align', 'left') == 'right':
-            try:
-                canvas_obj.drawRightString(spec.x, spec.y, spec.text)
-            except Exception:
-                canvas_obj.drawString(spec.x, spec.y, spec.text)
-        else:
-            canvas_obj.drawString(spec.x, spec.y, spec.text)
+        canvas_obj.drawString(spec.x - right_widths.get(index, 0.0), spec.y, spec.text)
 
 
 def _draw_grids(canvas_obj, specs: list[GridSpec]) -> None:
@@ -207,12 +261,19 @@ def _draw_grids(canvas_obj, specs: list[GridSpec]) -> None:
             cursor = spec.x0 + (spec.box_width * (spec.box_count - 1))
         else:
             cursor = spec.x0
+        y = spec.y0 + spec.y_offset
+        # One text object per grid instead of a BT/ET block per box
+        text_obj = canvas_obj.beginText()
+        text_obj.setFont(spec.font_name, spec.font_size)
         for ch in characters[: spec.box_count]:
-            canvas_obj.drawString(cursor, spec.y0 + spec.y_offset, ch)
+            text_obj.setTextOrigin(cursor, y)
+            text_obj.textOut(ch)
             cursor += step
         if is_negative and spec.negative_mark:
             mark_x = spec.x0 - (spec.box_width if spec.rtl else 0) - 2
-            canvas_obj.drawString(mark_x, spec.y0 + spec.y_offset, spec.negative_mark)
+            text_obj.setTextOrigin(mark_x, y)
+            text_obj.textOut(spec.negative_mark)
+        canvas_obj.drawText(text_obj)
 
 
 def _draw_rectangles(canvas_obj, specs: list[tuple[float, float, float, float]]) -> None:
@@ -223,19 +284,21 @@ def _draw_rectangles(canvas_obj, specs: list[tuple[float, float, float, float]])
         canvas_obj.rect(x, y, width, height, stroke=1, fill=0)
 
 
-def _build_page_with_overlay(
-    pypdf_module,
+def _page_size(page) -> tuple[float, float]:
+    media_box = page.mediabox
+    return float(media_box.width), float(media_box.height)
+
+
+def _render_overlay_page(
     canvas_module,
     pdf_reader_cls,
-    base_page,
+    page_size: tuple[float, float],
     page_index: int,
     texts_by_page: dict[int, list[TextSpec]],
     grids_by_page: dict[int, list[GridSpec]],
     rects_by_page: dict[int, list[tuple[float, float, float, float]]],
 ):
-    media_box = base_page.mediabox
-    width = float(media_box.width)
-    height = float(media_box.height)
+    width, height = page_size
     packet = BytesIO()
     canvas_obj = canvas_module.Canvas(packet, pagesize=(width, height))
     _draw_texts(canvas_obj, texts_by_page.get(page_index, []))
@@ -243,14 +306,232 @@ def _build_page_with_overlay(
     _draw_rectangles(canvas_obj, rects_by_page.get(page_index, []))
     canvas_obj.save()
     packet.seek(0)
-    overlay_reader = pdf_reader_cls(packet)
-    overlay_page = overlay_reader.pages[0]
+    return pdf_reader_cls(packet).pages[0]
+
+
+def _merge_base_and_overlay(pypdf_module, base_page, overlay_page):
+    width, height = _page_size(base_page)
     merged = pypdf_module.PageObject.create_blank_page(None, width, height)
     merged.merge_page(base_page)
     merged.merge_page(overlay_page)
     return merged
 
 
+class _BaseXObject(NamedTuple):
+    name: Any
+    ref: Any
+    width: float
+    height: float
+    annots: Any
+
+
+class _BasePageXObjects:
+    """Cache of base pages converted to form XObjects inside one writer.
+
+    Each base page is copied into the output exactly once; every stamped page
+    then references it with ``q /BasePgN Do Q`` instead of re-merging its
+    content stream.
+    """
+
+    def __init__(self, writer, reader) -> None:
+        self._writer = writer
+        self._reader = reader
+        self._cache: dict[int, _BaseXObject] = {}
+
+    def get(self, base_idx: int) -> _BaseXObject:
+        cached = self._cache.get(base_idx)
+        if cached is None:
+            cached = self._build(base_idx)
+            self._cache[base_idx] = cached
+        return cached
+
+    def _build(self, base_idx: int) -> _BaseXObject:
+        from pypdf.generic import (
+            ArrayObject,
+            DecodedStreamObject,
+            DictionaryObject,
+            FloatObject,
+            NameObject,
+        )
+
+        base_page = self._reader.pages[base_idx]
+        media_box = base_page.mediabox
+        width = float(media_box.width)
+        height = float(media_box.height)
+        contents = base_page.get_contents()
+        stream = DecodedStreamObject()
+        stream.set_data(contents.get_data() if contents is not None else b"")
+        resources = base_page.get("/Resources")
+        if resources is not None:
+            resources = resources.get_object().clone(self._writer)
+        else:
+            resources = DictionaryObject()
+        stream.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): ArrayObject(
+                [FloatObject(0), FloatObject(0), FloatObject(width), FloatObject(height)]
+            ),
+            NameObject("/Resources"): resources,
+        })
+        ref = self._writer._add_object(stream.flate_encode())
+        annots = base_page.get("/Annots")
+        if annots is not None:
+            annots = _annotation_templates(self._writer, annots.get_object())
+        return _BaseXObject(NameObject(f"/BasePg{base_idx}"), ref, width, height, annots)
+
+
+def _annotation_templates(writer, annots) -> tuple[Any, ...]:
+    """Writer-side copies of a base page's annotations, without ``/P``.
+
+    Read from the shared reader once per base page (under its lock); every
+    stamped page then gets its own dictionaries from these via
+    ``_page_annotations``. Indirect values (e.g. appearance streams) are cloned
+    once per writer and shared. ``/Parent`` is dropped: the output has no
+    AcroForm, and cloning the field would drag its other widgets along.
+    """
+    from pypdf.generic import DictionaryObject, NameObject
+
+    templates = []
+    for annot in annots:
+        source = annot.get_object()
+        if not isinstance(source, DictionaryObject):
+            continue
+        template = DictionaryObject()
+        for key, value in source.items():
+            if key in ("/P", "/Parent"):
+                continue
+            template[NameObject(key)] = value.clone(writer) if hasattr(value, "clone") else value
+        templates.append(template)
+    return tuple(templates)
+
+
+def _page_annotations(writer, page, templates: tuple[Any, ...]):
+    """Annotations owned by ``page`` (an annotation dictionary has exactly one ``/P``)."""
+    from pypdf.generic import ArrayObject, DictionaryObject, NameObject
+
+    copies = ArrayObject()
+    for template in templates:
+        annot = DictionaryObject(template)
+        annot[NameObject("/P")] = page.indirect_reference
+        copies.append(writer._add_object(annot))
+    return copies
+
+
+def _render_overlay_document(
+    canvas_module,
+    page_sizes: list[tuple[float, float]],
+    texts_by_page: dict[int, list[TextSpec]],
+    grids_by_page: dict[int, list[GridSpec]],
+    rects_by_page: dict[int, list[tuple[float, float, float, float]]],
+) -> BytesIO:
+    """Draw every overlay page into a single multi-page reportlab document."""
+    packet = BytesIO()
+    canvas_obj = canvas_module.Canvas(packet, pagesize=page_sizes[0])
+    for page_index, page_size in enumerate(page_sizes):
+        canvas_obj.setPageSize(page_size)
+        _draw_texts(canvas_obj, texts_by_page.get(page_index, []))
+        _draw_grids(canvas_obj, grids_by_page.get(page_index, []))
+        _draw_rectangles(canvas_obj, rects_by_page.get(page_index, []))
+        canvas_obj.showPage()
+    canvas_obj.save()
+    packet.seek(0)
+    return packet
+
+
+def _stamp_overlay_page(writer, overlay_page, base: _BaseXObject):
+    """Add ``overlay_page`` to ``writer`` with the cached base XObject drawn underneath."""
+    from pypdf.generic import (
+        ArrayObject,
+        DecodedStreamObject,
+        DictionaryObject,
+        NameObject,
+        RectangleObject,
+    )
+
+    page = writer.add_page(overlay_page)
+
+    # reportlab may share one /Resources dict between pages; give each page its own.
+    resources = DictionaryObject()
+    existing = page.get("/Resources")
+    if existing is not None:
+        resources.update(existing.get_object())
+    xobjects = DictionaryObject()
+    if "/XObject" in resources:
+        xobjects.update(resources["/XObject"].get_object())
+    xobjects[base.name] = base.ref
+    resources[NameObject("/XObject")] = xobjects
+    page[NameObject("/Resources")] = resources
+
+    prefix = DecodedStreamObject()
+    prefix.set_data(b"q " + base.name.encode() + b" Do Q\n")
+    contents = page.get("/Contents")
+    parts: list[Any] = [writer._add_object(prefix)]
+    if isinstance(contents, ArrayObject):
+        parts.extend(contents)
+    elif contents is not None:
+        parts.append(contents)
+    page[NameObject("/Contents")] = ArrayObject(parts)
+    page[NameObject("/MediaBox")] = RectangleObject([0, 0, base.width, base.height])
+    if base.annots is not None:
+        page[NameObject("/Annots")] = _page_annotations(writer, page, base.annots)
+    return page
+
+
+def _write_jobs_single_pass(writer, jobs: Sequence[OverlayJob], canvas_module, pdf_reader_cls) -> list[int]:
+    """Stamp every job's pages into ``writer`` from one shared overlay document.
+
+    All overlay pages of all jobs are drawn on a single reportlab canvas, so each
+    font is embedded once (one set of subsets and one font resource dictionary)
+    for the whole output. Base pages become XObjects shared per base PDF.
+    Returns the number of pages written for each job.
+    """
+    base_xobjects: dict[str, _BasePageXObjects] = {}
+    stamps: list[_BaseXObject] = []
+    texts_all: dict[int, list[TextSpec]] = {}
+    grids_all: dict[int, list[GridSpec]] = {}
+    rects_all: dict[int, list[tuple[float, float, float, float]]] = {}
+    page_counts: list[int] = []
+    for job in jobs:
+        used_base = _resolve_base_pdf_path(job.base_pdf_path)
+        texts_by_page, grids_by_page, rects_by_page = _collect_overlay_specs(job.texts, job.grids, job.rectangles)
+        _register_fonts(job.font_registrations)
+        _log_base_pdf_usage(used_base)
+        base = template_cache.base_reader(used_base)
+        offset = len(stamps)
+        # Only copying base pages into the writer reads the shared reader; drawing
+        # and stamping below run without its lock.
+        with base.lock:
+            reader = base.reader
+            xobjects = base_xobjects.get(used_base)
+            if xobjects is None:
+                xobjects = base_xobjects[used_base] = _BasePageXObjects(writer, reader)
+            total_pages = _determine_total_pages(reader, texts_by_page, grids_by_page, rects_by_page)
+            stamps.extend(xobjects.get(min(i, len(reader.pages) - 1)) for i in range(total_pages))
+        for by_page, merged in ((texts_by_page, texts_all), (grids_by_page, grids_all), (rects_by_page, rects_all)):
+            for page_index, items in by_page.items():
+                merged[offset + page_index] = items
+        _log_overlay_counts(texts_by_page, grids_by_page, used_base)
+        page_counts.append(total_pages)
+    if stamps:
+        page_sizes = [(stamp.width, stamp.height) for stamp in stamps]
+        packet = _render_overlay_document(canvas_module, page_sizes, texts_all, grids_all, rects_all)
+        overlay_reader = pdf_reader_cls(packet)
+        for page_index, stamp in enumerate(stamps):
+            _stamp_overlay_page(writer, overlay_reader.pages[page_index], stamp)
+    return page_counts
+
+
+def _write_per_page(reader, writer, pypdf_module, overlay_pages: list[Any]) -> None:
+    """Merge each overlay page onto its base page (the caller holds the base reader's lock)."""
+    for page_index, overlay_page in enumerate(overlay_pages):
+        base_page = reader.pages[min(page_index, len(reader.pages) - 1)]
+        writer.add_page(_merge_base_and_overlay(pypdf_module, base_page, overlay_page))
+
+
+MERGE_ENGINES = ("single_pass", "per_page")
+
+
 def _register_fonts(font_registrations: dict[str, str] | None) -> None:
     if not font_registrations:
         return
@@ -258,6 +539,17 @@ def _register_fonts(font_registrations: dict[str, str] | None) -> None:
         _register_font_if_needed(name, path)
 
 
+def _check_captured_fonts(job: OverlayJob) -> None:
+    """Captured jobs may be rendered in another process, which only registers ``job.font_registrations``."""
+    _, pdfmetrics, _ = _import_reportlab()
+    used = {spec.font_name for spec in job.texts} | {spec.font_name for spec in job.grids}
+    missing = sorted(
+        name for name in used if name not in job.font_registrations and name not in pdfmetrics.standardFonts
+    )
+    if missing:
+        raise ValueError(f"overlay job uses fonts without font_registrations: {', '.join(missing)}")
+
+
 def _is_development_env() -> bool:
     try:
         return os.getenv('APP_ENV', 'development').lower() != 'production'
@@ -293,50 +585,144 @@ def _log_overlay_counts(
 
 def overlay_pdf(
     base_pdf_path: str,
-    output_pdf_path: str,
+    output_pdf_path: PdfOutput,
     texts: Iterable[TextSpec] = (),
     grids: Iterable[GridSpec] = (),
     rectangles: Iterable[tuple[int, float, float, float, float]] = (),
     *,
     font_registrations: dict[str, str] | None = None,
+    merge_engine: str = "single_pass",
 ) -> None:
     """Overlay texts/grids on a base PDF.
 
     Development-friendly: If base_pdf_path does not exist and it follows the
     pattern resources/pdf_forms/<template>/<year>/source.pdf, fall back to the
     latest available year or default/source.pdf under the same template dir.
+
+    ``output_pdf_path`` may also be a writable binary stream (e.g. ``BytesIO``),
+    in which case nothing touches the filesystem.
+
+    ``merge_engine`` selects how pages are assembled. ``"single_pass"`` draws
+    the whole overlay as one reportlab document and stamps each page onto a
+    shared XObject of its base page; ``"per_page"`` is the original
+    canvas-per-page path, kept for comparison.
     """
+    if merge_engine not in MERGE_ENGINES:
+        raise ValueError(f"unknown merge_engine: {merge_engine}")
+    job = OverlayJob(
+        base_pdf_path=base_pdf_path,
+        texts=list(texts),
+        grids=list(grids),
+        rectangles=list(rectangles),
+        font_registrations=dict(font_registrations or {}),
+        merge_engine=merge_engine,
+    )
+    if isinstance(output_pdf_path, OverlayCapture):
+        _check_captured_fonts(job)
+        output_pdf_path.jobs.append(job)
+        return
+    if merge_engine == "single_pass":
+        render_overlay_jobs([job], output_pdf_path)
+        return
+
     used_base = _resolve_base_pdf_path(base_pdf_path)
     pypdf_module, PdfReader, PdfWriter = _import_pypdf()
     canvas_module, _, _ = _import_reportlab()
 
-    texts_by_page, grids_by_page, rects_by_page = _collect_overlay_specs(texts, grids, rectangles)
+    texts_by_page, grids_by_page, rects_by_page = _collect_overlay_specs(job.texts, job.grids, job.rectangles)
     _register_fonts(font_registrations)
     _log_base_pdf_usage(used_base)
 
-    reader = PdfReader(used_base)
-    writer = PdfWriter()
-    total_pages = _determine_total_pages(reader, texts_by_page, grids_by_page, rects_by_page)
-
-    for page_index in range(total_pages):
-        base_idx = min(page_index, len(reader.pages) - 1)
-        base_page = reader.pages[base_idx]
-        merged_page = _build_page_with_overlay(
-            pypdf_module,
-            canvas_module,
-            PdfReader,
-            base_page,
-            page_index,
-            texts_by_page,
-            grids_by_page,
-            rects_by_page,
+    base = template_cache.base_reader(used_base)
+    # Hold the shared reader's lock only while reading from it, not while drawing
+    with base.lock:
+        reader = base.reader
+        total_pages = _determine_total_pages(reader, texts_by_page, grids_by_page, rects_by_page)
+        page_sizes = [_page_size(reader.pages[min(i, len(reader.pages) - 1)]) for i in range(total_pages)]
+    overlay_pages = [
+        _render_overlay_page(
+            canvas_module, PdfReader, page_sizes[i], i, texts_by_page, grids_by_page, rects_by_page,
         )
-        writer.add_page(merged_page)
+        for i in range(total_pages)
+    ]
+    writer = PdfWriter()
+    with base.lock:
+        _write_per_page(base.reader, writer, pypdf_module, overlay_pages)
 
     _log_overlay_counts(texts_by_page, grids_by_page, used_base)
 
-    with open(output_pdf_path, 'wb') as f:
-        writer.write(f)
+    _write_pdf(writer, output_pdf_path)
+
+
+def render_overlay_jobs(jobs: Sequence[OverlayJob], output: PdfOutput, *, dedupe_streams: bool = False) -> list[int]:
+    """Render ``jobs`` back to back into one PDF with a shared overlay font resource.
+
+    Returns the page count of each job (for bookmarks). ``dedupe_streams`` also
+    collapses byte-identical streams (e.g. the same embedded font program in two
+    base forms) when writing. Each job's ``merge_engine`` is ignored; this is the
+    single-pass path.
+    """
+    _, PdfReader, PdfWriter = _import_pypdf()
+    canvas_module, _, _ = _import_reportlab()
+    writer = PdfWriter()
+    page_counts = _write_jobs_single_pass(writer, jobs, canvas_module, PdfReader)
+    if dedupe_streams:
+        dedupe_identical_streams(writer)
+    _write_pdf(writer, output)
+    return page_counts
+
+
+def dedupe_identical_streams(writer) -> int | None:
+    """Point every reference at one copy of each byte-identical stream object.
+
+    Uses ``PdfWriter.compress_identical_objects`` where pypdf provides it
+    (5.0+), which does not report a count, so ``None`` is returned. pypdf 4.x
+    has no built-in equivalent: the fallback rewrites the writer's object table
+    directly, leaving dropped slots as ``null`` so the xref stays valid, and
+    returns the number of stream objects dropped. If that private table is not
+    there, nothing is deduplicated and 0 is returned.
+    """
+    import hashlib
+
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NullObject, StreamObject
+
+    compress = getattr(writer, "compress_identical_objects", None)
+    if callable(compress):
+        compress(remove_identicals=True, remove_orphans=False)
+        return None
+    if not isinstance(getattr(writer, "_objects", None), list):
+        return 0
+
+    canonical: dict[bytes, IndirectObject] = {}
+    remap: dict[int, IndirectObject] = {}
+    for index, obj in enumerate(writer._objects):
+        if not isinstance(obj, StreamObject):
+            continue
+        serialized = BytesIO()
+        obj.write_to_stream(serialized)
+        keep = canonical.setdefault(hashlib.sha256(serialized.getvalue()).digest(), IndirectObject(index + 1, 0, writer))
+        if keep.idnum != index + 1:
+            remap[index + 1] = keep
+    if not remap:
+        return 0
+
+    def _rewrite(value):
+        if isinstance(value, IndirectObject):
+            return remap.get(value.idnum, value) if value.pdf is writer else value
+        if isinstance(value, DictionaryObject):
+            for key, item in list(value.items()):
+                value[key] = _rewrite(item)
+        elif isinstance(value, ArrayObject):
+            for i, item in enumerate(value):
+                value[i] = _rewrite(item)
+        return value
+
+    for obj in writer._objects:
+        if obj is not None:
+            _rewrite(obj)
+    for idnum in remap:
+        writer._objects[idnum - 1] = NullObject()
+    return len(remap)
 
 
 def make_digits_for_grid(
@@ -352,38 +738,59 @@ def make_digits_for_grid(
 
 
 class _AnchorResolver:
+    """Resolve ``anchor`` items to overlay coordinates.
+
+    Uses the precomputed sidecar index (``anchor_index``) when it is present and
+    matches the PDF; PyMuPDF is only opened for anchors missing from it.
+    """
+
     def __init__(self, base_pdf_path: str, dx: float, dy: float) -> None:
         self._base_pdf_path = base_pdf_path
         self._dx = dx
         self._dy = dy
         self._doc = None
+        self._index = None
+        self._index_loaded = False
 
     def resolve(self, item: dict[str, Any]) -> tuple[int, float, float] | None:
         anchor = item.get("anchor")
         if not anchor:
             return None
-        doc = self._ensure_document()
         page_index = int(anchor.get("page", item.get("page", 0)))
-        if page_index < 0 or page_index >= len(doc):
-            return None
-        page = doc[page_index]
         text = str(anchor.get("text", "")).strip()
-        if not text:
-            return None
-        rects = page.search_for(text)
-        if not rects:
+        hits = self._indexed_hits(page_index, text)
+        if hits is None:
+            hits = self._search(page_index, text)
+        if not hits:
             return None
         occurrence = max(1, int(anchor.get("occurrence", 1)))
-        if occurrence > len(rects):
-            occurrence = len(rects)
-        target_rect = rects[occurrence - 1]
-        page_height = float(page.rect.height)
-        x_anchor = float(target_rect.x0)
-        y_anchor_overlay = page_height - float(target_rect.y0)
+        if occurrence > len(hits):
+            occurrence = len(hits)
+        x_anchor, y_anchor_overlay = hits[occurrence - 1]
         x = x_anchor + float(anchor.get("dx", 0.0)) + self._dx
         y = y_anchor_overlay + float(anchor.get("dy", 0.0)) + self._dy
         return page_index, x, y
 
+    def _indexed_hits(self, page_index: int, text: str) -> Sequence[tuple[float, float]] | None:
+        if not self._index_loaded:
+            from .anchor_index import load_anchor_index
+
+            self._index = load_anchor_index(self._base_pdf_path)
+            self._index_loaded = True
+        if self._index is None:
+            return None
+        if page_index < 0 or page_index >= self._index.page_count or not text:
+            return ()
+        return self._index.lookup(page_index, text)
+
+    def _search(self, page_index: int, text: str) -> list[tuple[float, float]]:
+        doc = self._ensure_document()
+        if page_index < 0 or page_index >= len(doc) or not text:
+            return []
+        page = doc[page_index]
+        page_height = float(page.rect.height)
+        return [(float(r.x0), page_height - float(r.y0)) for r in page.search_for(text)]
+
     def _ensure_document(self):
         if self._doc is None:
             try:
@@ -408,124 +815,157 @@ def _resolve_offsets(template: dict[str, Any]) -> tuple[float, float]:
     return dx, dy
 
 
-def _build_text_specs(
-    template: dict[str, Any],
-    context: dict[str, Any],
-    resolver: _AnchorResolver,
-    dx: float,
-    dy: float,
-) -> list[TextSpec]:
-    specs: list[TextSpec] = []
-    for config in template.get("texts", []):
-        text_value = _resolve_value(config.get("text", ""), context)
-        font_name = config.get("font", "Helvetica")
-        font_size = float(config.get("size", 10))
-        anchor = resolver.resolve(config)
-        if anchor is not None:
-            page_index, x_pos, y_pos = anchor
-        else:
-            page_index = int(config.get("page", 0))
-            x_pos = float(config.get("x", 0.0)) + dx
-            y_pos = float(config.get("y", 0.0)) + dy
-        specs.append(
-            TextSpec(
-                page=page_index,
-                x=x_pos,
-                y=y_pos,
-                text=str(text_value),
-                font_name=font_name,
-                font_size=font_size,
+class _Accessor(NamedTuple):
+    """A template value: a literal, or a ``{{ a.b.c }}`` path split once at compile time."""
+
+    path: tuple[str, ...] | None
+    literal: Any = None
+
+    def __call__(self, ctx: Any) -> Any:
+        if self.path is None:
+            return self.literal
+        cur = ctx
+        for part in self.path:
+            if isinstance(cur, dict):
+                cur = cur.get(part)
+            else:
+                cur = getattr(cur, part, None)
+            if cur is None:
+                break
+        return cur
+
+
+def _compile_value(expr: Any) -> _Accessor:
+    if expr is None or isinstance(expr, (int, float)):
+        return _Accessor(None, expr)
+    s = str(expr).strip()
+    if s.startswith("{{") and s.endswith("}}"):  # mustache-ish
+        return _Accessor(tuple(p for p in s[2:-2].strip().split(".") if p))
+    return _Accessor(None, expr)
+
+
+class _TextOp(NamedTuple):
+    value: _Accessor
+    page: int
+    x: float
+    y: float
+    font_name: str
+    font_size: float
+
+
+class _GridOp(NamedTuple):
+    value: _Accessor
+    thousand_separators: bool
+    fields: dict[str, Any]  # GridSpec keyword arguments, positions already resolved
+
+
+class TemplateProgram(NamedTuple):
+    """``overlay_with_template`` template compiled against one base PDF.
+
+    Offsets, anchors and numeric fields are resolved at compile time; running
+    the program against a context only looks values up and builds specs.
+    """
+
+    font_registrations: dict[str, str]
+    texts: tuple[_TextOp, ...]
+    grids: tuple[_GridOp, ...]
+
+    def run(self, context: dict[str, Any]) -> tuple[list[TextSpec], list[GridSpec]]:
+        texts = [
+            TextSpec(op.page, op.x, op.y, str(op.value(context)), op.font_name, op.font_size)
+            for op in self.texts
+        ]
+        grids: list[GridSpec] = []
+        for op in self.grids:
+            raw_value = op.value(context)
+            try:
+                normalized_value = int(raw_value) if raw_value is not None and str(raw_value) != "" else None
+            except Exception:
+                normalized_value = None
+            spec = GridSpec(**op.fields)
+            spec.digits, spec.is_negative = make_digits_for_grid(
+                normalized_value, thousand_separators=op.thousand_separators
             )
-        )
-    return specs
+            grids.append(spec)
+        return texts, grids
 
 
-def _build_grid_specs(
-    template: dict[str, Any],
-    context: dict[str, Any],
-    resolver: _AnchorResolver,
-    dx: float,
-    dy: float,
-) -> list[GridSpec]:
-    specs: list[GridSpec] = []
-    for config in template.get("grids", []):
-        raw_value = _resolve_value(config.get("value"), context)
-        try:
-            normalized_value = int(raw_value) if raw_value is not None and str(raw_value) != "" else None
-        except Exception:
-            normalized_value = None
-        digits, is_negative = make_digits_for_grid(
-            normalized_value,
-            thousand_separators=bool(config.get("thousand_separators", False)),
-        )
-        anchor = resolver.resolve(config)
-        if anchor is not None:
-            page_index, x0, y0 = anchor
-        else:
-            page_index = int(config.get("page", 0))
-            x0 = float(config.get("x0", 0.0)) + dx
-            y0 = float(config.get("y0", 0.0)) + dy
-        spec = GridSpec(
+def _position(resolver: _AnchorResolver, config: dict[str, Any], x_key: str, y_key: str, dx: float, dy: float) -> tuple[int, float, float]:
+    anchor = resolver.resolve(config)
+    if anchor is not None:
+        return anchor
+    return int(config.get("page", 0)), float(config.get(x_key, 0.0)) + dx, float(config.get(y_key, 0.0)) + dy
+
+
+def compile_template(template: dict[str, Any], base_pdf_path: str) -> TemplateProgram:
+    """Compile a template dict; anchors are searched in ``base_pdf_path`` here, once."""
+    dx, dy = _resolve_offsets(template)
+    resolver = _AnchorResolver(base_pdf_path, dx, dy)
+    texts = []
+    for config in template.get("texts", []):
+        page_index, x_pos, y_pos = _position(resolver, config, "x", "y", dx, dy)
+        texts.append(_TextOp(
+            value=_compile_value(config.get("text", "")),
             page=page_index,
-            x0=x0,
-            y0=y0,
-            box_width=float(config["box_width"]),
-            box_count=int(config["box_count"]),
+            x=x_pos,
+            y=y_pos,
             font_name=config.get("font", "Helvetica"),
             font_size=float(config.get("size", 10)),
-            y_offset=float(config.get("y_offset", 0.0)),
-            rtl=bool(config.get("rtl", True)),
-            thousand_separators=bool(config.get("thousand_separators", False)),
-            fill_char=config.get("fill_char"),
-            negative_mark=config.get("neg_mark"),
-        )
-        spec.digits = digits
-        spec.is_negative = is_negative
-        specs.append(spec)
-    return specs
+        ))
+    grids = []
+    for config in template.get("grids", []):
+        page_index, x0, y0 = _position(resolver, config, "x0", "y0", dx, dy)
+        thousand_separators = bool(config.get("thousand_separators", False))
+        grids.append(_GridOp(
+            value=_compile_value(config.get("value")),
+            thousand_separators=thousand_separators,
+            fields=dict(
+                page=page_index,
+                x0=x0,
+                y0=y0,
+                box_width=float(config["box_width"]),
+                box_count=int(config["box_count"]),
+                font_name=config.get("font", "Helvetica"),
+                font_size=float(config.get("size", 10)),
+                y_offset=float(config.get("y_offset", 0.0)),
+                rtl=bool(config.get("rtl", True)),
+                thousand_separators=thousand_separators,
+                fill_char=config.get("fill_char"),
+                negative_mark=config.get("neg_mark"),
+            ),
+        ))
+    return TemplateProgram(_extract_font_registrations(template), tuple(texts), tuple(grids))
+
+
+def load_template_program(template_path: str, base_pdf_path: str) -> TemplateProgram:
+    """Compile the template JSON at ``template_path``, cached until either file changes."""
+    import json
+
+    def _load() -> TemplateProgram:
+        with open(template_path, encoding="utf-8") as fh:
+            return compile_template(json.load(fh), base_pdf_path)
+
+    return template_cache.template_program(template_path, base_pdf_path, _load)
+
 
 def overlay_with_template(
     base_pdf_path: str,
-    output_pdf_path: str,
-    template: dict[str, Any],
+    output_pdf_path: PdfOutput,
+    template: dict[str, Any] | TemplateProgram,
     context: dict[str, Any],
 ) -> None:
-    dx, dy = _resolve_offsets(template)
-    font_registrations = _extract_font_registrations(template)
-    resolver = _AnchorResolver(base_pdf_path, dx, dy)
+    """Render ``template`` filled from ``context``.
 
-    text_specs = _build_text_specs(template, context, resolver, dx, dy)
-    grid_specs = _build_grid_specs(template, context, resolver, dx, dy)
+    ``template`` may be a raw dict (compiled on every call) or a program from
+    ``compile_template`` / ``load_template_program`` for repeated use.
+    """
+    program = template if isinstance(template, TemplateProgram) else compile_template(template, base_pdf_path)
+    text_specs, grid_specs = program.run(context)
 
     overlay_pdf(
         base_pdf_path,
         output_pdf_path,
         texts=text_specs,
         grids=grid_specs,
-        font_registrations=font_registrations,
+        font_registrations=program.font_registrations,
     )
-
-
-def _resolve_value(expr: Any, ctx: dict[str, Any]) -> Any:
-    if expr is None:
-        return None
-    if isinstance(expr, (int, float)):
-        return expr
-    s = str(expr).strip()
-    if s.startswith("{{") and s.endswith("}}"):  # mustache-ish
-        path = s[2:-2].strip()
-        return _dig(ctx, path)
-    return expr
-
-
-def _dig(obj: Any, path: str) -> Any:
-    parts = [p for p in path.split(".") if p]
-    cur = obj
-    for p in parts:
-        if isinstance(cur, dict):
-            cur = cur.get(p)
-        else:
-            cur = getattr(cur, p, None)
-        if cur is None:
-            break
-    return cur
@@ -0,0 +1,145 @@
+"""Process-wide cache for PDF template assets.
+
+Statement PDFs are rendered from a small, fixed set of templates
+(``resources/pdf_forms/<form>/<year>/source.pdf`` plus
+``resources/pdf_templates/<form>/<year>_geometry.json`` and compiled
+``overlay_with_template`` programs). Parsing the base PDF
+and re-validating the geometry on every request dominates render time, so the
+parsed results are kept here keyed by file path (which encodes form and year)
+and the file's mtime/size. Editing a template file therefore invalidates its
+entry automatically; ``clear_template_cache()`` drops everything explicitly.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+
+class BaseReaderEntry(NamedTuple):
+    """A parsed base PDF.
+
+    ``lock`` must be held while reading pages from ``reader``; pypdf resolves
+    objects lazily from a shared stream and is not safe for concurrent reads.
+    """
+
+    path: str
+    reader: Any
+    lock: threading.RLock
+
+
+def _file_signature(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class TemplateAssetCache:
+    def __init__(self, max_entries: int = 64) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        self._fonts: set[tuple[str, str, tuple[int, int] | None]] = set()
+        self._loading: dict[tuple, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_or_load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        # Load outside the cache-wide lock so a cold template does not block hits
+        # on other keys; concurrent misses on the same key wait for one loader.
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+                self.misses += 1
+            try:
+                value = loader()
+                with self._lock:
+                    self._entries[key] = value
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+                return value
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is key_lock:
+                        del self._loading[key]
+
+    def base_reader(self, path: str) -> BaseReaderEntry:
+        """Return the parsed ``PdfReader`` for ``path`` (shared across requests)."""
+        abspath = os.path.abspath(path)
+
+        def _load() -> BaseReaderEntry:
+            from pypdf import PdfReader
+
+            return BaseReaderEntry(abspath, PdfReader(abspath), threading.RLock())
+
+        return self._get_or_load(('pdf', abspath, _file_signature(abspath)), _load)
+
+    def geometry(self, path: str, *, validate: bool, loader: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """Return validated geometry for ``path``; callers get their own copy."""
+        abspath = os.path.abspath(path)
+        cached = self._get_or_load(('geometry', abspath, validate, _file_signature(abspath)), loader)
+        return copy.deepcopy(cached)
+
+    def template_program(self, template_path: str, base_pdf_path: str, loader: Callable[[], Any]) -> Any:
+        """Return the compiled program for a template/base PDF pair (immutable, shared)."""
+        template_abs = os.path.abspath(template_path)
+        base_abs = os.path.abspath(base_pdf_path)
+        key = ('program', template_abs, _file_signature(template_abs), base_abs, _file_signature(base_abs))
+        return self._get_or_load(key, loader)
+
+    def anchor_index(self, base_pdf_path: str, sidecar_path: str, loader: Callable[[], Any]) -> Any:
+        """Return the anchor index for a base PDF (None is cached too, until either file changes)."""
+        base_abs = os.path.abspath(base_pdf_path)
+        sidecar_abs = os.path.abspath(sidecar_path)
+        key = ('anchors', base_abs, _file_signature(base_abs), _file_signature(sidecar_abs))
+        return self._get_or_load(key, loader)
+
+    def is_font_registered(self, name: str, path: str) -> bool:
+        with self._lock:
+            return (name, path, _file_signature(path)) in self._fonts
+
+    def mark_font_registered(self, name: str, path: str) -> None:
+        with self._lock:
+            self._fonts.add((name, path, _file_signature(path)))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'fonts': len(self._fonts),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+template_cache = TemplateAssetCache()
+
+
+def get_template_cache_stats() -> dict[str, int]:
+    return template_cache.stats()
+
+
+def clear_template_cache() -> None:
+    """Invalidate cached base PDFs, geometry and font registrations."""
+    template_cache.clear()
@@ -0,0 +1,229 @@
+"""Batch text measurement for PDF overlays.
+
+``pdfmetrics.stringWidth`` walks the string in Python on every call, and the
+fitting helpers used to call it once per candidate prefix (quadratic) or per
+candidate font size. Here each font's glyph advances live in a NumPy table
+indexed by code point, built once per registered font from the TTF cmap
+widths, so widths, ellipsis cut points and fitted sizes for a whole column of
+strings come from one vectorised pass over the concatenated code points.
+
+Widths match ``pdfmetrics.stringWidth`` (advances are additive; reportlab
+applies no kerning). Fonts that are not registered fall back to the
+``len(text) * size * 0.55`` heuristic used by the PDF generators.
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+from reportlab.pdfbase import pdfmetrics
+
+ELLIPSIS = "…"
+FALLBACK_ADVANCE = 550.0  # 1/1000 em; same as the 0.55 * size heuristic
+
+_BMP_SIZE = 0x10000
+
+
+class GlyphAdvances:
+    """Advance widths (1/1000 em) of one font, looked up by code point."""
+
+    def __init__(self, font_name: str, font=None) -> None:
+        self.font_name = font_name
+        self._font = font
+        self._lock = threading.Lock()
+        self._astral: dict[int, float] = {}
+        self._table = np.full(_BMP_SIZE, np.nan if font is not None else FALLBACK_ADVANCE, dtype=np.float64)
+        face = getattr(font, 'face', None)
+        char_widths = getattr(face, 'charWidths', None)
+        if char_widths is not None:
+            # TrueType: the whole cmap is known up front
+            self._table[:] = float(face.defaultWidth)
+            cps = np.fromiter(char_widths.keys(), dtype=np.int64, count=len(char_widths))
+            widths = np.fromiter(char_widths.values(), dtype=np.float64, count=len(char_widths))
+            in_bmp = cps < _BMP_SIZE
+            self._table[cps[in_bmp]] = widths[in_bmp]
+            self._astral = {int(cp): float(w) for cp, w in zip(cps[~in_bmp], widths[~in_bmp])}
+            self._astral_default = float(face.defaultWidth)
+        else:
+            self._astral_default = None
+
+    def _measure(self, cp: int) -> float:
+        if self._font is None:
+            return FALLBACK_ADVANCE
+        try:
+            return float(pdfmetrics.stringWidth(chr(cp), self.font_name, 1000.0))
+        except Exception:
+            return FALLBACK_ADVANCE
+
+    def advances(self, codepoints: np.ndarray) -> np.ndarray:
+        in_bmp = codepoints < _BMP_SIZE
+        idx = np.where(in_bmp, codepoints, 0)
+        adv = self._table[idx]
+        missing = np.isnan(adv)
+        if missing.any():
+            # Type1 / CID fonts: measure each new character once, then remember it
+            with self._lock:
+                for cp in np.unique(idx[missing]).tolist():
+                    self._table[cp] = self._measure(cp)
+            adv = self._table[idx]
+        if not in_bmp.all():
+            out_idx = np.flatnonzero(~in_bmp)
+            for i, cp in zip(out_idx.tolist(), codepoints[out_idx].tolist()):
+                width = self._astral.get(cp)
+                if width is None:
+                    width = self._astral_default if self._astral_default is not None else self._measure(cp)
+                adv[i] = width
+        return adv
+
+
+_tables: dict[tuple[str, int], GlyphAdvances] = {}
+_tables_lock = threading.Lock()
+
+
+def glyph_advances(font_name: str) -> GlyphAdvances:
+    """Return the advance table for ``font_name`` (rebuilt if the font is re-registered)."""
+    try:
+        font = pdfmetrics.getFont(font_name)
+    except Exception:
+        # Not registered (yet): do not cache, so registration later takes effect
+        return GlyphAdvances(font_name, None)
+    key = (font_name, id(font))
+    table = _tables.get(key)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None:
+                table = GlyphAdvances(font_name, font)
+                _tables[key] = table
+    return table
+
+
+def clear_glyph_advance_cache() -> None:
+    with _tables_lock:
+        _tables.clear()
+
+
+class _Column(NamedTuple):
+    """Concatenated code points of a list of strings with running advance sums."""
+
+    texts: list[str]
+    starts: np.ndarray  # offset of each string in ``cum``
+    lengths: np.ndarray
+    cum: np.ndarray  # cum[k] = advance of the first k characters overall, 1/1000 em
+
+    def totals(self) -> np.ndarray:
+        return self.cum[self.starts + self.lengths] - self.cum[self.starts]
+
+
+def _column(texts: Sequence[str], font_name: str) -> _Column:
+    texts = [str(t) if t is not None else "" for t in texts]
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    starts = np.zeros(len(texts), dtype=np.int64)
+    if len(texts) > 1:
+        np.cumsum(lengths[:-1], out=starts[1:])
+    codepoints = np.frombuffer("".join(texts).encode("utf-32-le"), dtype="<u4").astype(np.int64)
+    cum = np.zeros(len(codepoints) + 1, dtype=np.float64)
+    if len(codepoints):
+        np.cumsum(glyph_advances(font_name).advances(codepoints), out=cum[1:])
+    return _Column(texts, starts, lengths, cum)
+
+
+def string_widths(texts: Sequence[str], font_name: str, font_size: float | np.ndarray) -> np.ndarray:
+    """Widths in points of every string; ``font_size`` may be a scalar or per-string array."""
+    return _column(texts, font_name).totals() * (np.asarray(font_size, dtype=np.float64) * 0.001)
+
+
+def string_width(text: str, font_name: str, font_size: float) -> float:
+    return float(string_widths([text], font_name, font_size)[0])
+
+
+def _ellipsize_column(col: _Column, rows: np.ndarray, font_name: str, font_size: float, max_width: float, ellipsis: str) -> list[str]:
+    scale = font_size * 0.001
+    ell_units = float(_column([ellipsis], font_name).totals()[0])
+    if ell_units * scale > max_width:
+        return ["" for _ in rows]
+    starts = col.starts[rows]
+    lengths = col.lengths[rows]
+    base = col.cum[starts]
+    fits = (col.cum[starts + lengths] - base) * scale <= max_width
+    # Longest prefix k with (prefix + ellipsis) * scale <= max_width; cum is non-decreasing
+    limit = base + (max_width / scale - ell_units) if scale > 0 else np.full(len(rows), np.inf)
+    keep = np.searchsorted(col.cum, limit, side="right") - 1 - starts
+    keep = np.clip(keep, 0, lengths)
+    out: list[str] = []
+    for row, ok, k in zip(rows.tolist(), fits.tolist(), keep.tolist()):
+        text = col.texts[row]
+        out.append(text if ok else text[:k] + ellipsis)
+    return out
+
+
+def ellipsize_many(
+    texts: Sequence[str],
+    font_name: str,
+    font_size: float,
+    max_width: float,
+    *,
+    ellipsis: str = ELLIPSIS,
+) -> list[str]:
+    """Truncate each string so that it (plus ``ellipsis`` when cut) fits ``max_width``."""
+    col = _column(texts, font_name)
+    return _ellipsize_column(col, np.arange(len(col.texts)), font_name, font_size, max_width, ellipsis)
+
+
+def fit_many(
+    texts: Sequence[str],
+    font_name: str,
+    start_size: float,
+    min_size: float,
+    max_width: float,
+    *,
+    step: float = 1.0,
+    ellipsis: str = ELLIPSIS,
+) -> list[tuple[str, float]]:
+    """Largest size in ``start_size, start_size - step, ... >= min_size`` at which each string fits.
+
+    Strings that do not fit even at ``min_size`` are ellipsized at ``min_size``.
+    """
+    col = _column(texts, font_name)
+    sizes: list[float] = []
+    size = start_size
+    while size >= min_size:
+        sizes.append(size)
+        size -= step
+    if not col.texts:
+        return []
+    results: list[tuple[str, float] | None] = [None] * len(col.texts)
+    if sizes:
+        widths_1pt = col.totals() * 0.001
+        ok = widths_1pt[:, None] * np.asarray(sizes)[None, :] <= max_width
+        fitted = ok.any(axis=1)
+        first = ok.argmax(axis=1)
+        for row in np.flatnonzero(fitted).tolist():
+            results[row] = (col.texts[row], sizes[first[row]])
+        overflow = np.flatnonzero(~fitted)
+    else:
+        overflow = np.arange(len(col.texts))
+    if len(overflow):
+        cut = _ellipsize_column(col, overflow, font_name, min_size, max_width, ellipsis)
+        for row, text in zip(overflow.tolist(), cut):
+            results[row] = (text, min_size)
+    return results  # type: ignore[return-value]
+
+
+def wrap_to_width(text: str, font_name: str, font_size: float, max_width: float) -> list[str]:
+    """Greedy per-character line breaking; a character wider than ``max_width`` gets its own line."""
+    if not text:
+        return []
+    col = _column([text], font_name)
+    cum = col.cum
+    limit = max_width / (font_size * 0.001) if font_size > 0 else np.inf
+    lines: list[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        j = int(np.searchsorted(cum, cum[i] + limit, side="right")) - 1
+        j = min(max(j, i + 1), n)
+        lines.append(text[i:j])
+        i = j
+    return lines
@@ -19,7 +19,7 @@ from .layout_utils import (
     center_from_baseline,
     load_geometry,
 )
-from .pdf_fill import TextSpec
+from .pdf_fill import PdfOutput, TextSpec
 
 
 def _format_currency(n: int | None) -> str:
@@ -150,7 +150,7 @@ def _append_page_total(
         right_margin=right_margin,
     )
 
-def generate_uchiwakesyo_kaikakekin(company_id: int | None, year: str = "2025", *, output_path: str) -> str:
+def generate_uchiwakesyo_kaikakekin(company_id: int | None, year: str = "2025", *, output_path: PdfOutput) -> PdfOutput:
     """買掛金（未払金・未払費用）内訳書 PDF を生成する。"""
     company_id = _resolve_company_id(company_id)
     repo_root = _resolve_repo_root()
@@ -18,7 +18,7 @@ from .layout_utils import (
     center_from_baseline,
     prepare_pdf_assets,
 )
-from .pdf_fill import TextSpec
+from .pdf_fill import PdfOutput, TextSpec
 
 
 class TableLayout(NamedTuple):
@@ -502,8 +502,8 @@ def generate_uchiwakesyo_karibaraikin_kashitukekin(
     company_id: int | None,
     year: str = "2025",
     *,
-    output_path: str,
-) -> str:
+    output_path: PdfOutput,
+) -> PdfOutput:
     """
     Generate '仮払金（前渡金・貸付金）内訳書' PDF overlay for the given company.
     Upper zone: TemporaryPayment / Lower zone: LoansReceivable
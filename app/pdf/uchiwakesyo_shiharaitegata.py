@@ -18,7 +18,7 @@ from .layout_utils import (
     center_from_baseline,
     prepare_pdf_assets,
 )
-from .pdf_fill import TextSpec
+from .pdf_fill import PdfOutput, TextSpec
 
 
 class NotesLayout(NamedTuple):
@@ -276,8 +276,8 @@ def generate_uchiwakesyo_shiharaitegata(
     company_id: int | None,
     year: str = "2025",
     *,
-    output_path: str,
-) -> str:
+    output_path: PdfOutput,
+) -> PdfOutput:
     """
     支払手形の内訳書 PDF オーバレイを生成して output_path に書き込み、そのパスを返す。
     """
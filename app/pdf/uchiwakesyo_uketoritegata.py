@@ -19,7 +19,7 @@ from .layout_utils import (
     center_from_baseline,
     prepare_pdf_assets,
 )
-from .pdf_fill import TextSpec
+from .pdf_fill import PdfOutput, TextSpec
 
 
 class ReceivableLayout(NamedTuple):
@@ -321,8 +321,8 @@ def generate_uchiwakesyo_uketoritegata(
     company_id: int | None,
     year: str = "2025",
     *,
-    output_path: str,
-) -> str:
+    output_path: PdfOutput,
+) -> PdfOutput:
     """
     Generate '受取手形の内訳書' PDF overlay for the given company.
     Writes to output_path and returns it.
@@ -16,7 +16,7 @@ from .layout_utils import (
     center_from_row1,
     load_geometry,
 )
-from .pdf_fill import TextSpec, overlay_pdf
+from .pdf_fill import PdfOutput, TextSpec, overlay_pdf
 
 
 def _format_currency(n: int | None) -> str:
@@ -29,7 +29,7 @@ def _load_geometry(repo_root: str, year: str):
     return _lg("uchiwakesyo_yocyokin", year, repo_root=repo_root, required=True, validate=True)
 
 
-def generate_uchiwakesyo_yocyokin(company_id: int | None, year: str = "2025", *, output_path: str) -> str:
+def generate_uchiwakesyo_yocyokin(company_id: int | None, year: str = "2025", *, output_path: PdfOutput) -> PdfOutput:
     """
     Generate '預貯金等の内訳書' PDF overlay for the given company.
     Writes to output_path and returns it.
@@ -23,7 +23,13 @@ class SoAProgressEvaluator:
 
         batch = SoADifferenceBatch.current(company_id)
         if batch is not None:
-            return batch.get(page)
+            evaluation = batch.get(page)
+            breakdown_total = int(evaluation.difference.get('breakdown_total', 0) or 0)
+            return {
+                'difference': int(evaluation.difference.get('difference', 0) or 0),
+                'source_total': int(evaluation.skip_total or 0),
+                'breakdown_total': breakdown_total,
+            }
 
         cfg = STATEMENT_PAGES_CONFIG.get(page) or {}
         model = cfg.get('model')
@@ -0,0 +1,165 @@
+"""Render every registered statement PDF for a company into one bookmarked bundle.
+
+Data access and layout run in the calling process (each generator is invoked
+with an ``OverlayCapture`` sink, which records its texts/grids/rectangles
+instead of rendering). Only the captured, DB-free ``OverlayJob``s are sent to
+a worker process pool for the reportlab/pypdf work, and the resulting PDFs
+are concatenated in order with one outline entry per statement.
+
+Jobs are split into one contiguous chunk per worker and each chunk is drawn
+as a single overlay document, so every font is embedded once per chunk rather
+than once per statement; byte-identical streams (e.g. the same font program
+in two base forms) are collapsed when the bundle is written.
+"""
+from __future__ import annotations
+
+import codecs
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, NamedTuple
+
+from app.pdf.beppyou_02 import generate_beppyou_02
+from app.pdf.pdf_fill import (
+    OverlayCapture,
+    OverlayJob,
+    PdfOutput,
+    _write_pdf,
+    dedupe_identical_streams,
+    render_overlay_jobs,
+)
+from app.services.pdf_registry import STATEMENT_PDF_GENERATORS
+from app.services.soa_registry import STATEMENT_PAGES_CONFIG
+
+# Forms rendered ahead of the 内訳書 that are not part of the SoA registry.
+BUNDLE_EXTRA_FORMS: tuple[tuple[str, str, Callable[..., Any]], ...] = (
+    ('beppyou_02', '別表二 同族会社等の判定に関する明細書', generate_beppyou_02),
+)
+
+
+class BundleSection(NamedTuple):
+    key: str
+    title: str
+    jobs: list[OverlayJob]
+
+
+def _bundle_generators() -> list[tuple[str, str, Callable[..., Any]]]:
+    """(key, title, generator) in bundle order; pages sharing a generator appear once."""
+    entries = list(BUNDLE_EXTRA_FORMS)
+    by_generator: dict[Any, int] = {}
+    for page_key, config in STATEMENT_PDF_GENERATORS.items():
+        title = STATEMENT_PAGES_CONFIG.get(page_key, {}).get('title', page_key)
+        index = by_generator.get(config.generator)
+        if index is not None:
+            key, prev_title, generator = entries[index]
+            entries[index] = (key, f"{prev_title}・{title}", generator)
+            continue
+        by_generator[config.generator] = len(entries)
+        entries.append((page_key, title, config.generator))
+    return entries
+
+
+def collect_bundle_sections(company_id: int, year: str) -> list[BundleSection]:
+    """Run every generator's data collection and layout (requires an app context)."""
+    sections: list[BundleSection] = []
+    for key, title, generator in _bundle_generators():
+        capture = OverlayCapture()
+        generator(company_id=company_id, year=year, output_path=capture)
+        sections.append(BundleSection(key=key, title=title, jobs=capture.jobs))
+    return sections
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """The process-wide pool, created once with ``workers`` processes and reused by every bundle.
+
+    Spawned workers re-import the app and register fonts, so the pool is never
+    resized or recreated per request; each request only chooses its chunk count.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: the web process may be multi-threaded, which makes fork unsafe.
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def default_bundle_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def _chunks(jobs: Sequence[OverlayJob], count: int) -> list[list[OverlayJob]]:
+    size, extra = divmod(len(jobs), count)
+    chunks, start = [], 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        if end > start:
+            chunks.append(list(jobs[start:end]))
+        start = end
+    return chunks
+
+
+def _render_chunk(jobs: list[OverlayJob]) -> tuple[bytes, list[int]]:
+    buffer = BytesIO()
+    page_counts = render_overlay_jobs(jobs, buffer)
+    return buffer.getvalue(), page_counts
+
+
+def render_bundle_jobs(jobs: Sequence[OverlayJob], *, workers: int | None = None) -> list[tuple[bytes, list[int]]]:
+    """Render jobs in order as ``(pdf, page count per job)`` chunks; ``workers <= 1`` renders in-process."""
+    if workers is None:
+        workers = default_bundle_workers()
+    chunks = _chunks(jobs, max(1, min(workers, len(jobs))))
+    if len(chunks) <= 1:
+        return [_render_chunk(chunk) for chunk in chunks]
+    return list(_get_executor(workers).map(_render_chunk, chunks))
+
+
+def _add_bookmark(writer: Any, title: str, page_number: int) -> None:
+    from pypdf.generic import NameObject
+
+    item = writer.add_outline_item(title, page_number).get_object()
+    text = item[NameObject('/Title')]
+    # pypdf 4.x は非PDFDocEncoding の文字列をBOMなしUTF-16BEで書き出すため、ビューアで文字化けする
+    if getattr(text, 'autodetect_utf16', False) and not text.utf16_bom:
+        text.utf16_bom = codecs.BOM_UTF16_BE
+
+
+def merge_bundle(sections: Sequence[BundleSection], rendered: Sequence[tuple[bytes, list[int]]], output: PdfOutput) -> None:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    job_pages: list[int] = []
+    for data, page_counts in rendered:
+        writer.append(BytesIO(data))
+        job_pages.extend(page_counts)
+    first_page = 0
+    counts = iter(job_pages)
+    for section in sections:
+        pages = sum(next(counts) for _job in section.jobs)
+        if pages:
+            _add_bookmark(writer, section.title, first_page)
+        first_page += pages
+    dedupe_identical_streams(writer)
+    _write_pdf(writer, output)
+
+
+def generate_statement_bundle(
+    company_id: int,
+    year: str,
+    *,
+    output_path: PdfOutput,
+    workers: int | None = None,
+) -> PdfOutput:
+    """Generate 別表二 and all registered 内訳書 for ``company_id`` as one PDF."""
+    sections = collect_bundle_sections(company_id, year)
+    jobs = [job for section in sections for job in section.jobs]
+    rendered = render_bundle_jobs(jobs, workers=workers)
+    merge_bundle(sections, rendered, output_path)
+    return output_path
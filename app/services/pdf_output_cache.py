@@ -0,0 +1,166 @@
+"""Content-addressed cache of rendered Statement of Accounts PDFs.
+
+A rendered PDF is identified by ``(page_key, year, rows digest, template
+version)``. The rows digest hashes every row the generator reads (the SoA
+models listed in ``StatementPDFConfig.source_pages``), so any data change
+yields a new key even when it bypasses ``StatementOfAccountsService``. The
+same key doubles as the HTTP ETag, letting browsers revalidate with a single
+SELECT per source model and no rendering.
+
+Entries live in-process and are bounded by total byte size; the service layer
+evicts a company's entries eagerly on create/update/delete.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+
+from app.extensions import db
+from app.services.pdf_registry import STATEMENT_PDF_GENERATORS, get_statement_pdf_config
+from app.services.soa_registry import STATEMENT_PAGES_CONFIG
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+_TEMPLATE_DIRS = (
+    'resources/pdf_forms',
+    'resources/pdf_templates',
+    'app/pdf',
+)
+
+
+@lru_cache(maxsize=1)
+def _template_fingerprint() -> str:
+    """Hash of template files and PDF code as deployed (computed once per process)."""
+    digest = hashlib.sha256()
+    for rel_dir in _TEMPLATE_DIRS:
+        base = os.path.join(_REPO_ROOT, rel_dir)
+        for root, _dirs, files in sorted(os.walk(base)):
+            for name in sorted(files):
+                if name.endswith('.pyc'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                digest.update(f"{os.path.relpath(path, _REPO_ROOT)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def template_version(extra: str | None = None) -> str:
+    """Template version used in cache keys; ``extra`` allows a manual bump via config."""
+    return f"{_template_fingerprint()}:{extra or ''}"
+
+
+def _rows_digest(company_id: int, source_pages: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for page_key in sorted(set(source_pages)):
+        model = STATEMENT_PAGES_CONFIG.get(page_key, {}).get('model')
+        if model is None:
+            continue
+        columns = list(model.__table__.columns)
+        rows = (
+            db.session.query(*columns)
+            .filter(model.company_id == company_id)
+            .order_by(model.id.asc())
+            .all()
+        )
+        digest.update(page_key.encode())
+        for row in rows:
+            digest.update(repr(tuple(row)).encode())
+    return digest.hexdigest()
+
+
+def compute_statement_etag(company_id: int, page_key: str, year: str, *, version: str | None = None) -> str | None:
+    """Return the content key (also used as ETag) for a statement PDF, or None if unregistered."""
+    config = get_statement_pdf_config(page_key)
+    if config is None:
+        return None
+    source_pages = config.source_pages or (page_key,)
+    key = '|'.join((
+        page_key,
+        str(year),
+        _rows_digest(company_id, source_pages),
+        template_version(version),
+    ))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def pages_depending_on(data_type: str) -> list[str]:
+    """PDF page keys whose output reads rows of SoA page ``data_type``."""
+    return [
+        page_key
+        for page_key, config in STATEMENT_PDF_GENERATORS.items()
+        if data_type in (config.source_pages or (page_key,))
+    ]
+
+
+class PdfOutputCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[int, str, str], bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, company_id: int, page_key: str, etag: str) -> bytes | None:
+        key = (company_id, page_key, etag)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return data
+
+    def put(self, company_id: int, page_key: str, etag: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        key = (company_id, page_key, etag)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def invalidate(self, company_id: int, page_keys: Iterable[str] | None = None) -> int:
+        targets = set(page_keys) if page_keys is not None else None
+        with self._lock:
+            doomed = [
+                key for key in self._entries
+                if key[0] == company_id and (targets is None or key[1] in targets)
+            ]
+            for key in doomed:
+                self._size -= len(self._entries.pop(key))
+        return len(doomed)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self._size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+pdf_output_cache = PdfOutputCache()
+
+
+def invalidate_statement_pdfs(company_id: int, data_type: str | None = None) -> int:
+    """Drop cached PDFs of ``company_id`` affected by a change to ``data_type`` (all when None)."""
+    page_keys = pages_depending_on(data_type) if data_type else None
+    return pdf_output_cache.invalidate(company_id, page_keys)
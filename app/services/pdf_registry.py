@@ -1,20 +1,31 @@
-"""Registry for Statement of Accounts PDF generators."""
+"""Registry for Statement of Accounts PDF generators.
+
+Generators are called as ``generator(company_id=..., year=..., output_path=...)``
+where ``output_path`` is either a filesystem path or a writable binary stream.
+"""
 from dataclasses import dataclass
-from typing import Callable
+from typing import Any, Callable
+
+# (company_id, year, output_path | binary sink) -> the same output_path
+PDFGenerator = Callable[[int, str, Any], Any]
 @dataclass(frozen=True)
 class StatementPDFConfig:
-    generator: Callable[[int, str, str], str]
+    generator: PDFGenerator
     filename_pattern: str
     download_name_pattern: str
+    # SoA page keys whose rows the generator reads; empty means just its own page.
+    source_pages: tuple[str, ...] = ()
 STATEMENT_PDF_GENERATORS: dict[str, StatementPDFConfig] = {}
-def register_statement_pdf(page_key: str, *, generator: Callable[[int, str, str], str],
-                            filename_pattern: str, download_name_pattern: str | None = None) -> None:
+def register_statement_pdf(page_key: str, *, generator: PDFGenerator,
+                            filename_pattern: str, download_name_pattern: str | None = None,
+                            source_pages: tuple[str, ...] = ()) -> None:
     if download_name_pattern is None:
         download_name_pattern = filename_pattern
     STATEMENT_PDF_GENERATORS[page_key] = StatementPDFConfig(
         generator=generator,
         filename_pattern=filename_pattern,
         download_name_pattern=download_name_pattern,
+        source_pages=tuple(source_pages),
     )
 def get_statement_pdf_config(page_key: str) -> StatementPDFConfig | None:
     return STATEMENT_PDF_GENERATORS.get(page_key)
@@ -32,12 +32,14 @@ register_statement_pdf(
     generator=generate_uchiwakesyo_karibaraikin_kashitukekin,
     filename_pattern='uchiwakesyo_karibaraikin-kashitukekin_{company_id}_{timestamp}.pdf',
     download_name_pattern='uchiwakesyo_karibaraikin-kashitukekin_{year}.pdf',
+    source_pages=('temporary_payments', 'loans_receivable'),
 )
 register_statement_pdf(
     'loans_receivable',
     generator=generate_uchiwakesyo_karibaraikin_kashitukekin,
     filename_pattern='uchiwakesyo_karibaraikin-kashitukekin_{company_id}_{timestamp}.pdf',
     download_name_pattern='uchiwakesyo_karibaraikin-kashitukekin_{year}.pdf',
+    source_pages=('temporary_payments', 'loans_receivable'),
 )
 register_statement_pdf(
     'notes_payable',
@@ -16,6 +16,35 @@ class Config:
     SOA_MARK_ON_GET = _os.getenv('SOA_MARK_ON_GET', 'true').lower() == 'true'
     # POST成功時に完了マーク（既定True）
     SOA_MARK_ON_POST = _os.getenv('SOA_MARK_ON_POST', 'true').lower() == 'true'
+
+    # ---- PDF output ----
+    # 既定ではPDFをメモリ上で生成してストリーミング返却する。
+    # デバッグ時のみ temporary/filled/ へファイル出力する（クリーンアップは行わない）。
+    PDF_DEBUG_WRITE_FILES = _os.getenv('PDF_DEBUG_WRITE_FILES', 'false').lower() == 'true'
+    # 生成済みPDFのプロセス内キャッシュとETag再検証（明細データ・テンプレートのダイジェストで判定）
+    PDF_OUTPUT_CACHE_ENABLED = _os.getenv('PDF_OUTPUT_CACHE_ENABLED', 'true').lower() == 'true'
+    # テンプレートを手動で無効化したい場合に変更する任意の版数文字列
+    PDF_TEMPLATE_VERSION = _os.getenv('PDF_TEMPLATE_VERSION', '')
+    # 一括PDF（別表二＋全内訳書）の描画ワーカープロセス数。0 はCPU数に合わせて自動、1 はプロセス内で逐次描画
+    PDF_BUNDLE_WORKERS = int(_os.getenv('PDF_BUNDLE_WORKERS', '0'))
+
+    # ---- Journal import ----
+    # 仕訳帳を先頭部分で文字コード・ヘッダー判定し、チャンク単位で勘定科目別合計に集計する（対応パーサーのみ）
+    # この経路では仕訳の月別部分合計（JOURNAL_INCREMENTAL_RECOMPUTE）・仕訳の列ストア・元の科目名ごとの合計
+    # （ACCOUNTING_DATA_REMAP）を保存しない。source_hash は 'stream:' 付きで、DataFrame 経路の値とは比較されない
+    JOURNAL_STREAMING_IMPORT = _os.getenv('JOURNAL_STREAMING_IMPORT', 'false').lower() == 'true'
+    # 仕訳の月別部分合計を保存し、再取込時は内容が変わった月だけを再集計する
+    JOURNAL_INCREMENTAL_RECOMPUTE = _os.getenv('JOURNAL_INCREMENTAL_RECOMPUTE', 'false').lower() == 'true'
+    # 元の科目名ごとの合計を保存し、マッピング変更時は会計データを破棄せずに財務諸表を組み直す
+    ACCOUNTING_DATA_REMAP = _os.getenv('ACCOUNTING_DATA_REMAP', 'false').lower() == 'true'
+    # 科目別残高・内訳書別合計を正規化テーブルにも書き込み（JSON と二重書き込み）、SoA の集計は SQL で行う
+    ACCOUNTING_BALANCE_TABLES = _os.getenv('ACCOUNTING_BALANCE_TABLES', 'false').lower() == 'true'
+    # 会社ごとの最新の会計データの ID をプロセス内でリクエストをまたいで保持する（取込・再計算時に破棄）
+    ACCOUNTING_DATA_LATEST_CACHE = _os.getenv('ACCOUNTING_DATA_LATEST_CACHE', 'false').lower() == 'true'
+
+    # ---- Master data ----
+    # 同期済みマスターのバージョンをプロセス内で保持する秒数（この間は MasterVersion を再照会しない。0 で毎回照会）
+    MASTER_VERSION_TTL_SECONDS = int(_os.getenv('MASTER_VERSION_TTL_SECONDS', '30'))
     """
     アプリケーションの基本設定クラス。
     環境変数から設定を読み込むことを推奨。
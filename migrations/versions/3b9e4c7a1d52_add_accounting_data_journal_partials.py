@@ -0,0 +1,25 @@
+"""Database schema migration: add per-month journal partial sums to accounting data.
+
+Revision ID: 3b9e4c7a1d52
+Revises: 0acb2ed5f912
+Create Date: 2026-10-18 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '3b9e4c7a1d52'
+down_revision = '0acb2ed5f912'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('accounting_data', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('journal_partials', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('accounting_data', schema=None) as batch_op:
+        batch_op.drop_column('journal_partials')
@@ -0,0 +1,25 @@
+"""Database schema migration: add per-original-account totals to accounting data.
+
+Revision ID: 5d2f8a6c0e13
+Revises: 3b9e4c7a1d52
+Create Date: 2026-10-18 11:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '5d2f8a6c0e13'
+down_revision = '3b9e4c7a1d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('accounting_data', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('account_totals', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('accounting_data', schema=None) as batch_op:
+        batch_op.drop_column('account_totals')
@@ -0,0 +1,50 @@
+"""Database schema migration: add normalized accounting balance tables.
+
+Revision ID: 8e4a1f7b2c90
+Revises: 5d2f8a6c0e13
+Create Date: 2026-10-18 15:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '8e4a1f7b2c90'
+down_revision = '5d2f8a6c0e13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('accounting_data', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('normalized_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'accounting_balance',
+        sa.Column('accounting_data_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['accounting_data_id'], ['accounting_data.id'],
+            name='fk_accounting_balance_accounting_data_id', ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('accounting_data_id', 'account_id'),
+    )
+    op.create_table(
+        'accounting_breakdown_total',
+        sa.Column('accounting_data_id', sa.Integer(), nullable=False),
+        sa.Column('breakdown_document', sa.String(length=100), nullable=False),
+        sa.Column('amount', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['accounting_data_id'], ['accounting_data.id'],
+            name='fk_accounting_breakdown_total_accounting_data_id', ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('accounting_data_id', 'breakdown_document'),
+    )
+
+
+def downgrade():
+    op.drop_table('accounting_breakdown_total')
+    op.drop_table('accounting_balance')
+    with op.batch_alter_table('accounting_data', schema=None) as batch_op:
+        batch_op.drop_column('normalized_at')
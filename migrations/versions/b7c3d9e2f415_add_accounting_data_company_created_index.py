@@ -0,0 +1,28 @@
+"""Database schema migration: add (company_id, created_at DESC) index to accounting data.
+
+Revision ID: b7c3d9e2f415
+Revises: 8e4a1f7b2c90
+Create Date: 2026-10-18 16:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b7c3d9e2f415'
+down_revision = '8e4a1f7b2c90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_accounting_data_company_id_created_at',
+        'accounting_data',
+        ['company_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_accounting_data_company_id_created_at', table_name='accounting_data')
@@ -0,0 +1,49 @@
+import random
+import time
+
+import pandas as pd
+
+from app.company.parsers.normalizers import sanitize_amount_series
+
+ROWS = 1_000_000
+
+
+def _legacy_sanitize(series: pd.Series) -> pd.Series:
+    """The seven-pass str.replace sanitizer previously inlined in MoneyForwardParser."""
+    orig = series.astype(str).fillna('').str.strip()
+    mask_paren = orig.str.startswith('(') & orig.str.endswith(')')
+    s = orig
+    s = s.str.replace('[,，]', '', regex=True)
+    s = s.str.replace('[ 　]', '', regex=True)
+    s = s.str.replace('円', '', regex=False)
+    s = s.str.replace('[﹣－−–—‐‑⁻]', '-', regex=True)
+    s = s.str.replace(r'^[▲△]\s*', '-', regex=True)
+    s = s.str.replace('(', '', regex=False).str.replace(')', '', regex=False)
+    s = s.where(~mask_paren, '-' + s)
+    return pd.to_numeric(s, errors='coerce').fillna(0)
+
+
+def _amounts(rows: int, distinct: int) -> pd.Series:
+    rng = random.Random(0)
+    formats = ['{:,}', '{}', '{:,}円', '▲{:,}', '({:,})', '－{}', ' {:,} ', '']
+    values = [rng.choice(formats).format(rng.randint(1, 5_000_000)) for _ in range(distinct)]
+    return pd.Series([values[rng.randrange(distinct)] for _ in range(rows)], dtype=object)
+
+
+def bench_once(label: str, fn, repeat: int = 3) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - t0) / repeat
+    print(f"{label}: {elapsed:.3f}s/run (repeat={repeat})")
+    return elapsed
+
+
+if __name__ == '__main__':
+    for distinct in (20_000, ROWS):
+        series = _amounts(ROWS, distinct)
+        assert sanitize_amount_series(series).equals(_legacy_sanitize(series))
+        print(f"\n{ROWS:,} rows, ~{distinct:,} distinct amounts")
+        legacy = bench_once('legacy 7-pass str.replace', lambda: _legacy_sanitize(series))
+        single = bench_once('sanitize_amount_series   ', lambda: sanitize_amount_series(series))
+        print(f"  speedup: x{legacy / single:.1f}")
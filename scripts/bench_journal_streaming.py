@@ -0,0 +1,45 @@
+import random
+import time
+import tracemalloc
+from io import BytesIO
+
+from werkzeug.datastructures import FileStorage
+
+from app.company.parsers.moneyforward_parser import MoneyForwardParser
+
+HEADER = '取引No.,取引日,借方勘定科目,借方補助科目,借方部門,借方取引先,借方税区分,借方インボイス,借方金額(円),借方金額,貸方勘定科目,貸方補助科目,貸方部門,貸方取引先,貸方金額,摘要'
+ACCOUNTS = ['現金', '普通預金', '売掛金', '買掛金', '売上高', '仕入高', '消耗品費', '旅費交通費', '通信費', '地代家賃']
+
+
+def _journal_csv(rows: int) -> bytes:
+    rng = random.Random(0)
+    lines = [HEADER, '1,2021/04/01,普通預金,,,,,,1000000,1000000,資本金,,,,1000000,期首残高']
+    for i in range(2, rows + 2):
+        amount = f'{rng.randint(1, 500_000):,}'
+        day = f'20{21 + i * 4 // rows}/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}'
+        debit, credit = rng.sample(ACCOUNTS, 2)
+        lines.append(f'{i},{day},{debit},,,取引先{i % 300},課税,,"{amount}","{amount}",{credit},,,,"{amount}",摘要テキスト{i}')
+    return ('\r\n'.join(lines) + '\r\n').encode('cp932')
+
+
+def _file(data: bytes) -> FileStorage:
+    return FileStorage(stream=BytesIO(data), filename='journals.csv')
+
+
+def bench_once(label: str, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()  # traced separately: tracemalloc itself slows pandas down considerably
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label}: {elapsed:.2f}s, peak {peak / 2**20:.1f} MiB (excluding the upload bytes)")
+
+
+if __name__ == '__main__':
+    for rows in (50_000, 200_000):
+        data = _journal_csv(rows)
+        print(f"\n{rows} rows, {len(data) / 2**20:.1f} MiB cp932")
+        bench_once('dataframe (get_journals)', lambda: MoneyForwardParser(_file(data)).get_journals())
+        bench_once('streaming (get_journal_totals)', lambda: MoneyForwardParser(_file(data), streaming=True).get_journal_totals())
@@ -0,0 +1,47 @@
+import random
+import time
+
+from thefuzz import process
+
+from app.company.services.mapping_suggester import MappingSuggester
+
+CHARS = '現金普通預当座売掛買上高仕入消耗品費旅交通信地代家賃未払用雑収損益税公課支手数料'
+
+
+def _normalize(value):
+    return str(value).replace('　', '').replace(' ', '').strip().lower()
+
+
+def _names(rng, count, prefix=''):
+    return [prefix + ''.join(rng.choice(CHARS) for _ in range(rng.randint(2, 7))) for _ in range(count)]
+
+
+def _extract_one(accounts, masters):
+    norm_to_name = {_normalize(name): name for name in masters}
+    results = []
+    for account in accounts:
+        best = process.extractOne(account, masters)
+        if best and best[1] > 65:
+            results.append(best[0])
+            continue
+        best_norm = process.extractOne(_normalize(account), list(norm_to_name.keys()))
+        results.append(norm_to_name[best_norm[0]] if best_norm and best_norm[1] > 70 else None)
+    return results
+
+
+def bench_once(label, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    print(f"{label}: {time.perf_counter() - t0:.3f}s")
+    return result
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    masters = list(dict.fromkeys(_names(rng, 400)))
+    accounts = _names(rng, 500, prefix='独自')
+    print(f"{len(accounts)} unmatched accounts x {len(masters)} masters")
+    expected = bench_once('extractOne per account', lambda: _extract_one(accounts, masters))
+    suggester = bench_once('build index', lambda: MappingSuggester(masters, _normalize))
+    actual = bench_once('cdist batch', lambda: suggester.suggest(accounts, [_normalize(a) for a in accounts]))
+    assert actual == expected
@@ -0,0 +1,41 @@
+import time
+
+from app import create_app
+from app.company.models import AccountTitleMaster
+from app.company.services.master_data_service import MasterDataService
+from app.extensions import db
+from app.services.master_data_loader import load_master_dataframe
+
+
+def _per_row_reload(service):
+    """以前の実装（全削除してから1行ずつ ORM で追加）。"""
+    with db.session.begin():
+        db.session.query(AccountTitleMaster).delete()
+        for master_type, file_path in service.master_files.items():
+            df = load_master_dataframe(file_path, index_column=None).copy()
+            df.dropna(subset=['No.', '勘定科目名'], inplace=True)
+            for _, row in df.iterrows():
+                db.session.add(AccountTitleMaster(
+                    number=int(row['No.']), name=row['勘定科目名'], statement_name=row.get('決算書名'),
+                    major_category=row.get('大分類'), middle_category=row.get('中分類'),
+                    minor_category=row.get('小分類'), breakdown_document=row.get('内訳書'), master_type=master_type,
+                ))
+
+
+def bench_once(label, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    print(f"{label}: {time.perf_counter() - t0:.3f}s {result or ''}")
+
+
+if __name__ == '__main__':
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    with app.app_context():
+        db.create_all()
+        service = MasterDataService()
+        bench_once('bulk sync (empty tables)', service.force_sync)
+        bench_once('bulk sync (no changes)', service.force_sync)
+        bench_once('per-row ORM reload', lambda: _per_row_reload(service))
+        db.session.rollback()
+        # 旧実装で入れ直した行とも差分なしになる（欠損値の扱いが同じ）
+        bench_once('bulk sync (after per-row reload)', service.force_sync)
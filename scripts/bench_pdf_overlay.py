@@ -0,0 +1,48 @@
+import os
+import tempfile
+import time
+
+from app.pdf.pdf_fill import TextSpec, overlay_pdf
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(
+    REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_karibaraikin-kashitukekin/2025/source.pdf'
+)
+ROWS_PER_PAGE = 20
+
+
+def _texts(pages: int) -> list[TextSpec]:
+    texts: list[TextSpec] = []
+    for page in range(pages):
+        for row in range(ROWS_PER_PAGE):
+            y = 760.0 - row * 28.3
+            texts.append(TextSpec(page=page, x=80.0, y=y, text=f"Partner {page}-{row}"))
+            texts.append(TextSpec(page=page, x=497.0, y=y, text=f"{row * 1000:,}", align='right'))
+    return texts
+
+
+def bench_once(label: str, fn, repeat: int = 3) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - t0) / repeat
+    print(f"{label}: {elapsed:.4f}s/run (repeat={repeat})")
+    return elapsed
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('APP_ENV', 'production')  # silence dev logging in overlay_pdf
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in (1, 10, 100):
+            texts = _texts(pages)
+            repeat = 3 if pages < 100 else 1
+            results = {}
+            for engine in ('per_page', 'single_pass'):
+                out = os.path.join(tmp, f'{engine}_{pages}.pdf')
+
+                def run(out=out, engine=engine):
+                    overlay_pdf(BASE_PDF, out, texts=texts, merge_engine=engine)
+
+                results[engine] = bench_once(f'{pages:>3} pages {engine:<11}', run, repeat=repeat)
+                print(f"    size={os.path.getsize(out):,} bytes")
+            print(f"    speedup x{results['per_page'] / results['single_pass']:.1f}")
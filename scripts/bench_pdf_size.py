@@ -0,0 +1,71 @@
+import glob
+import os
+from io import BytesIO
+
+import reportlab
+from pypdf import PdfWriter
+
+from app.pdf.pdf_fill import OverlayJob, TextSpec, dedupe_identical_streams, overlay_pdf, render_overlay_jobs
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+NOTO = os.path.join(REPO_ROOT, 'resources/fonts/NotoSansJP-Regular.ttf')
+VERA = os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf')
+FONT_PATH = NOTO if os.path.exists(NOTO) else VERA
+FONTS = {'BenchFont': FONT_PATH}
+ROWS_PER_PAGE = 20
+
+
+def _job(base_pdf: str, pages: int) -> OverlayJob:
+    texts = [
+        TextSpec(page=page, x=80.0, y=760.0 - row * 28.3, text=f"株式会社テスト {page}-{row} Partner", font_name='BenchFont')
+        for page in range(pages)
+        for row in range(ROWS_PER_PAGE)
+    ]
+    return OverlayJob(base_pdf, texts, [], [], FONTS, 'single_pass')
+
+
+def _concat(parts: list[bytes], *, dedupe: bool) -> int:
+    writer = PdfWriter()
+    for data in parts:
+        writer.append(BytesIO(data))
+    if dedupe:
+        dedupe_identical_streams(writer)
+    out = BytesIO()
+    writer.write(out)
+    return len(out.getvalue())
+
+
+def _render(jobs: list[OverlayJob], *, dedupe: bool = False) -> bytes:
+    out = BytesIO()
+    render_overlay_jobs(jobs, out, dedupe_streams=dedupe)
+    return out.getvalue()
+
+
+def report(label: str, size: int, baseline: int) -> None:
+    print(f"{label:<40} {size / 1024:9.1f} KiB  ({size / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('APP_ENV', 'production')  # silence dev logging in overlay_pdf
+    print(f"font: {FONT_PATH}")
+
+    base = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_urikakekin/2025/source.pdf')
+    job = _job(base, 10)
+    per_page = BytesIO()
+    overlay_pdf(base, per_page, texts=job.texts, font_registrations=FONTS, merge_engine='per_page')
+    single = _render([job])
+    print('\n10-page statement')
+    report('per_page (font per page)', len(per_page.getvalue()), len(per_page.getvalue()))
+    report('single_pass (shared font resources)', len(single), len(per_page.getvalue()))
+
+    bases = sorted(glob.glob(os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_*/2025/source.pdf')))
+    jobs = [_job(path, 2) for path in bases]
+    separate = [_render([j]) for j in jobs]
+    half = len(jobs) // 2
+    chunked = [_render(jobs[:half]), _render(jobs[half:])]
+    baseline = _concat(separate, dedupe=False)
+    print(f"\nbundle of {len(jobs)} statements")
+    report('one file per statement, concatenated', baseline, baseline)
+    report('  + identical streams deduplicated', _concat(separate, dedupe=True), baseline)
+    report('2 chunks (workers=2) + dedupe', _concat(chunked, dedupe=True), baseline)
+    report('1 shared overlay (workers=1) + dedupe', len(_render(jobs, dedupe=True)), baseline)
@@ -0,0 +1,60 @@
+import os
+import random
+import time
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from app.pdf.text_metrics import fit_many
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+NOTO = os.path.join(REPO_ROOT, 'resources/fonts/NotoSansJP-Regular.ttf')
+VERA = os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf')
+
+
+def _register() -> str:
+    path = NOTO if os.path.exists(NOTO) else VERA
+    pdfmetrics.registerFont(TTFont('BenchFont', path))
+    print(f"font: {os.path.relpath(path, REPO_ROOT) if path == NOTO else path}")
+    return 'BenchFont'
+
+
+def _names(count: int) -> list[str]:
+    rng = random.Random(0)
+    chars = '株式会社有限合同東京大阪商事物産ホールディングスサービスエンジニアリング'
+    return [''.join(rng.choice(chars) for _ in range(rng.randint(10, 60))) for _ in range(count)]
+
+
+def _legacy_fit(text: str, font: str, start: float, minimum: float, max_width: float) -> tuple[str, float]:
+    size = start
+    while size >= minimum:
+        if pdfmetrics.stringWidth(text, font, size) <= max_width:
+            return text, size
+        size -= 1.0
+    out = []
+    for ch in text:
+        if pdfmetrics.stringWidth(''.join(out) + ch + '…', font, minimum) <= max_width:
+            out.append(ch)
+        else:
+            break
+    return ''.join(out) + '…', minimum
+
+
+def bench_once(label: str, fn, repeat: int = 5) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - t0) / repeat
+    print(f"{label}: {elapsed:.4f}s/run (repeat={repeat})")
+    return elapsed
+
+
+if __name__ == '__main__':
+    font = _register()
+    fit_many(['warm-up'], font, 10.0, 8.0, 100.0)
+    for rows in (100, 500, 2000):
+        names = _names(rows)
+        legacy = bench_once(f"{rows} rows legacy", lambda: [_legacy_fit(n, font, 10.0, 8.0, 96.0) for n in names])
+        batch = bench_once(f"{rows} rows batch ", lambda: fit_many(names, font, 10.0, 8.0, 96.0))
+        print(f"  speedup: x{legacy / batch:.1f}")
@@ -0,0 +1,81 @@
+import random
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from app.company.services.account_aggregation import StatementCodebook, aggregate_account_balances
+
+MASTER = pd.DataFrame(
+    {
+        'id': [1, 2, 3, 4, 5],
+        'number': [3, 1, 2, 10, 11],
+        'statement_name': ['現金及び預金', '現金及び預金', None, '売掛金', ''],
+        'major_category': ['資産', '資産', '資産', '資産', '負債'],
+        'middle_category': ['流動資産', '流動資産', '流動資産', '流動資産', '流動負債'],
+        'breakdown_document': ['預貯金', '預貯金', None, '売掛金', '  '],
+    },
+    index=pd.Index(['普通預金', '現金', '小口現金', '売掛金', '未払金'], name='name'),
+)
+
+
+def _reference_balances(df):
+    debits = df.groupby('借方勘定科目')['借方金額'].sum()
+    credits = df.groupby('貸方勘定科目')['貸方金額'].sum()
+    balances = defaultdict(int)
+    for acc, amount in debits.items():
+        balances[acc] += amount
+    for acc, amount in credits.items():
+        balances[acc] -= amount
+    return {k: v for k, v in balances.items() if v != 0}
+
+
+def test_aggregate_matches_groupby_including_unknown_accounts():
+    rng = random.Random(0)
+    names = list(MASTER.index) + ['未登録科目', '', None]
+    rows = [
+        {
+            '借方勘定科目': rng.choice(names),
+            '貸方勘定科目': rng.choice(names),
+            '借方金額': rng.randint(0, 10_000),
+            '貸方金額': rng.randint(0, 10_000),
+        }
+        for _ in range(500)
+    ]
+    df = pd.DataFrame(rows)
+
+    result = aggregate_account_balances(df['借方勘定科目'], df['借方金額'], df['貸方勘定科目'], df['貸方金額'], MASTER.index)
+
+    expected = _reference_balances(df)
+    assert result == expected
+    assert list(result) == list(expected)  # same (debit-side, then credit-only) name order
+    assert all(type(v) is int for v in result.values())
+
+
+def test_codebook_groups_and_orders_by_statement():
+    codebook = StatementCodebook(MASTER)
+    balances = {'普通預金': 100, '現金': 50, '小口現金': 7, '未登録': 999, '未払金': -30}
+
+    grouped = codebook.group_by_statement(balances)
+
+    assert grouped == {
+        ('資産', '流動資産', '現金及び預金'): 150,
+        ('資産', '流動資産', '小口現金'): 7,
+        ('負債', '流動負債', '未払金'): -30,
+    }
+    assert codebook.breakdown_totals(balances) == {'預貯金': 150}
+    assert codebook.major_order == {'資産': 1, '負債': 11}
+    assert codebook.middle_order == {'流動資産': 1, '流動負債': 11}
+    assert codebook.statement_order[('資産', '流動資産', '現金及び預金')] == 1
+    assert codebook.account_ids['未払金'] == 5
+
+
+def test_codebook_handles_empty_master():
+    codebook = StatementCodebook(None)
+    assert codebook.group_by_statement({'現金': 1}) == {}
+    assert codebook.breakdown_totals({}) == {}
+    assert aggregate_account_balances(
+        pd.Series([], dtype=object), pd.Series([], dtype=float), pd.Series([], dtype=object), pd.Series([], dtype=float),
+        codebook.index,
+    ) == {}
+    assert np.asarray(codebook.statement_codes).size == 0
@@ -0,0 +1,158 @@
+from datetime import date
+from io import BytesIO
+
+import pytest
+from flask import session
+from flask_login import login_user
+from werkzeug.datastructures import FileStorage
+
+from app.company.import_data import _recompute_statements
+from app.company.models import AccountingData, AccountTitleMaster, Company, User, UserAccountMapping
+from app.company.parsers.moneyforward_parser import MoneyForwardParser
+from app.company.services.account_totals import AccountTotals, build_account_totals
+from app.company.services.data_mapping_service import DataMappingService
+from app.company.services.financial_statement_service import FinancialStatementService
+from app.company.services.import_consistency_service import on_mapping_deleted, on_mapping_saved
+from app.company.services.journal_column_store import JournalColumnStore, column_store_path
+from app.company.services.upload_flow_service import JournalUploadStore
+from app.extensions import db
+
+HEADER = '取引No.,取引日,借方勘定科目,借方補助科目,借方金額,貸方勘定科目,貸方補助科目,貸方金額'
+ROWS = [
+    '1,2024/04/01,普通預金,,1000000,元入金,,1000000',
+    '2,2024/04/15,事務用品,,5500,現金,,5500',
+    '3,2024/05/20,売掛金,,30000,売上高,,30000',
+    '4,2024/06/01,事務用品,,2000,普通預金,,2000',
+]
+START, END = date(2024, 4, 1), date(2025, 3, 31)
+MASTER_NAMES = {'普通預金', '資本金', '現金', '売掛金', '売上高', '消耗品費', '雑費'}
+
+
+def _journals():
+    data = ('\r\n'.join([HEADER, *ROWS]) + '\r\n').encode('cp932')
+    return MoneyForwardParser(FileStorage(stream=BytesIO(data), filename='journals.csv')).get_journals()
+
+
+def _mapped_service(mapping):
+    df = _journals()
+    for col in ('借方勘定科目', '貸方勘定科目'):
+        df[col] = df[col].map(mapping).fillna(df[col])
+    return FinancialStatementService(df, START, END)
+
+
+def test_remapped_totals_match_full_recompute(app, init_database):
+    with app.app_context():
+        totals = build_account_totals(_journals(), {'元入金': '資本金', '事務用品': '消耗品費'})
+        new_mapping = {'元入金': '資本金', '事務用品': '雑費'}
+        remapped = totals.remapped(new_mapping)
+        expected = _mapped_service(new_mapping)
+
+        assert totals.changed_accounts(new_mapping) == ['事務用品']
+        assert not totals.requires_journals(new_mapping)
+        assert remapped.opening_balances() == expected.opening_balances
+        assert remapped.mid_year_balances() == expected.mid_year_balances
+        assert remapped.opening_balances()['資本金'] == -1_000_000
+
+
+def test_capital_remap_in_opening_month_requires_journals():
+    totals = build_account_totals(_journals(), {'元入金': '資本金'})
+
+    assert totals.requires_journals({'元入金': '資本準備金'})
+    assert not totals.requires_journals({'元入金': '資本金', '売上高': '雑収入'})
+    assert AccountTotals.from_payload(totals.to_payload()) == totals
+    assert AccountTotals.from_payload({'version': 0}) is None
+
+
+def _seed_accounting_data(company_id, mapping):
+    totals = build_account_totals(_journals(), mapping)
+    service = _mapped_service(mapping)
+    db.session.add(AccountingData(
+        company_id=company_id,
+        period_start=START,
+        period_end=END,
+        source_hash='abc',
+        data={'balance_sheet': service.create_balance_sheet()},
+        account_totals=totals.to_payload(),
+    ))
+    db.session.commit()
+
+
+def _add_mapping(user_id, original_name, master_name):
+    master = AccountTitleMaster(number=len(original_name), name=master_name, master_type='PL')
+    db.session.add(master)
+    db.session.flush()
+    mapping = UserAccountMapping(
+        user_id=user_id, software_name='moneyforward', original_account_name=original_name, master_account_id=master.id
+    )
+    db.session.add(mapping)
+    db.session.commit()
+    return mapping
+
+
+def test_mapping_change_rebuilds_accounting_data_without_journals(app, init_database, monkeypatch):
+    # テスト環境の科目カタログは最小構成なので、マスター科目名を差し替える
+    monkeypatch.setattr(DataMappingService, '_get_master_account_names', lambda self: MASTER_NAMES)
+    with app.app_context():
+        _add_mapping(1, '元入金', '資本金')
+        office = _add_mapping(1, '事務用品', '消耗品費')
+        _seed_accounting_data(1, {'元入金': '資本金', '事務用品': '消耗品費'})
+
+        office.master_account = AccountTitleMaster(number=99, name='雑費', master_type='PL')
+        db.session.commit()
+
+        assert on_mapping_saved(1) is False
+        rows = AccountingData.query.filter_by(company_id=1).all()
+        assert len(rows) == 1
+        stored = AccountTotals.from_payload(rows[0].account_totals)
+        assert stored.mapping['事務用品'] == '雑費'
+        assert rows[0].data['account_balances']
+        assert rows[0].source_hash == 'abc'
+
+
+def test_mapping_delete_that_unmaps_an_account_invalidates(app, init_database, monkeypatch):
+    monkeypatch.setattr(DataMappingService, '_get_master_account_names', lambda self: MASTER_NAMES)
+    with app.app_context():
+        _add_mapping(1, '元入金', '資本金')
+        office = _add_mapping(1, '事務用品', '消耗品費')
+        _seed_accounting_data(1, {'元入金': '資本金', '事務用品': '消耗品費'})
+
+        db.session.delete(office)
+        db.session.commit()
+
+        assert on_mapping_deleted(1) is True
+        assert AccountingData.query.filter_by(company_id=1).count() == 0
+
+
+@pytest.mark.parametrize('with_column_store', [False, True])
+def test_mapping_saved_during_upload_recomputes_with_account_totals(app, init_database, monkeypatch, tmp_path, with_column_store):
+    monkeypatch.setattr(DataMappingService, '_get_master_account_names', lambda self: MASTER_NAMES)
+    monkeypatch.setitem(app.config, 'ACCOUNTING_DATA_REMAP', True)
+    raw_path = tmp_path / 'journals_x.csv'
+    raw_path.write_bytes(('\r\n'.join([HEADER, *ROWS]) + '\r\n').encode('cp932'))
+    if with_column_store:
+        JournalColumnStore.write(column_store_path(str(raw_path)), _journals())
+
+    with app.app_context(), app.test_request_context('/'):
+        company = Company.query.filter_by(user_id=1).first()
+        company.accounting_period_start_date, company.accounting_period_end_date = START, END
+        _add_mapping(1, '元入金', '資本金')
+        office = _add_mapping(1, '事務用品', '消耗品費')
+        login_user(db.session.get(User, 1))
+        JournalUploadStore(session).store(str(raw_path), 'journals.csv')
+
+        _recompute_statements(DataMappingService(1), 'moneyforward')
+
+        (row,) = AccountingData.query.filter_by(company_id=company.id).all()
+        assert row.schema_version and row.algo_version and row.source_hash
+        assert row.data['account_balances']
+        stored = AccountTotals.from_payload(row.account_totals)
+        assert stored.mapping == {'元入金': '資本金', '事務用品': '消耗品費'}
+        assert stored.sums['mid_year']['debit']['事務用品'] == 7500
+        assert JournalUploadStore.retrieve_from_session(session) is None
+
+        # 以後のマッピング変更は会計データを破棄せずに付け替えられる
+        office.master_account = AccountTitleMaster(number=99, name='雑費', master_type='PL')
+        db.session.commit()
+        assert on_mapping_saved(1) is False
+        (rebuilt,) = AccountingData.query.filter_by(company_id=company.id).all()
+        assert AccountTotals.from_payload(rebuilt.account_totals).mapping['事務用品'] == '雑費'
@@ -0,0 +1,92 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from app.company.models import (
+    AccountingBalance,
+    AccountingBreakdownTotal,
+    AccountingData,
+    AccountTitleMaster,
+    Borrowing,
+    Company,
+)
+from app.company.services.accounting_data_lookup import forget_accounting_data
+from app.company.services.import_consistency_service import invalidate_accounting_data
+from app.company.services.soa_summary_service import SoASummaryService
+from app.extensions import db
+
+
+def _seed(company_id):
+    deposit = AccountTitleMaster(number=10, name='普通預金', breakdown_document='預貯金', master_type='BS')
+    loan = AccountTitleMaster(number=20, name='短期借入金', breakdown_document='借入金', master_type='BS')
+    interest = AccountTitleMaster(number=30, name='支払利息', master_type='PL')
+    db.session.add_all([deposit, loan, interest])
+    # 内訳書の対象になる PL 科目（残高なし）
+    for number, name in enumerate(['役員報酬', '地代家賃', '雑収入', '雑損失'], start=40):
+        db.session.add(AccountTitleMaster(number=number, name=name, master_type='PL'))
+    db.session.flush()
+    db.session.add(AccountingData(
+        company_id=company_id,
+        period_start=date(2024, 1, 1),
+        period_end=date(2024, 12, 31),
+        data={
+            'balance_sheet': {'資産': {'items': [{'name': '普通預金', 'amount': 1000}]}},
+            'profit_loss_statement': {'費用': {'items': [{'name': '支払利息', 'amount': 200}]}},
+            'soa_breakdowns': {'預貯金': 1000, '借入金': 300},
+            'account_balances': {str(deposit.id): 1000, str(loan.id): -300, str(interest.id): 200},
+        },
+    ))
+    db.session.add(Borrowing(company_id=company_id, lender_name='X銀行', balance_at_eoy=300, interest_rate=1.0, paid_interest=50))
+    db.session.commit()
+
+
+def test_backfilled_tables_give_the_same_evaluations_without_reading_json(app, init_database, runner):
+    with app.app_context():
+        company_id = Company.query.first().id
+        _seed(company_id)
+        expected = SoASummaryService.evaluate_pages(company_id)
+
+        result = runner.invoke(args=['backfill-accounting-balances'])
+        assert '1 件' in result.output
+        assert AccountingBalance.query.count() == 3
+        assert AccountingBreakdownTotal.query.count() == 2
+        assert runner.invoke(args=['backfill-accounting-balances']).output.startswith('会計データ 0 件')
+
+        app.config['ACCOUNTING_BALANCE_TABLES'] = True
+        db.session.expunge_all()
+        forget_accounting_data(company_id)
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', _record)
+        try:
+            evaluations = SoASummaryService.evaluate_pages(company_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _record)
+
+        assert evaluations == expected
+        assert evaluations['borrowings'].difference['difference'] == 150
+        # 会計データ（JSON 列は読まない）・残高テーブルの集計・内訳合計の3文
+        assert len(statements) == 3
+        assert 'accounting_data.data' not in statements[0]
+
+
+def test_dual_write_rows_are_removed_with_the_accounting_data(app, init_database):
+    from app.company.services.accounting_balance_tables import write_balance_tables
+
+    app.config['ACCOUNTING_BALANCE_TABLES'] = True
+    with app.app_context():
+        company = Company.query.first()
+        _seed(company.id)
+        accounting = AccountingData.query.first()
+        write_balance_tables(db.session, accounting)
+        write_balance_tables(db.session, accounting)  # 書き直しても重複しない
+        db.session.commit()
+        assert accounting.normalized_at is not None
+        assert AccountingBalance.query.count() == 3
+
+        assert invalidate_accounting_data(company.id) is True
+        assert AccountingBalance.query.count() == 0
+        assert AccountingBreakdownTotal.query.count() == 0
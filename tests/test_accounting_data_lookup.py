@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.company.models import AccountingData, Company
+from app.company.services.accounting_data_lookup import (
+    clear_latest_accounting_data_cache,
+    forget_accounting_data,
+    get_latest_accounting_data,
+)
+from app.extensions import db
+
+
+def _add_accounting_data(company_id, created_at):
+    accounting = AccountingData(
+        company_id=company_id,
+        period_start=created_at.date(),
+        period_end=created_at.date(),
+        data={},
+        created_at=created_at,
+    )
+    db.session.add(accounting)
+    db.session.commit()
+    return accounting.id
+
+
+def _count_statements(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _record)
+    return statements, lambda: event.remove(engine, 'before_cursor_execute', _record)
+
+
+@pytest.fixture
+def latest_cache(app):
+    app.config.update(TESTING=False, ACCOUNTING_DATA_LATEST_CACHE=True)
+    clear_latest_accounting_data_cache()
+    yield
+    app.config.update(TESTING=True, ACCOUNTING_DATA_LATEST_CACHE=False)
+    clear_latest_accounting_data_cache()
+
+
+def test_latest_row_is_memoized_within_a_request(app, init_database):
+    with app.app_context():
+        company_id = Company.query.first().id
+        base = datetime(2025, 4, 1)
+        _add_accounting_data(company_id, base)
+        newest_id = _add_accounting_data(company_id, base + timedelta(days=1))
+
+    with app.app_context(), app.test_request_context('/'):
+        latest = get_latest_accounting_data(company_id)
+        assert latest.id == newest_id
+        statements, stop = _count_statements(db.engine)
+        try:
+            assert get_latest_accounting_data(company_id) is latest
+        finally:
+            stop()
+        assert statements == []
+
+        forget_accounting_data(company_id)
+        assert get_latest_accounting_data(company_id).id == newest_id
+
+    with app.app_context(), app.test_request_context('/'):
+        assert get_latest_accounting_data(company_id + 1000) is None
+
+
+def test_latest_id_is_reused_across_requests_until_the_row_is_replaced(app, init_database, latest_cache):
+    with app.app_context():
+        company_id = Company.query.first().id
+        first_id = _add_accounting_data(company_id, datetime(2025, 4, 1))
+
+    with app.app_context(), app.test_request_context('/'):
+        assert get_latest_accounting_data(company_id).id == first_id
+
+    with app.app_context(), app.test_request_context('/'):
+        statements, stop = _count_statements(db.engine)
+        try:
+            assert get_latest_accounting_data(company_id).id == first_id
+        finally:
+            stop()
+        # 主キーでの取得1文だけ（並び替えの照会はしない）
+        assert len(statements) == 1
+        assert 'ORDER BY' not in statements[0]
+
+    with app.app_context():
+        # 取込と同じく既存行を削除してから作り直す（無効化の呼び出しを忘れても照会し直す）
+        AccountingData.query.filter_by(company_id=company_id).delete()
+        db.session.commit()
+        second_id = _add_accounting_data(company_id, datetime(2025, 5, 1))
+
+    with app.app_context(), app.test_request_context('/'):
+        latest = get_latest_accounting_data(company_id)
+        assert (latest.id, latest.created_at) == (second_id, datetime(2025, 5, 1))
+
+    with app.app_context():
+        third_id = _add_accounting_data(company_id, datetime(2025, 6, 1))
+        forget_accounting_data(company_id)
+
+    with app.app_context(), app.test_request_context('/'):
+        assert get_latest_accounting_data(company_id).id == third_id
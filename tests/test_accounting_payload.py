@@ -0,0 +1,89 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.company.services import accounting_payload as ap
+from app.company.services.accounting_payload import (
+    AccountingPayload,
+    clear_accounting_payload_cache,
+    discard_accounting_payloads,
+    get_accounting_payload,
+)
+
+DATA = {
+    'balance_sheet': {
+        '資産': {
+            '流動資産': {'items': [{'name': '普通預金', 'amount': 1000}, {'name': '売掛金', 'amount': 300}], 'total': 1300},
+            '固定資産': {'有形固定資産': {'items': [{'name': '建物', 'amount': 500}]}},
+        },
+        '純資産': {'株主資本': {'items': [{'name': '資本金', 'amount': '1000000'}, {'name': '普通預金', 'amount': 1}]}},
+    },
+    'profit_loss_statement': {
+        '損益': {'営業外費用': {'items': [{'name': '支払利息', 'amount': 200}], 'total': 200}},
+        '利益計算': {'当期純利益': {'items': [], 'total': 12345}},
+    },
+    'soa_breakdowns': {'預貯金': 1000},
+    'account_balances': {'3': -300, '1': '1000', 'x': 5},
+}
+
+
+def _walk(data, names):
+    """以前の実装（SoASummaryService._find_and_sum_by_names）。"""
+    total = 0
+    for value in data.values():
+        if isinstance(value, dict):
+            items = value.get('items')
+            if isinstance(items, list):
+                total += sum(it.get('amount', 0) or 0 for it in items if isinstance(it, dict) and it.get('name') in names)
+            else:
+                total += _walk(value, names)
+    return total
+
+
+def test_payload_flattens_sections_once():
+    payload = AccountingPayload.from_data(DATA)
+
+    for names in (['普通預金'], ['普通預金', '建物', '普通預金'], ['売掛金', '未登録'], []):
+        assert payload.sum_bs(names) == _walk(DATA['balance_sheet'], names)
+    assert payload.sum_pl(['支払利息']) == 200
+    assert payload.capital_stock_amount == 1_000_000
+    assert payload.pl_value('利益計算', '当期純利益') == 12345
+    assert payload.pl_value('利益計算', '経常利益') is None
+    assert dict(payload.account_balances) == {3: -300, 1: 1000}
+    assert payload.balances.sum_abs(np.array([1, 3], dtype=np.int64)) == 1300
+    assert payload.soa_breakdowns['預貯金'] == 1000
+
+
+def test_payload_tolerates_missing_sections():
+    payload = AccountingPayload.from_data(None)
+
+    assert payload.sum_bs(['現金']) == 0
+    assert payload.capital_stock_amount == 0
+    assert not payload.balances
+
+
+def _row(row_id, company_id=1, source_hash='h1', updated_at=datetime(2025, 1, 1)):
+    return SimpleNamespace(id=row_id, company_id=company_id, source_hash=source_hash, updated_at=updated_at, data=DATA)
+
+
+def test_payload_is_memoized_per_row_version_in_a_bounded_lru(app, monkeypatch):
+    app.config['TESTING'] = False
+    monkeypatch.setattr(ap, 'PAYLOAD_CACHE_SIZE', 2)
+    clear_accounting_payload_cache()
+    try:
+        with app.app_context():
+            first = get_accounting_payload(_row(1))
+            assert get_accounting_payload(_row(1)) is first
+            assert get_accounting_payload(_row(1, source_hash='h2')) is not first
+            assert get_accounting_payload(_row(1, updated_at=datetime(2025, 1, 2))) is not first
+            # 上限を超えると最も古く使われたものから追い出す
+            assert get_accounting_payload(_row(1)) is not first
+
+            kept = get_accounting_payload(_row(2, company_id=2))
+            discard_accounting_payloads(1)
+            assert get_accounting_payload(_row(2, company_id=2)) is kept
+            assert len(ap._payload_cache) == 1
+    finally:
+        clear_accounting_payload_cache()
+        app.config['TESTING'] = True
@@ -0,0 +1,39 @@
+import math
+
+import pandas as pd
+import pytest
+
+from app.company.parsers.normalizers import sanitize_amount_series, sanitize_amount_text
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('1,000', '1000'),
+    ('１，２００', '１２００'),
+    (' 12 345 円 ', '12345'),
+    ('3　000', '3000'),
+    ('－500', '-500'),
+    ('−500', '-500'),
+    ('–500', '-500'),
+    ('▲ 1,500', '-1500'),
+    ('△200', '-200'),
+    ('(300)', '-300'),
+    ('(1,234円)', '-1234'),
+    ('▲(100)', '-100'),
+])
+def test_sanitize_amount_text(raw, expected):
+    assert sanitize_amount_text(raw) == expected
+
+
+def test_sanitize_amount_series_keeps_index_and_zero_fills():
+    series = pd.Series(['1,000', None, '(300)', 'abc', '1,000', 2500, float('nan'), '▲50'], index=list('abcdefgh'))
+
+    result = sanitize_amount_series(series)
+
+    assert list(result.index) == list('abcdefgh')
+    assert result.tolist() == [1000, 0, -300, 0, 1000, 2500, 0, -50]
+
+
+def test_sanitize_amount_series_preserves_integer_dtype_and_decimals():
+    assert sanitize_amount_series(pd.Series(['1,000', '2,000'])).dtype.kind == 'i'
+    decimals = sanitize_amount_series(pd.Series(['1,000.5', '(0.25)']))
+    assert math.isclose(decimals.iloc[0], 1000.5) and math.isclose(decimals.iloc[1], -0.25)
@@ -0,0 +1,70 @@
+import json
+import os
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from werkzeug.datastructures import FileStorage
+
+from app.company.parsers.moneyforward_parser import MoneyForwardParser
+from app.company.services.journal_column_store import JournalColumnStore, column_store_path, remove_column_store
+
+HEADER = '取引No.,取引日,借方勘定科目,借方補助科目,借方金額,貸方勘定科目,貸方補助科目,貸方金額'
+ROWS = [
+    '1,2024/04/01,普通預金,,"1,000,000",資本金,,1000000',
+    '2,2024/04/15,消耗品費,,5500,現金,,5500',
+    '3,2024/05/20,売掛金,,30000,売上高,,30000',
+    '4,2024/06/01,普通預金,,2000,売上高,,2000',
+    '5,2024/06/30,元入金,,700,,,0',
+]
+
+
+def _journals():
+    data = ('\r\n'.join([HEADER, *ROWS]) + '\r\n').encode('cp932')
+    return MoneyForwardParser(FileStorage(stream=BytesIO(data), filename='journals.csv')).get_journals()
+
+
+def test_roundtrip_matches_parser_output(tmp_path):
+    journals = _journals()
+    path = column_store_path(str(tmp_path / 'journals_x.csv'))
+
+    JournalColumnStore.write(path, journals)
+    store = JournalColumnStore.open(path)
+
+    assert store is not None and store.row_count == len(journals)
+    assert isinstance(store._column('debit_amount'), np.memmap)
+    restored = store.to_dataframe()
+    assert_frame_equal(restored, journals, check_dtype=False)
+
+
+def test_account_mapping_is_applied_on_read_only(tmp_path):
+    path = str(tmp_path / 'store')
+    store = JournalColumnStore.write(path, _journals())
+    before = {name: os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)}
+
+    mapped = store.to_dataframe(account_mapping={'元入金': '資本金'})
+    assert mapped.loc[4, '借方勘定科目'] == '資本金'
+
+    reopened = JournalColumnStore.open(path)
+    assert reopened.to_dataframe().loc[4, '借方勘定科目'] == '元入金'
+    assert {name: os.path.getmtime(os.path.join(path, name)) for name in os.listdir(path)} == before
+
+
+def test_open_returns_none_for_missing_or_stale_store(tmp_path):
+    raw = str(tmp_path / 'journals_y.csv')
+    assert JournalColumnStore.open(column_store_path(raw)) is None
+
+    path = column_store_path(raw)
+    JournalColumnStore.write(path, _journals())
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as fh:
+        json.dump({'version': 0, 'rows': 5}, fh)
+    assert JournalColumnStore.open(path) is None
+
+    remove_column_store(raw)
+    assert not os.path.exists(path)
+
+
+def test_supports_requires_parser_columns():
+    assert JournalColumnStore.supports(_journals())
+    assert not JournalColumnStore.supports(pd.DataFrame({'借方勘定科目': ['現金']}))
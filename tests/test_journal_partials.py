@@ -0,0 +1,97 @@
+import json
+import random
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from app.company.services.financial_statement_service import FinancialStatementService
+from app.company.services.journal_partials import JournalPartials, build_journal_partials
+
+ACCOUNTS = ['現金', '普通預金', '売掛金', '売上高', '消耗品費', '未登録科目']
+
+
+def _journals(seed=0, rows=400):
+    rng = random.Random(seed)
+    data = [
+        {'id': 1, '日付': pd.Timestamp('2024-04-01'), '借方勘定科目': '普通預金', '貸方勘定科目': '資本金', '借方金額': 1_000_000, '貸方金額': 1_000_000},
+    ]
+    for i in range(2, rows):
+        amount = rng.randint(1, 50_000)
+        data.append({
+            'id': i,
+            '日付': pd.Timestamp('2024-04-01') + pd.Timedelta(days=rng.randint(0, 364)),
+            '借方勘定科目': rng.choice(ACCOUNTS),
+            '貸方勘定科目': rng.choice(ACCOUNTS),
+            '借方金額': amount,
+            '貸方金額': amount,
+        })
+    return pd.DataFrame(data)
+
+
+def _roundtrip(partials):
+    return JournalPartials.from_payload(json.loads(json.dumps(partials.to_payload(), ensure_ascii=False)))
+
+
+def _full_balances(df):
+    service = FinancialStatementService(df, date(2024, 4, 1), date(2025, 3, 31))
+    return dict(service.opening_balances), dict(service.mid_year_balances)
+
+
+def test_partials_match_full_recomputation(app, init_database):
+    df = _journals()
+    partials = build_journal_partials(df, None, source_hash='h1')
+
+    with app.app_context():
+        opening, mid_year = _full_balances(df)
+    assert partials.opening_balances() == opening
+    assert partials.mid_year_balances() == mid_year
+    assert list(partials.mid_year_balances()) == list(mid_year)
+    assert len(partials.recomputed_months) == 12 and not partials.reused_months
+
+
+def test_reimport_recomputes_only_changed_month(app, init_database):
+    df = _journals()
+    previous = _roundtrip(build_journal_partials(df, None, source_hash='h1'))
+    corrected = df.copy()
+    row = corrected.index[corrected['日付'].dt.month == 7][0]
+    corrected.loc[row, ['借方金額', '貸方金額']] = 123_456
+
+    partials = build_journal_partials(corrected, previous, source_hash='h2')
+
+    assert partials.recomputed_months == ['202407']
+    assert len(partials.reused_months) == 11
+    with app.app_context():
+        opening, mid_year = _full_balances(corrected)
+    assert partials.opening_balances() == opening
+    assert partials.mid_year_balances() == mid_year
+
+
+def test_unchanged_source_hash_reuses_everything():
+    df = _journals()
+    previous = _roundtrip(build_journal_partials(df, None, source_hash='same'))
+
+    partials = build_journal_partials(df.iloc[::-1], previous, source_hash='same')
+
+    assert not partials.recomputed_months
+    assert partials.mid_year_balances() == previous.mid_year_balances()
+
+
+def test_opening_context_change_recomputes_all_months():
+    df = _journals()
+    previous = _roundtrip(build_journal_partials(df, None, source_hash='h1'))
+    extra = pd.DataFrame([{'id': 9999, '日付': pd.Timestamp('2024-04-30'), '借方勘定科目': '現金', '貸方勘定科目': '資本金', '借方金額': 10, '貸方金額': 10}])
+
+    partials = build_journal_partials(pd.concat([df, extra], ignore_index=True), previous, source_hash='h2')
+
+    assert len(partials.recomputed_months) == 12
+    assert partials.opening_balances()['資本金'] == -1_000_010
+
+
+@pytest.mark.parametrize('payload', [None, {}, {'version': 99, 'months': {}}, 'garbage'])
+def test_invalid_payload_is_ignored(payload):
+    assert JournalPartials.from_payload(payload) is None
+
+
+def test_journals_without_ids_fall_back_to_full_recompute():
+    assert build_journal_partials(_journals().drop(columns=['id']), None, source_hash='h') is None
@@ -0,0 +1,53 @@
+from thefuzz import process
+
+from app.company.services.mapping_suggester import (
+    MappingSuggester,
+    clear_mapping_suggester_cache,
+    get_mapping_suggester,
+)
+
+MASTER_NAMES = ['現金', '普通預金', '当座預金', '売掛金', '買掛金', '売上高', '仕入高', '消耗品費', '旅費交通費', '通信費', '地代家賃', 'ソフトウェア', '未払金', '未払費用']
+ACCOUNTS = ['普通預金 A銀行', 'ｿﾌﾄｳｪｱ', '旅費 交通費', '通信', '雑収入', '売掛', 'Cash', '未払い金', '', '家賃']
+
+
+def _normalize(value):
+    return str(value).replace('　', '').replace(' ', '').strip().lower()
+
+
+def _reference(accounts):
+    """以前の実装（thefuzz.process.extractOne を科目ごとに2回）。"""
+    norm_to_name = {_normalize(name): name for name in MASTER_NAMES}
+    results = []
+    for account in accounts:
+        best = process.extractOne(account, MASTER_NAMES)
+        if best and best[1] > 65:
+            results.append(best[0])
+            continue
+        best_norm = process.extractOne(_normalize(account), list(norm_to_name.keys()))
+        results.append(norm_to_name[best_norm[0]] if best_norm and best_norm[1] > 70 else None)
+    return results
+
+
+def test_batched_suggestions_match_extract_one():
+    suggester = MappingSuggester(MASTER_NAMES, _normalize)
+
+    results = suggester.suggest(ACCOUNTS, [_normalize(a) for a in ACCOUNTS])
+
+    assert results == _reference(ACCOUNTS)
+    assert results[0] == '普通預金'
+
+
+def test_suggester_handles_empty_inputs():
+    assert MappingSuggester([], _normalize).suggest(['現金'], ['現金']) == [None]
+    assert MappingSuggester(MASTER_NAMES, _normalize).suggest([], []) == []
+
+
+def test_suggester_is_cached_per_master_version():
+    clear_mapping_suggester_cache()
+    first = get_mapping_suggester('v1', MASTER_NAMES, _normalize)
+
+    assert get_mapping_suggester('v1', list(MASTER_NAMES), _normalize) is first
+    assert get_mapping_suggester('v2', MASTER_NAMES, _normalize) is not first
+    # 同じバージョンでも科目名が変わっていれば作り直す
+    assert get_mapping_suggester('v2', MASTER_NAMES[:-1], _normalize).master_names == tuple(MASTER_NAMES[:-1])
+    clear_mapping_suggester_cache()
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 from app.domain.master.catalog import load_catalog
@@ -17,3 +19,38 @@ def test_catalog_alias_resolution_if_available(app):
         if resolved is None:
             pytest.skip('alias dictionary does not include 給料手当')
         assert resolved == '給料賃金'
+
+
+def test_catalog_is_shared_per_master_version_and_alias_mtime(app, tmp_path, monkeypatch):
+    from app.company.services.master_data_service import MasterDataService
+    from app.domain.master import catalog as catalog_module
+
+    alias_file = tmp_path / 'resources' / 'masters' / 'account_aliases.json'
+    alias_file.parent.mkdir(parents=True)
+    alias_file.write_text('{"給料手当": "給料賃金"}', encoding='utf-8')
+    app.config.update(TESTING=False, MASTER_DATA_BASE_DIR=str(tmp_path))
+    version = {'hash': 'v1'}
+    monkeypatch.setattr(MasterDataService, 'get_version_hash', lambda self: version['hash'])
+    builds = []
+    original_build = catalog_module._build_catalog
+    monkeypatch.setattr(catalog_module, '_build_catalog', lambda service: builds.append(1) or original_build(service))
+    catalog_module.clear_catalog_cache()
+
+    with app.app_context():
+        # 既定のマスタースナップショットはリクエスト内でバージョンを固定するため、サービスを明示的に渡す
+        first = load_catalog(MasterDataService())
+        assert load_catalog(MasterDataService()) is first
+        assert len(builds) == 1
+
+        version['hash'] = 'v2'
+        second = load_catalog(MasterDataService())
+        assert second is not first
+
+        stat = alias_file.stat()
+        os.utime(alias_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert load_catalog(MasterDataService()) is not second
+
+        catalog_module.clear_catalog_cache()
+        load_catalog(MasterDataService())
+    assert len(builds) == 4
+    catalog_module.clear_catalog_cache()
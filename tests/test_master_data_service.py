@@ -70,3 +70,40 @@ def test_force_sync_rolls_back_on_error(app, tmp_path, monkeypatch):
 
         assert AccountTitleMaster.query.count() == 1
         assert MasterVersion.query.count() == 0
+
+
+@pytest.mark.usefixtures('init_database')
+def test_force_sync_preserves_ids_and_applies_only_differences(app, tmp_path):
+    _write_master_files(tmp_path)
+    with app.app_context():
+        _configure_master_paths(app, tmp_path)
+        service = MasterDataService()
+        first = service.force_sync()
+        cash_id = AccountTitleMaster.query.filter_by(master_type='BS', number=1).one().id
+        sales_id = AccountTitleMaster.query.filter_by(master_type='PL', number=10).one().id
+        assert first['inserted'] == 2
+
+        resources = tmp_path / "resources" / "masters"
+        pd.DataFrame([
+            {"No.": 1, "勘定科目名": "現金", "決算書名": "資産", "大分類": "資産", "中分類": "流動資産", "小分類": "現金預金", "内訳書": "現金等"},
+            {"No.": 2, "勘定科目名": "普通預金", "決算書名": "資産", "大分類": "資産", "中分類": "流動資産", "小分類": None, "内訳書": None},
+        ]).to_csv(resources / "balance_sheet.csv", index=False)
+        pd.DataFrame([
+            {"No.": 10, "勘定科目名": "売上高", "決算書名": "売上高合計", "大分類": "売上", "中分類": "売上", "小分類": "売上", "内訳書": "売上"}
+        ]).to_csv(resources / "profit_and_loss.csv", index=False)
+
+        second = service.force_sync()
+
+        assert {k: second[k] for k in ('inserted', 'updated', 'deleted', 'unchanged')} == {
+            'inserted': 1, 'updated': 1, 'deleted': 0, 'unchanged': 1,
+        }
+        assert AccountTitleMaster.query.filter_by(master_type='BS', number=1).one().id == cash_id
+        sales = AccountTitleMaster.query.filter_by(master_type='PL', number=10).one()
+        assert sales.id == sales_id and sales.statement_name == '売上高合計'
+        deposit = AccountTitleMaster.query.filter_by(master_type='BS', number=2).one()
+        assert deposit.minor_category is None
+
+        (resources / "profit_and_loss.csv").write_text("No.,勘定科目名\n")
+        third = service.force_sync()
+        assert third['deleted'] == 1
+        assert AccountTitleMaster.query.filter_by(master_type='PL').count() == 0
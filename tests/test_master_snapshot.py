@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pytest
+
+from app.company.services import master_data_service as mds
+from app.company.services.master_data_service import (
+    MasterDataService,
+    MasterSnapshot,
+    clear_master_version_cache,
+    get_master_snapshot,
+)
+from app.company.services.soa_summary_service import SoASummaryService
+
+
+@pytest.fixture
+def version_queries(app, monkeypatch):
+    app.config.update(TESTING=False, MASTER_VERSION_TTL_SECONDS=30)
+    lookup = mock.Mock(return_value='v1')
+    monkeypatch.setattr(MasterDataService, '_get_last_db_hash', lambda self: lookup())
+    clear_master_version_cache()
+    yield lookup
+    clear_master_version_cache()
+
+
+def test_version_token_is_cached_until_ttl_or_sync_signal(app, version_queries, monkeypatch):
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(mds.time, 'monotonic', lambda: clock['now'])
+    with app.app_context():
+        service = MasterDataService()
+        assert service.get_version_hash() == 'v1'
+        assert MasterDataService().get_version_hash() == 'v1'
+        assert version_queries.call_count == 1
+
+        version_queries.return_value = 'v2'
+        clock['now'] += 29
+        assert service.get_version_hash() == 'v1'
+        clock['now'] += 2
+        assert service.get_version_hash() == 'v2'
+        assert version_queries.call_count == 2
+
+        version_queries.return_value = 'v3'
+        clear_master_version_cache()
+        assert service.get_version_hash() == 'v3'
+
+
+def test_version_token_ttl_zero_queries_every_time(app, version_queries):
+    app.config['MASTER_VERSION_TTL_SECONDS'] = 0
+    with app.app_context():
+        MasterDataService().get_version_hash()
+        MasterDataService().get_version_hash()
+    assert version_queries.call_count == 2
+
+
+def test_snapshot_is_shared_within_a_request(app, init_database):
+    # 実際のリクエストと同様に、リクエストごとに新しいアプリケーションコンテキスト（g）を使う
+    with app.app_context(), app.test_request_context('/'):
+        snapshot = get_master_snapshot()
+        assert get_master_snapshot() is snapshot
+        with mock.patch.object(MasterDataService, '_get_master_df', wraps=snapshot._service._get_master_df) as load:
+            first = snapshot.get_bs_master_df()
+            assert snapshot.get_bs_master_df() is first
+        assert load.call_count == 1
+
+    with app.app_context(), app.test_request_context('/'):
+        assert get_master_snapshot() is not snapshot
+
+
+def test_evaluate_page_reuses_the_request_snapshot(app, init_database, monkeypatch):
+    created = []
+    original_init = MasterSnapshot.__init__
+
+    def counting_init(self, service=None):
+        created.append(self)
+        original_init(self, service)
+
+    monkeypatch.setattr(MasterSnapshot, '__init__', counting_init)
+    with app.test_request_context('/'):
+        for page in ('deposits', 'notes_receivable', 'accounts_receivable'):
+            SoASummaryService.evaluate_page(1, page)
+    assert len(created) == 1
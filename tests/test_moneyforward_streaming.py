@@ -0,0 +1,104 @@
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app.company.parser_factory import ParserFactory
+from app.company.parsers.journal_totals import STREAMING_SOURCE_HASH_PREFIX
+from app.company.parsers.moneyforward_parser import MoneyForwardParser
+from app.company.services.financial_statement_service import FinancialStatementService
+
+HEADER = '取引No.,取引日,借方勘定科目,借方補助科目,借方金額,貸方勘定科目,貸方補助科目,貸方金額'
+ROWS = [
+    '1,2024/04/01,普通預金,,"1,000,000",資本金,,1000000',
+    '1,2024/04/01,繰越利益剰余金,,200000,普通預金,,200000',
+    '2,2024/04/15,消耗品費,,5500円,現金,,5500',
+    '3,2024/05/20,売掛金,,(30000),売上高,,▲30000',
+    '4,2025/03/31,普通預金,,"２,０００",売上高,,2000',
+    '5,2025/04/10,現金,,700,資本金,,700',
+]
+
+
+def _csv_bytes(encoding, rows=ROWS, *, preamble=('マネーフォワード 仕訳帳',)):
+    lines = [*preamble, HEADER, *rows]
+    return ('\r\n'.join(lines) + '\r\n').encode(encoding)
+
+
+def _file(data):
+    return FileStorage(stream=BytesIO(data), filename='journals.csv')
+
+
+def _dataframe_balances(data, mapping=None):
+    df = MoneyForwardParser(_file(data)).get_journals()
+    if mapping:
+        for col in ('借方勘定科目', '貸方勘定科目'):
+            df[col] = df[col].map(mapping).fillna(df[col])
+    service = FinancialStatementService(df, date(2024, 4, 1), date(2025, 3, 31))
+    return service.opening_balances, service.mid_year_balances
+
+
+@pytest.mark.parametrize('encoding', ['cp932', 'utf-8-sig'])
+def test_streaming_totals_match_dataframe_balances(app, init_database, monkeypatch, encoding):
+    monkeypatch.setattr(MoneyForwardParser, 'STREAM_CHUNK_ROWS', 2)
+    data = _csv_bytes(encoding)
+
+    parser = ParserFactory.create_parser('moneyforward', _file(data), streaming=True)
+    totals = parser.get_journal_totals()
+
+    assert parser.file_content_bytes is None
+    assert totals.row_count == len(ROWS)
+    assert totals.source_hash.startswith(STREAMING_SOURCE_HASH_PREFIX)
+    with app.app_context():
+        opening, mid_year = _dataframe_balances(data)
+    assert totals.opening_balances() == {k: int(v) for k, v in opening.items()}
+    assert totals.mid_year_balances() == {k: int(v) for k, v in mid_year.items()}
+    # 取引No.5 (2025/04) も期首月と同じ4月の資本金取引なので、DataFrame 経路と同様に期首扱い
+    assert totals.opening_balances()['資本金'] == -1_000_700
+
+
+def test_streaming_applies_mapping_before_opening_split(app, init_database, monkeypatch):
+    monkeypatch.setattr(MoneyForwardParser, 'STREAM_CHUNK_ROWS', 4)
+    rows = [row.replace(',資本金,', ',元入金,') for row in ROWS]
+    data = _csv_bytes('utf-8', rows)
+    mapping = {'元入金': '資本金'}
+
+    totals = MoneyForwardParser(_file(data), streaming=True).get_journal_totals(account_mapping=mapping)
+
+    with app.app_context():
+        opening, mid_year = _dataframe_balances(data, mapping)
+    assert totals.opening_balances() == {k: int(v) for k, v in opening.items()}
+    assert totals.mid_year_balances() == {k: int(v) for k, v in mid_year.items()}
+    assert '元入金' not in totals.account_names()
+
+
+def test_streaming_restarts_when_encoding_changes_after_prefix(monkeypatch):
+    monkeypatch.setattr(MoneyForwardParser, 'STREAM_PREFIX_BYTES', 256)
+    monkeypatch.setattr(MoneyForwardParser, 'STREAM_CHUNK_ROWS', 2)
+    # ASCII only in the prefix, so shift_jis is tried first and fails on the UTF-8 tail.
+    def row(txn, debit, credit, amount):
+        cols = [''] * 15
+        cols[1], cols[3], cols[4], cols[8], cols[10], cols[14] = str(txn), '2024/06/01', debit, str(amount), credit, str(amount)
+        return ','.join(cols)
+
+    rows = [row(100 + i, 'cash', 'sales', 1) for i in range(20)] + [row(999, '普通預金', '売上高', 10)]
+    data = ('\n'.join(rows) + '\n').encode('utf-8')
+
+    parser = MoneyForwardParser(_file(data), streaming=True)
+    assert parser.encoding == 'shift_jis'
+
+    totals = parser.get_journal_totals()
+
+    assert parser.encoding == 'utf-8-sig'
+    assert totals.row_count == 21
+    assert totals.mid_year_balances() == {'cash': 20, 'sales': -20, '普通預金': 10, '売上高': -10}
+
+
+def test_streaming_detects_header_from_prefix_only(monkeypatch):
+    data = _csv_bytes('cp932')
+    parser = MoneyForwardParser(_file(data), streaming=True)
+
+    assert parser._find_header_row(MoneyForwardParser.JOURNALS_HEADER_KEYWORD) == 1
+    chunks = list(parser.iter_journal_chunks(('id', 'date')))
+    assert list(pd.concat(chunks).columns) == ['id', 'date']
@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from app.pdf.anchor_index import load_anchor_index, pdf_sha256, sidecar_path, template_anchors
+from app.pdf.pdf_fill import compile_template
+from app.pdf.template_cache import clear_template_cache
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_urikakekin/2025/source.pdf')
+TEMPLATE = {
+    'global_offset': {'dx': 1.0, 'dy': 0.0},
+    'texts': [
+        {'page': 0, 'text': 'x', 'anchor': {'text': '合計', 'occurrence': 2, 'dx': 10.0, 'dy': -3.0}},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+@pytest.fixture
+def base_pdf(tmp_path):
+    path = tmp_path / 'source.pdf'
+    shutil.copyfile(BASE_PDF, path)
+    return str(path)
+
+
+def _write_sidecar(base_pdf, *, sha=None, anchors=None):
+    payload = {
+        'version': 1,
+        'pdf_sha256': sha or pdf_sha256(base_pdf),
+        'page_count': 1,
+        'anchors': anchors if anchors is not None else [{'page': 0, 'text': '合計', 'hits': [[50.0, 100.0], [60.0, 200.0]]}],
+    }
+    with open(sidecar_path(base_pdf), 'w', encoding='utf-8') as fh:
+        json.dump(payload, fh, ensure_ascii=False)
+
+
+def test_template_anchors_lists_page_and_text():
+    assert template_anchors(TEMPLATE) == [(0, '合計')]
+
+
+def test_indexed_anchor_resolves_without_pymupdf(base_pdf, monkeypatch):
+    _write_sidecar(base_pdf)
+    monkeypatch.setitem(sys.modules, 'fitz', None)  # any import of fitz would fail
+
+    texts, _ = compile_template(TEMPLATE, base_pdf).run({})
+
+    assert (texts[0].page, texts[0].x, texts[0].y) == (0, 71.0, 197.0)
+
+
+@pytest.mark.parametrize('sidecar', ['stale', 'missing_text'])
+def test_stale_or_incomplete_index_falls_back_to_search(base_pdf, monkeypatch, sidecar):
+    if sidecar == 'stale':
+        _write_sidecar(base_pdf, sha='0' * 64)
+    else:
+        _write_sidecar(base_pdf, anchors=[])
+    monkeypatch.setitem(sys.modules, 'fitz', None)
+
+    if sidecar == 'stale':
+        assert load_anchor_index(base_pdf) is None
+    with pytest.raises(RuntimeError, match='PyMuPDF'):
+        compile_template(TEMPLATE, base_pdf)
+
+
+def test_build_anchor_index_command(base_pdf, tmp_path, runner):
+    pytest.importorskip('fitz')
+    template = tmp_path / 'template.json'
+    template.write_text(json.dumps(TEMPLATE, ensure_ascii=False), encoding='utf-8')
+
+    result = runner.invoke(args=['build-anchor-index', '--base', base_pdf, '--template', str(template)])
+
+    assert result.exit_code == 0, result.output
+    index = load_anchor_index(base_pdf)
+    assert index is not None and index.lookup(0, '合計') is not None
@@ -0,0 +1,145 @@
+import os
+from io import BytesIO
+
+import pytest
+import reportlab
+from pypdf import PdfReader, PdfWriter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from app.pdf.pdf_fill import OverlayJob, TextSpec, dedupe_identical_streams, overlay_pdf, render_overlay_jobs
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_urikakekin/2025/source.pdf')
+VERA = os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf')
+
+
+def _texts(pages: int) -> list[TextSpec]:
+    return [TextSpec(page=i, x=100.0, y=700.0, text=f"overlay-{i}") for i in range(pages)]
+
+
+@pytest.mark.parametrize('engine', ['single_pass', 'per_page'])
+def test_overlay_engines_produce_all_pages(tmp_path, engine):
+    out = tmp_path / f'{engine}.pdf'
+    overlay_pdf(BASE_PDF, str(out), texts=_texts(3), rectangles=[(1, 50.0, 50.0, 10.0, 10.0)], merge_engine=engine)
+
+    reader = PdfReader(str(out))
+    base = PdfReader(BASE_PDF).pages[0]
+    assert len(reader.pages) == 3
+    for index, page in enumerate(reader.pages):
+        assert float(page.mediabox.width) == pytest.approx(float(base.mediabox.width))
+        text = page.extract_text()
+        assert f"overlay-{index}" in text
+        assert '売掛金' in text  # base form content is still present
+
+
+def test_single_pass_shares_one_base_xobject(tmp_path):
+    out = tmp_path / 'shared.pdf'
+    overlay_pdf(BASE_PDF, str(out), texts=_texts(4), merge_engine='single_pass')
+
+    reader = PdfReader(str(out))
+    refs = {
+        page['/Resources']['/XObject'].raw_get('/BasePg0').idnum
+        for page in reader.pages
+    }
+    assert len(refs) == 1
+
+
+def test_unknown_merge_engine_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        overlay_pdf(BASE_PDF, str(tmp_path / 'x.pdf'), texts=_texts(1), merge_engine='nope')
+
+
+def _vera_font_programs(data: bytes) -> set[int]:
+    programs = set()
+    for page in PdfReader(BytesIO(data)).pages:
+        for ref in page['/Resources'].get('/Font', {}).values():
+            font = ref.get_object()
+            if 'Vera' in str(font.get('/BaseFont')) and '/FontDescriptor' in font:
+                programs.add(font['/FontDescriptor'].raw_get('/FontFile2').idnum)
+    return programs
+
+
+def test_render_overlay_jobs_embeds_font_once():
+    if 'VeraTest' not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont('VeraTest', VERA))
+    jobs = [
+        OverlayJob(BASE_PDF, [TextSpec(page=0, x=100.0, y=700.0, text=f"job {i} abc", font_name='VeraTest')], [], [], {}, 'single_pass')
+        for i in range(3)
+    ]
+    shared = BytesIO()
+    assert render_overlay_jobs(jobs, shared) == [1, 1, 1]
+
+    separate = PdfWriter()
+    for job in jobs:
+        part = BytesIO()
+        render_overlay_jobs([job], part)
+        separate.append(part)
+    concatenated = BytesIO()
+    separate.write(concatenated)
+
+    assert len(_vera_font_programs(shared.getvalue())) == 1
+    assert len(_vera_font_programs(concatenated.getvalue())) == 3
+    assert len(shared.getvalue()) < len(concatenated.getvalue())
+
+
+def test_dedupe_identical_streams_keeps_pdf_valid(tmp_path):
+    part = BytesIO()
+    overlay_pdf(BASE_PDF, part, texts=_texts(1))
+    writer = PdfWriter()
+    writer.append(BytesIO(part.getvalue()))
+    writer.append(BytesIO(part.getvalue()))
+    before = BytesIO()
+    writer.write(before)
+
+    assert dedupe_identical_streams(writer) != 0  # None when pypdf's built-in did the work
+    after = BytesIO()
+    writer.write(after)
+
+    reader = PdfReader(BytesIO(after.getvalue()))
+    assert len(reader.pages) == 2
+    assert all('overlay-0' in page.extract_text() for page in reader.pages)
+    assert len(after.getvalue()) < len(before.getvalue())
+
+
+def test_single_pass_gives_each_page_its_own_base_annotations(tmp_path):
+    from pypdf.annotations import Link
+
+    annotated = tmp_path / 'annotated.pdf'
+    writer = PdfWriter()
+    writer.append(BASE_PDF)
+    writer.add_annotation(0, Link(rect=(50, 50, 150, 80), url='https://example.com'))
+    writer.write(str(annotated))
+
+    out = BytesIO()
+    overlay_pdf(str(annotated), out, texts=_texts(3), merge_engine='single_pass')
+
+    reader = PdfReader(BytesIO(out.getvalue()))
+    annot_refs = []
+    for page in reader.pages:
+        (ref,) = page['/Annots']
+        annot = ref.get_object()
+        assert annot.raw_get('/P').idnum == page.indirect_reference.idnum
+        assert annot['/A']['/URI'] == 'https://example.com'
+        annot_refs.append(ref.idnum)
+    assert len(set(annot_refs)) == 3
+
+
+def test_dedupe_identical_streams_skips_writers_without_an_object_table():
+    class _OpaqueWriter:
+        pass
+
+    assert dedupe_identical_streams(_OpaqueWriter()) == 0
+
+
+def test_dedupe_identical_streams_prefers_pypdf_builtin():
+    calls = []
+
+    class _Writer:
+        _objects = None
+
+        def compress_identical_objects(self, **kwargs):
+            calls.append(kwargs)
+
+    assert dedupe_identical_streams(_Writer()) is None
+    assert calls == [{'remove_identicals': True, 'remove_orphans': False}]
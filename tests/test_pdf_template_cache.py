@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+from app.pdf.layout_utils import load_geometry
+from app.pdf.pdf_fill import TextSpec, overlay_pdf
+from app.pdf.template_cache import TemplateAssetCache, clear_template_cache, get_template_cache_stats
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_urikakekin/2025/source.pdf')
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+def _write_geometry(root, payload) -> str:
+    path = root / 'resources/pdf_templates/sample/2025_geometry.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding='utf-8')
+    return str(path)
+
+
+def test_geometry_is_parsed_once_and_copied(tmp_path):
+    _write_geometry(tmp_path, {'cols': {'a': {'x': 1, 'w': 2}}})
+
+    first = load_geometry('sample', '2025', repo_root=str(tmp_path))
+    first['cols']['a']['x'] = 999
+    second = load_geometry('sample', '2025', repo_root=str(tmp_path))
+
+    assert second['cols']['a']['x'] == 1
+    assert second['row']['DETAIL_ROWS'] == 20  # defaults applied by the validator
+    stats = get_template_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_geometry_change_on_disk_invalidates(tmp_path):
+    path = _write_geometry(tmp_path, {'cols': {'a': {'x': 1, 'w': 2}}})
+    load_geometry('sample', '2025', repo_root=str(tmp_path))
+
+    _write_geometry(tmp_path, {'cols': {'a': {'x': 5, 'w': 2}, 'b': {'x': 6, 'w': 1}}})
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert load_geometry('sample', '2025', repo_root=str(tmp_path))['cols']['a']['x'] == 5
+    assert get_template_cache_stats()['misses'] == 2
+
+
+def test_overlay_reuses_parsed_base_pdf(tmp_path):
+    base = tmp_path / 'source.pdf'
+    shutil.copy(BASE_PDF, base)
+    texts = [TextSpec(page=0, x=10.0, y=10.0, text='x')]
+
+    overlay_pdf(str(base), str(tmp_path / 'a.pdf'), texts=texts)
+    overlay_pdf(str(base), str(tmp_path / 'b.pdf'), texts=texts)
+
+    stats = get_template_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert (tmp_path / 'b.pdf').stat().st_size > 0
+
+
+def test_slow_load_does_not_block_other_templates():
+    cache = TemplateAssetCache()
+    cache.template_program('warm.json', 'warm.pdf', lambda: 'warm')
+    started = threading.Event()
+    release = threading.Event()
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        started.set()
+        assert release.wait(5)
+        return 'cold'
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.template_program('cold.json', 'cold.pdf', slow_loader)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    try:
+        # a hit on another template is served while the cold one is still loading
+        assert cache.template_program('warm.json', 'warm.pdf', lambda: 'reloaded') == 'warm'
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert results == ['cold', 'cold']
+    assert len(loads) == 1
+    assert cache.stats()['misses'] == 2
@@ -0,0 +1,70 @@
+import json
+import os
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from pypdf import PdfReader
+
+from app.pdf.pdf_fill import compile_template, load_template_program, overlay_with_template
+from app.pdf.template_cache import clear_template_cache
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_urikakekin/2025/source.pdf')
+TEMPLATE = {
+    'global_offset': {'dx': 5.0, 'dy': -2.0},
+    'texts': [
+        {'page': 0, 'x': 100, 'y': 700, 'text': '{{ company.company_name }}', 'size': 9},
+        {'page': 0, 'x': 100, 'y': 680, 'text': 'fixed label'},
+    ],
+    'grids': [
+        {'page': 0, 'x0': 400, 'y0': 700, 'box_width': 12, 'box_count': 6, 'value': '{{ totals.capital }}', 'neg_mark': '-'},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_template_cache()
+    yield
+    clear_template_cache()
+
+
+def test_program_resolves_offsets_once_and_looks_up_values():
+    program = compile_template(TEMPLATE, BASE_PDF)
+    ctx = {'company': SimpleNamespace(company_name='Acme'), 'totals': {'capital': -1234}}
+
+    texts, grids = program.run(ctx)
+
+    assert [(t.x, t.y, t.text, t.font_size) for t in texts] == [(105.0, 698.0, 'Acme', 9.0), (105.0, 678.0, 'fixed label', 10.0)]
+    assert (grids[0].x0, grids[0].y0, grids[0].digits, grids[0].is_negative) == (405.0, 698.0, '1234', True)
+    # a second context reuses the same program
+    texts, grids = program.run({'company': {'company_name': 'Beta'}, 'totals': {}})
+    assert texts[0].text == 'Beta'
+    assert grids[0].digits == ''
+
+
+def test_load_template_program_is_cached_per_file(tmp_path):
+    path = tmp_path / 'template.json'
+    path.write_text(json.dumps(TEMPLATE), encoding='utf-8')
+
+    first = load_template_program(str(path), BASE_PDF)
+    assert load_template_program(str(path), BASE_PDF) is first
+
+    changed = dict(TEMPLATE, global_offset={'dx': 0.0, 'dy': 0.0})
+    path.write_text(json.dumps(changed), encoding='utf-8')
+    os.utime(path, ns=(1, 1))
+    reloaded = load_template_program(str(path), BASE_PDF)
+    assert reloaded is not first
+    assert reloaded.texts[0].x == 100.0
+
+
+def test_overlay_with_template_accepts_dict_or_program():
+    ctx = {'company': {'company_name': 'Acme KK'}, 'totals': {'capital': 42}}
+    outputs = []
+    for template in (TEMPLATE, compile_template(TEMPLATE, BASE_PDF)):
+        buffer = BytesIO()
+        overlay_with_template(BASE_PDF, buffer, template, ctx)
+        outputs.append(PdfReader(BytesIO(buffer.getvalue())).pages[0].extract_text())
+    assert 'Acme KK' in outputs[0]
+    assert outputs[0] == outputs[1]
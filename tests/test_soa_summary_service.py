@@ -1,6 +1,8 @@
 # tests/test_soa_summary_service.py
 from datetime import date
 
+from flask import g
+
 from app.company.models import AccountingData, AccountTitleMaster, Borrowing, Company
 from app.company.services.soa_summary_service import SoASummaryService
 from app.extensions import db
@@ -208,3 +210,62 @@ def test_soa_pl_mappings_executive_and_rent_and_misc(app, init_database):
         assert d3_loss['bs_total'] == 25
         assert d3_loss['breakdown_total'] == 0
         assert d3_loss['difference'] == 25
+
+
+def _count_statements(engine):
+    from sqlalchemy import event
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _record)
+    return statements, lambda: event.remove(engine, 'before_cursor_execute', _record)
+
+
+def test_evaluate_pages_matches_per_page_in_one_breakdown_query(app, init_database):
+    from app.company.models import Deposit, Miscellaneous
+    from app.services.soa_registry import STATEMENT_PAGES_CONFIG
+
+    with app.app_context():
+        company = Company.query.first()
+        db.session.add(AccountTitleMaster(
+            number=10, name='普通預金', statement_name='資産', major_category='資産',
+            middle_category='流動資産', minor_category='', breakdown_document='預貯金', master_type='BS',
+        ))
+        db.session.add(AccountingData(
+            company_id=company.id,
+            period_start=date(2024, 1, 1),
+            period_end=date(2024, 12, 31),
+            data={'balance_sheet': {'assets': {'items': [{'name': '普通預金', 'amount': 1000}]}}},
+        ))
+        db.session.add_all([
+            Deposit(company_id=company.id, financial_institution='A銀行', branch_name='本店',
+                    account_type='普通', account_number='1', balance=600),
+            Deposit(company_id=company.id, financial_institution='B銀行', branch_name='本店',
+                    account_type='普通', account_number='2', balance=400),
+            Borrowing(company_id=company.id, lender_name='X銀行', balance_at_eoy=400, interest_rate=1.0, paid_interest=50),
+            Miscellaneous(company_id=company.id, account_name='雑収入', details='x', amount=75),
+        ])
+        db.session.commit()
+
+        expected = {page: SoASummaryService.evaluate_page(company.id, page) for page in STATEMENT_PAGES_CONFIG}
+
+        company_id = company.id
+        # 新しいリクエストと同じ状態（会計データ・マスターのメモなし）で数える
+        with app.app_context(), app.test_request_context('/'):
+            SoASummaryService.evaluate_pages(company_id)  # マスターのスナップショットを作っておく
+            g.pop('_latest_accounting_data')
+            statements, stop = _count_statements(db.engine)
+            try:
+                evaluations = SoASummaryService.evaluate_pages(company_id)
+            finally:
+                stop()
+
+        assert evaluations == expected
+        assert evaluations['deposits'].is_balanced
+        assert evaluations['borrowings'].difference['breakdown_total'] == 450
+        # 会計データの読み込み1回 + 内訳合計の UNION ALL 1回（マスターはスナップショット済み）
+        assert len([s for s in statements if 'UNION ALL' in s]) == 1
+        assert len(statements) == 2
@@ -0,0 +1,79 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from app.company.services.master_data_service import MasterDataService
+from app.domain.soa.targets import (
+    AccountBalanceVector,
+    SoATargetIndex,
+    clear_soa_target_index_cache,
+    get_soa_target_index,
+)
+
+
+def _frame(rows):
+    return pd.DataFrame(rows).set_index('name')
+
+
+BS_DF = _frame([
+    {'id': 1, 'name': '普通預金', 'breakdown_document': '預貯金'},
+    {'id': 2, 'name': '定期預金', 'breakdown_document': '預貯金'},
+    {'id': 3, 'name': '短期借入金', 'breakdown_document': '借入金'},
+    {'id': 4, 'name': '売掛金', 'breakdown_document': '売掛金（未収入金）'},
+])
+PL_DF = _frame([
+    {'id': 10, 'name': '支払利息', 'breakdown_document': None},
+    {'id': 11, 'name': '役員報酬', 'breakdown_document': None},
+    {'id': 12, 'name': '地代家賃', 'breakdown_document': None},
+])
+
+
+def test_index_resolves_pages_once_into_frozen_tuples():
+    index = SoATargetIndex.build(BS_DF, PL_DF)
+
+    deposits = index.get('deposits')
+    assert deposits.type == 'BS'
+    assert deposits.target_ids == (1, 2)
+    assert deposits.targets == ('普通預金', '定期預金')
+    assert not deposits.id_array.flags.writeable
+
+    borrowings = index.get('borrowings').as_dict()
+    assert borrowings == {
+        'type': 'BORROWINGS',
+        'bs_target_ids': [3],
+        'pl_target_ids': [10],
+        'bs_targets': ['短期借入金'],
+        'pl_targets': ['支払利息'],
+    }
+    assert index.get('executive_compensations').target_ids == (11,)
+    assert index.get('unknown').as_dict() == {'type': 'UNKNOWN', 'target_ids': [], 'targets': []}
+
+
+def test_balance_vector_sums_absolute_values_of_present_ids():
+    vector = AccountBalanceVector({3: -300, 1: 1000, 10: 200, 2: -5})
+
+    assert vector.sum_abs(np.array([1, 2], dtype=np.int64)) == 1005
+    assert vector.sum_abs(np.array([3, 10, 99], dtype=np.int64)) == 500
+    assert vector.sum_abs(np.array([], dtype=np.int64)) == 0
+    assert not AccountBalanceVector({})
+
+
+def test_index_is_shared_per_master_version(app):
+    app.config['TESTING'] = False
+    service = mock.Mock(spec=MasterDataService)
+    service.get_version_hash.return_value = 'v1'
+    service.get_bs_master_df.return_value = BS_DF
+    service.get_pl_master_df.return_value = PL_DF
+    clear_soa_target_index_cache()
+    try:
+        with app.app_context():
+            first = get_soa_target_index(service)
+            assert get_soa_target_index(service) is first
+            assert service.get_bs_master_df.call_count == 1
+
+            service.get_version_hash.return_value = 'v2'
+            assert get_soa_target_index(service) is not first
+    finally:
+        clear_soa_target_index_cache()
+        app.config['TESTING'] = True
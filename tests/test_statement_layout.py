@@ -0,0 +1,59 @@
+import pytest
+
+from app.company.models import AccountTitleMaster, MasterVersion
+from app.company.services import master_data_service as mds
+from app.company.services.master_data_service import MasterDataService, clear_statement_layout_cache
+from app.extensions import db
+
+
+@pytest.fixture
+def seeded_master(app, init_database):
+    with app.app_context():
+        db.session.add_all([
+            AccountTitleMaster(number=1, name='現金', statement_name='現金及び預金', major_category='資産',
+                               middle_category='流動資産', breakdown_document='預貯金', master_type='BS'),
+            AccountTitleMaster(number=10, name='売上高', major_category='損益', middle_category='売上高', master_type='PL'),
+            MasterVersion(version_hash='v1'),
+        ])
+        db.session.commit()
+        clear_statement_layout_cache()
+        mds.clear_master_df_cache()
+        yield
+        clear_statement_layout_cache()
+        mds.clear_master_df_cache()
+
+
+def test_layout_is_shared_per_master_version(app, seeded_master):
+    with app.app_context():
+        first = mds._load_statement_layout_cached('v1')
+        assert mds._load_statement_layout_cached('v1') is first
+        assert first.name_to_id['現金'] == AccountTitleMaster.query.filter_by(name='現金').one().id
+        assert first.bs.statement_order[('資産', '流動資産', '現金及び預金')] == 1
+        assert first.pl.major_order == {'損益': 10}
+
+        app.config['TESTING'] = False
+        try:
+            assert MasterDataService().get_statement_layout() is first
+        finally:
+            app.config['TESTING'] = True
+
+
+def test_layout_is_read_only(app, seeded_master):
+    with app.app_context():
+        layout = mds._load_statement_layout_cached('v1')
+        with pytest.raises(TypeError):
+            layout.name_to_id['新科目'] = 1
+        with pytest.raises(TypeError):
+            layout.bs.major_order['資産'] = 0
+        with pytest.raises(ValueError):
+            layout.bs.statement_codes[0] = 5
+
+
+def test_force_sync_invalidates_layout(app, seeded_master, monkeypatch):
+    with app.app_context():
+        first = mds._load_statement_layout_cached('v1')
+        monkeypatch.setattr(MasterDataService, '_reload_master_tables', lambda self: None)
+
+        MasterDataService().force_sync()
+
+        assert mds._load_statement_layout_cached('v1') is not first
@@ -0,0 +1,124 @@
+import os
+from io import BytesIO
+
+import pytest
+from pypdf import PdfReader
+
+from app.company.models import Borrowing, Company
+from app.extensions import db
+from app.pdf.borrowings_two_tier import generate_borrowings_two_tier
+from app.pdf.pdf_fill import OverlayCapture, TextSpec, overlay_pdf
+from app.services import pdf_bundle
+from app.services.pdf_registry import StatementPDFConfig
+from tests.helpers.auth import login_as
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_yocyokin/2025/source.pdf')
+
+
+def _fake_generator(label, pages=1):
+    def generate(company_id, year, *, output_path):
+        texts = [
+            TextSpec(page=0, x=50.0, y=50.0 + 20 * i, text=f"{label}-{i}", font_name='Helvetica')
+            for i in range(pages)
+        ]
+        overlay_pdf(BASE_PDF, output_path, texts=texts)
+        return output_path
+    return generate
+
+
+def _install(monkeypatch):
+    shared = _fake_generator('shared')
+    generators = {
+        'deposits': StatementPDFConfig(generator=_fake_generator('dep'), filename_pattern='', download_name_pattern=''),
+        'temporary_payments': StatementPDFConfig(generator=shared, filename_pattern='', download_name_pattern=''),
+        'loans_receivable': StatementPDFConfig(generator=shared, filename_pattern='', download_name_pattern=''),
+    }
+    monkeypatch.setattr(pdf_bundle, 'STATEMENT_PDF_GENERATORS', generators)
+    monkeypatch.setattr(pdf_bundle, 'BUNDLE_EXTRA_FORMS', (('beppyou_02', '別表二', _fake_generator('b2')),))
+
+
+def _outline_titles(data: bytes) -> list[str]:
+    return [item.title for item in PdfReader(BytesIO(data)).outline]
+
+
+def test_bundle_orders_sections_and_adds_bookmarks(app, monkeypatch):
+    _install(monkeypatch)
+    output = BytesIO()
+    with app.app_context():
+        pdf_bundle.generate_statement_bundle(1, '2025', output_path=output, workers=1)
+
+    titles = _outline_titles(output.getvalue())
+    assert titles[0] == '別表二'
+    assert len(titles) == 3
+    assert '・' in titles[2]  # generator shared by two pages is rendered once
+    assert len(PdfReader(BytesIO(output.getvalue())).pages) == 3
+
+
+def test_bundle_process_pool_matches_serial(app, monkeypatch):
+    _install(monkeypatch)
+    with app.app_context():
+        sections = pdf_bundle.collect_bundle_sections(1, '2025')
+    jobs = [job for section in sections for job in section.jobs]
+
+    serial = pdf_bundle.render_bundle_jobs(jobs, workers=1)
+    pooled = pdf_bundle.render_bundle_jobs(jobs, workers=2)
+
+    assert len(serial) == 1 and len(pooled) == 2
+    assert [n for _, counts in pooled for n in counts] == serial[0][1]
+    assert sum(len(PdfReader(BytesIO(data)).pages) for data, _ in pooled) == len(PdfReader(BytesIO(serial[0][0])).pages)
+
+
+def test_capture_rejects_fonts_the_worker_would_not_register():
+    capture = OverlayCapture()
+    with pytest.raises(ValueError, match='NotoSansJP'):
+        overlay_pdf(BASE_PDF, capture, texts=[TextSpec(page=0, x=1.0, y=1.0, text='x', font_name='NotoSansJP')])
+    assert capture.jobs == []
+
+
+def test_borrowings_generator_captures_its_font_registration(app, init_database):
+    capture = OverlayCapture()
+    with app.app_context():
+        company = Company.query.first()
+        db.session.add(Borrowing(company_id=company.id, lender_name='X銀行', balance_at_eoy=400, interest_rate=1.0, paid_interest=50))
+        db.session.commit()
+        generate_borrowings_two_tier(company.id, '2025', output_path=capture)
+
+    (job,) = capture.jobs
+    assert {spec.font_name for spec in job.texts} == {'NotoSansJP'}
+    assert job.font_registrations['NotoSansJP'].endswith('NotoSansJP-Regular.ttf')
+
+
+def test_bundle_route_streams_pdf(client, init_database, monkeypatch):
+    _install(monkeypatch)
+    client.application.config['PDF_BUNDLE_WORKERS'] = 1
+    login_as(client, 1)
+
+    resp = client.get('/company/statement/all/pdf')
+
+    assert resp.status_code == 200
+    assert resp.data.startswith(b'%PDF')
+    assert _outline_titles(resp.data)[0] == '別表二'
+
+
+def test_bundles_with_different_job_counts_share_one_executor(app, monkeypatch):
+    created = []
+
+    class _InlineExecutor:
+        def __init__(self, max_workers, mp_context):
+            created.append(max_workers)
+
+        def map(self, fn, chunks):
+            return map(fn, chunks)
+
+    _install(monkeypatch)
+    monkeypatch.setattr(pdf_bundle, 'ProcessPoolExecutor', _InlineExecutor)
+    monkeypatch.setattr(pdf_bundle, '_executor', None)
+    monkeypatch.setattr(pdf_bundle.os, 'cpu_count', lambda: 8)
+    with app.app_context():
+        sections = pdf_bundle.collect_bundle_sections(1, '2025')
+    jobs = [job for section in sections for job in section.jobs]
+
+    assert len(pdf_bundle.render_bundle_jobs(jobs)) == len(jobs)
+    assert len(pdf_bundle.render_bundle_jobs(jobs[:2])) == 2
+    assert created == [8]
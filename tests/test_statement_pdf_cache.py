@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from app.company.models import Deposit
+from app.company.services.statement_of_accounts_service import StatementOfAccountsService
+from app.extensions import db
+from app.pdf.pdf_fill import TextSpec, overlay_pdf
+from app.services import pdf_registry
+from app.services.pdf_output_cache import pdf_output_cache
+from app.services.pdf_registry import StatementPDFConfig
+from tests.helpers.auth import login_as
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_yocyokin/2025/source.pdf')
+URL = '/company/statement/deposits/pdf'
+
+
+class _DepositForm:
+    def populate_obj(self, obj):
+        obj.financial_institution = 'テスト銀行'
+        obj.branch_name = '本店'
+        obj.account_type = '普通'
+        obj.account_number = '1234567'
+        obj.balance = 1000
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    rendered = []
+
+    def generate(company_id, year, *, output_path):
+        rendered.append(company_id)
+        overlay_pdf(BASE_PDF, output_path, texts=[TextSpec(page=0, x=50.0, y=50.0, text='x')])
+        return output_path
+
+    monkeypatch.setitem(
+        pdf_registry.STATEMENT_PDF_GENERATORS,
+        'deposits',
+        StatementPDFConfig(generator=generate, filename_pattern='d_{company_id}_{timestamp}.pdf',
+                           download_name_pattern='d_{year}.pdf'),
+    )
+    pdf_output_cache.clear()
+    yield rendered
+    pdf_output_cache.clear()
+
+
+def test_repeat_download_is_served_from_cache_and_revalidates(client, init_database, calls):
+    login_as(client, 1)
+
+    first = client.get(URL)
+    second = client.get(URL)
+    etag = first.headers['ETag']
+    revalidated = client.get(URL, headers={'If-None-Match': etag})
+
+    assert first.status_code == second.status_code == 200
+    assert second.data == first.data
+    assert second.headers['ETag'] == etag
+    assert revalidated.status_code == 304
+    assert calls == [1]
+
+
+def test_row_changes_produce_new_etag(client, init_database, calls):
+    login_as(client, 1)
+    etag = client.get(URL).headers['ETag']
+
+    with client.application.app_context():
+        db.session.add(Deposit(company_id=1, financial_institution='A', branch_name='B',
+                               account_type='普通', account_number='1', balance=5))
+        db.session.commit()
+
+    resp = client.get(URL, headers={'If-None-Match': etag})
+
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+    assert calls == [1, 1]
+
+
+def test_service_writes_evict_cached_pdfs(client, init_database, calls):
+    login_as(client, 1)
+    client.get(URL)
+    assert pdf_output_cache.stats()['entries'] == 1
+
+    with client.application.app_context():
+        ok, _, _ = StatementOfAccountsService(1).create_item('deposits', _DepositForm())
+
+    assert ok
+    assert pdf_output_cache.stats()['entries'] == 0
@@ -0,0 +1,58 @@
+import os
+
+from app.pdf.pdf_fill import TextSpec, overlay_pdf
+from app.services import pdf_registry
+from app.services.pdf_registry import StatementPDFConfig
+from tests.helpers.auth import login_as
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BASE_PDF = os.path.join(REPO_ROOT, 'resources/pdf_forms/uchiwakesyo_yocyokin/2025/source.pdf')
+
+
+def _fake_generator(calls):
+    def generate(company_id, year, *, output_path):
+        calls.append(output_path)
+        overlay_pdf(BASE_PDF, output_path, texts=[TextSpec(page=0, x=50.0, y=50.0, text=f"c{company_id}")])
+        return output_path
+    return generate
+
+
+def _register(monkeypatch, calls):
+    monkeypatch.setitem(
+        pdf_registry.STATEMENT_PDF_GENERATORS,
+        'deposits',
+        StatementPDFConfig(
+            generator=_fake_generator(calls),
+            filename_pattern='stream_test_{company_id}_{timestamp}.pdf',
+            download_name_pattern='stream_test_{year}.pdf',
+        ),
+    )
+
+
+def test_statement_pdf_streams_from_memory(client, init_database, monkeypatch):
+    calls = []
+    _register(monkeypatch, calls)
+    login_as(client, 1)
+
+    resp = client.get('/company/statement/deposits/pdf')
+
+    assert resp.status_code == 200
+    assert resp.mimetype == 'application/pdf'
+    assert resp.data.startswith(b'%PDF')
+    assert 'stream_test_' in resp.headers['Content-Disposition']
+    assert 'Content-Length' not in resp.headers
+    assert len(calls) == 1 and not isinstance(calls[0], str)
+
+
+def test_statement_pdf_debug_mode_writes_file(client, init_database, monkeypatch):
+    calls = []
+    _register(monkeypatch, calls)
+    client.application.config['PDF_DEBUG_WRITE_FILES'] = True
+    login_as(client, 1)
+
+    resp = client.get('/company/statement/deposits/pdf')
+
+    assert resp.status_code == 200
+    assert resp.data.startswith(b'%PDF')
+    assert isinstance(calls[0], str) and os.path.exists(calls[0])
+    os.remove(calls[0])
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from app.pdf.text_metrics import ellipsize_many, fit_many, string_widths, wrap_to_width
+
+VERA = os.path.join(os.path.dirname(reportlab.__file__), 'fonts', 'Vera.ttf')
+SAMPLES = ['', 'A', 'Partner 001', '株式会社テスト商事ホールディングス', 'Wide WWWW mmm iii', '年月日 2025/03/31']
+
+
+@pytest.fixture(scope='module', params=['Helvetica', 'VeraTest'])
+def font_name(request):
+    if request.param == 'VeraTest' and 'VeraTest' not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont('VeraTest', VERA))
+    return request.param
+
+
+def _reference_ellipsize(text, font, size, max_width):
+    if pdfmetrics.stringWidth(text, font, size) <= max_width:
+        return text
+    if pdfmetrics.stringWidth('…', font, size) > max_width:
+        return ''
+    out = ''
+    for ch in text:
+        if pdfmetrics.stringWidth(out + ch + '…', font, size) > max_width:
+            break
+        out += ch
+    return out + '…'
+
+
+def _reference_fit(text, font, start, minimum, max_width):
+    size = start
+    while size >= minimum:
+        if pdfmetrics.stringWidth(text, font, size) <= max_width:
+            return text, size
+        size -= 1.0
+    return _reference_ellipsize(text, font, minimum, max_width), minimum
+
+
+def test_widths_match_reportlab(font_name):
+    widths = string_widths(SAMPLES, font_name, 9.5)
+    expected = [pdfmetrics.stringWidth(t, font_name, 9.5) for t in SAMPLES]
+    assert widths.tolist() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('max_width', [5.0, 30.0, 61.3, 200.0])
+def test_ellipsize_and_fit_match_character_loop(font_name, max_width):
+    assert ellipsize_many(SAMPLES, font_name, 8.0, max_width) == [
+        _reference_ellipsize(t, font_name, 8.0, max_width) for t in SAMPLES
+    ]
+    assert fit_many(SAMPLES, font_name, 10.0, 8.0, max_width) == [
+        _reference_fit(t, font_name, 10.0, 8.0, max_width) for t in SAMPLES
+    ]
+
+
+def test_wrap_breaks_greedily(font_name):
+    text = '株式会社テスト商事ホールディングス Partner'
+    lines = wrap_to_width(text, font_name, 8.0, 40.0)
+    assert ''.join(lines) == text
+    for line in lines:
+        assert len(line) == 1 or pdfmetrics.stringWidth(line, font_name, 8.0) <= 40.0
+
+
+def test_unregistered_font_uses_heuristic():
+    assert string_widths(['abcd'], 'NoSuchFont', 10.0).tolist() == pytest.approx([4 * 10.0 * 0.55])
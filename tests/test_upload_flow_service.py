@@ -225,3 +225,90 @@ def test_handle_fixed_assets_returns_redirect(user_stub, session_stub, parser_fa
 
     assert isinstance(result, UploadResult)
     assert result.redirect_endpoint == 'company.fixed_assets_import'
+
+
+def test_handle_journals_streaming_uses_totals(user_stub, session_stub, parser_factory_mock, mapping_service_mock, financial_service_mock, accounting_data_mock, db_session_mock, monkeypatch):
+    from app.company.parsers.journal_totals import JournalTotals
+    from app.company.services import upload_flow_service
+
+    monkeypatch.setattr(upload_flow_service.current_app, 'config', {'JOURNAL_STREAMING_IMPORT': True})
+    parser_factory_mock.streaming = True
+    parser_factory_mock.file_content_bytes = None
+    parser_factory_mock.get_journal_totals.return_value = JournalTotals(mid_year_debits={'現金': 10.0}, source_hash='abc')
+    mapping_service_mock.get_user_mappings.return_value = {'元入金': '資本金'}
+    service = UploadFlowService('journals', user_stub, {'parser_method': 'get_journals'}, session_stub)
+
+    result = service.handle(DummyFile('journals.csv'))
+
+    assert result.redirect_endpoint == 'company.confirm_trial_balance'
+    parser_factory_mock.get_journals.assert_not_called()
+    parser_factory_mock.get_journal_totals.assert_called_once_with(account_mapping={'元入金': '資本金'})
+    mapping_service_mock.get_unmatched_accounts.assert_called_once_with(['現金'])
+    assert accounting_data_mock.class_mock.call_args.kwargs['source_hash'] == 'abc'
+
+
+def test_handle_journals_incremental_stores_partials(user_stub, session_stub, parser_factory_mock, mapping_service_mock, financial_service_mock, accounting_data_mock, db_session_mock, monkeypatch):
+    from app.company.services import upload_flow_service
+    from app.company.services.journal_partials import JournalPartials
+
+    monkeypatch.setattr(upload_flow_service.current_app, 'config', {'JOURNAL_INCREMENTAL_RECOMPUTE': True})
+    monkeypatch.setattr(upload_flow_service.current_app, 'logger', mock.Mock(), raising=False)
+    parser_factory_mock.get_journals.return_value = pd.DataFrame({
+        'id': [1, 2],
+        '日付': pd.to_datetime(['2024-01-05', '2024-02-10']),
+        '借方勘定科目': ['現金', '消耗品費'],
+        '貸方勘定科目': ['資本金', '現金'],
+        '借方金額': [1000, 200],
+        '貸方金額': [1000, 200],
+    })
+    latest_lookup = mock.Mock(return_value=None)
+    monkeypatch.setattr(upload_flow_service, 'get_latest_accounting_data', latest_lookup)
+    service = UploadFlowService('journals', user_stub, {'parser_method': 'get_journals'}, session_stub)
+
+    service.handle(DummyFile('journals.csv'))
+
+    fs_kwargs = upload_flow_service.FinancialStatementService.call_args.kwargs
+    assert isinstance(fs_kwargs['totals'], JournalPartials)
+    stored = accounting_data_mock.class_mock.call_args.kwargs['journal_partials']
+    assert sorted(stored['months']) == ['202401', '202402']
+    latest_lookup.assert_called_once_with(user_stub.company.id)
+
+
+def test_handle_journals_remap_stores_original_account_totals(user_stub, session_stub, parser_factory_mock, mapping_service_mock, financial_service_mock, accounting_data_mock, db_session_mock, monkeypatch):
+    from app.company.services import upload_flow_service
+
+    monkeypatch.setattr(upload_flow_service.current_app, 'config', {'ACCOUNTING_DATA_REMAP': True})
+    mapping_service_mock.get_user_mappings.return_value = {'元入金': '資本金'}
+    mapping_service_mock.apply_mappings_to_journals.side_effect = lambda df: df.replace({'元入金': '資本金'})
+    parser_factory_mock.get_journals.return_value = pd.DataFrame({
+        'id': [1, 2],
+        '日付': pd.to_datetime(['2024-01-05', '2024-02-10']),
+        '借方勘定科目': ['現金', '消耗品費'],
+        '貸方勘定科目': ['元入金', '現金'],
+        '借方金額': [1000, 200],
+        '貸方金額': [1000, 200],
+    })
+    service = UploadFlowService('journals', user_stub, {'parser_method': 'get_journals'}, session_stub)
+
+    service.handle(DummyFile('journals.csv'))
+
+    stored = accounting_data_mock.class_mock.call_args.kwargs['account_totals']
+    assert stored['mapping'] == {'元入金': '資本金'}
+    assert stored['opening']['credit'] == {'元入金': 1000}
+    assert stored['mid_year']['debit'] == {'消耗品費': 200}
+    assert stored['opening_candidates'] == ['元入金']
+
+
+def test_handle_journals_remap_skips_totals_when_mapping_is_needed(user_stub, session_stub, parser_factory_mock, mapping_service_mock, financial_service_mock, accounting_data_mock, db_session_mock, monkeypatch):
+    from app.company.services import upload_flow_service
+
+    monkeypatch.setattr(upload_flow_service.current_app, 'config', {'ACCOUNTING_DATA_REMAP': True})
+    build_totals = mock.Mock()
+    monkeypatch.setattr(upload_flow_service, 'build_account_totals', build_totals)
+    mapping_service_mock.get_unmatched_accounts.return_value = ['未マッピング科目']
+    service = UploadFlowService('journals', user_stub, {'parser_method': 'get_journals'}, session_stub)
+
+    result = service.handle(DummyFile('journals.csv'))
+
+    assert result.redirect_endpoint == 'company.data_mapping'
+    build_totals.assert_not_called()